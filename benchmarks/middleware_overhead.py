@@ -0,0 +1,147 @@
+"""
+Per-request overhead of the admin middleware stack.
+
+Compares the previous `BaseHTTPMiddleware` based error redirect, the pure
+ASGI stack `create_app` installs by default and the single-layer
+`AdminStackMiddleware`, by driving each app directly through ASGI (no
+network, no HTTP client) and reporting microseconds per request.
+
+Usage:
+    python -m benchmarks.middleware_overhead [requests]
+"""
+
+import asyncio
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.authentication import AuthenticationMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, RedirectResponse, Response
+from starlette.routing import Route
+
+from fastapi_admin_next.configs import AuthConfig, AuthConfigManager
+from fastapi_admin_next.error import CustomException
+from fastapi_admin_next.middleware import (
+    AdminStackMiddleware,
+    ExceptionRedirectMiddleware,
+    PathPrefixBypass,
+)
+from fastapi_admin_next.security import JWTCookieBackend, TokenManager
+
+SECRET = "benchmark-secret"
+
+
+class LegacyExceptionRedirectMiddleware(BaseHTTPMiddleware):
+    """The implementation this benchmark measures against."""
+
+    async def dispatch(
+        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        try:
+            response = await call_next(request)
+        except CustomException as e:
+            if e.code == 401:
+                return RedirectResponse(url="/admin/auth/login/", status_code=303)
+            raise
+        return response
+
+
+async def homepage(_: Request) -> Response:
+    return PlainTextResponse("ok")
+
+
+def build(middleware: list[Middleware]) -> Starlette:
+    return Starlette(routes=[Route("/", homepage)], middleware=middleware)
+
+
+APPS = {
+    "legacy (BaseHTTPMiddleware)": build(
+        [
+            Middleware(AuthenticationMiddleware, backend=JWTCookieBackend()),
+            Middleware(SessionMiddleware, secret_key=SECRET),
+            Middleware(LegacyExceptionRedirectMiddleware),
+        ]
+    ),
+    "pure ASGI stack": build(
+        [
+            Middleware(
+                PathPrefixBypass,
+                middleware=AuthenticationMiddleware,
+                prefixes=("/static",),
+                backend=JWTCookieBackend(),
+            ),
+            Middleware(
+                PathPrefixBypass,
+                middleware=SessionMiddleware,
+                prefixes=("/static",),
+                secret_key=SECRET,
+            ),
+            Middleware(ExceptionRedirectMiddleware),
+        ]
+    ),
+    "AdminStackMiddleware": build(
+        [
+            Middleware(
+                AdminStackMiddleware, secret_key=SECRET, backend=JWTCookieBackend()
+            )
+        ]
+    ),
+}
+
+
+async def run(app: Any, requests: int, headers: list[tuple[bytes, bytes]]) -> float:
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(_: dict[str, Any]) -> None:
+        return None
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        scope = {
+            "type": "http",
+            "http_version": "1.1",
+            "method": "GET",
+            "path": "/",
+            "root_path": "",
+            "scheme": "http",
+            "query_string": b"",
+            "headers": headers,
+            "server": ("testserver", 80),
+            "app": app,
+        }
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+async def main(requests: int) -> None:
+    AuthConfigManager.set_auth_config(
+        AuthConfig(
+            auth_model=object,
+            auth_username_field="email",
+            password_field="password",
+            secret_key=SECRET,
+            algorithm="HS256",
+            token_expiry_minutes=30,
+            cookie_name="auth_token",
+        )
+    )
+    token = TokenManager(SECRET, "HS256", 30).create_access_token({"id": 1})
+    headers = [(b"cookie", f"auth_token={token}".encode())]
+
+    baseline = await run(build([]), requests, headers)
+    print(f"{'no middleware':<30} {baseline:8.1f} us/request")
+    for name, app in APPS.items():
+        await run(app, requests // 10, headers)  # warm up
+        elapsed = await run(app, requests, headers)
+        print(f"{name:<30} {elapsed:8.1f} us/request (+{elapsed - baseline:.1f})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
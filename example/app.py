@@ -10,6 +10,7 @@ from sqlalchemy import Column, Enum, Float, ForeignKey, Integer, String
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, relationship
 
+from fastapi_admin_next.actions import DeleteSelected, SetField
 from fastapi_admin_next.configs import AuthConfig
 from fastapi_admin_next.main import fastapi_admin_next_app
 from fastapi_admin_next.registry import registry
@@ -81,7 +82,8 @@ app = FastAPI(lifespan=lifespan)
 
 # Admin App Setup
 admin_app = fastapi_admin_next_app.create_app(
-    db_url=DATABASE_URL,
+    db_url=None,
+    engine=engine,  # Share the application's connection pool
     auth_config=AuthConfig(
         auth_model=User,
         auth_username_field="email",
@@ -91,6 +93,10 @@ admin_app = fastapi_admin_next_app.create_app(
         token_expiry_minutes=30,
         cookie_name="auth_token",
     ),
+    # Query count and DB time in the Server-Timing header and page footer
+    instrument_queries=True,
+    metrics_path="/metrics",
+    slow_query_threshold=0.2,
 )
 registry.register(
     User,
@@ -98,7 +104,19 @@ registry.register(
     search_fields=["name"],
     display_fields=["name", "email", "profile_type"],
     pydantic_validate_class=UserValidation,
+    count_execution="window",
+    # Computed in SQL, so related selects never load whole users
+    label_field=User.name + " (" + User.email + ")",
+    actions=[
+        DeleteSelected(),
+        SetField("profile_type", ProfileType.CUSTOMER, label="Make customer"),
+    ],
+)
+registry.register(
+    Product,
+    filter_fields=["user_id"],
+    search_fields=["title", "user__email"],
+    pagination="keyset",
 )
-registry.register(Product, filter_fields=["user_id"], search_fields=["title"])
 
 app.mount("/admin", admin_app)
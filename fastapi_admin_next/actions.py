@@ -0,0 +1,81 @@
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from fastapi_admin_next.crud import CRUDGenerator
+
+# Selected primary keys bound per `pk IN (...)` statement
+DEFAULT_CHUNK_SIZE = 500
+
+
+class BulkAction:
+    """
+    An operation applied at once to the rows picked on the list view. It
+    runs as a set-based statement over `condition`, either `pk IN (...)` for
+    a chunk of selected rows or the list view's current filters and search.
+    """
+
+    name: str = ""
+    label: str = ""
+    # Run on every row of an unfiltered list view only when confirmed
+    destructive: bool = False
+
+    async def run(self, crud: "CRUDGenerator[Any]", condition: Any) -> int:
+        """
+        Apply the action to the rows of `crud.model` matching `condition`
+        within `crud.session`'s transaction; returns the affected row count.
+        """
+        raise NotImplementedError
+
+
+class DeleteSelected(BulkAction):
+    """
+    `DELETE FROM ... WHERE condition`.
+    """
+
+    name = "delete_selected"
+    label = "Delete selected"
+    destructive = True
+
+    async def run(self, crud: "CRUDGenerator[Any]", condition: Any) -> int:
+        return await crud.delete_where(condition)
+
+
+class SetField(BulkAction):
+    """
+    `UPDATE ... SET field = value WHERE condition`.
+    """
+
+    def __init__(
+        self,
+        field: str,
+        value: Any,
+        name: str | None = None,
+        label: str | None = None,
+    ) -> None:
+        self.field = field
+        self.value = value
+        self.name = name or f"set_{field}_{getattr(value, 'value', value)}"
+        self.label = label or f"Set {field} to {getattr(value, 'value', value)}"
+
+    async def run(self, crud: "CRUDGenerator[Any]", condition: Any) -> int:
+        return await crud.update_where(condition, {self.field: self.value})
+
+
+class CallableAction(BulkAction):
+    """
+    A custom action, `func(crud, condition)` returning the affected row count.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[["CRUDGenerator[Any]", Any], Awaitable[int]],
+        label: str | None = None,
+    ) -> None:
+        self.name = name
+        self.func = func
+        self.label = label or name.replace("_", " ").capitalize()
+
+    async def run(self, crud: "CRUDGenerator[Any]", condition: Any) -> int:
+        return await self.func(crud, condition)
@@ -0,0 +1,63 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """
+    A small in-process LRU cache whose entries expire after `ttl` seconds.
+
+    Entries may also carry their own absolute expiry (e.g. a token's `exp`),
+    whichever comes first wins. Once `maxsize` is reached the least recently
+    used entry is evicted.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: Hashable, default: V | None = None) -> V | None:
+        """
+        Get a cached value, or `default` if it is missing or expired.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V, expires_at: float | None = None) -> None:
+        """
+        Store a value. `expires_at` is an absolute `time.monotonic()` deadline
+        that overrides the default TTL when it is earlier.
+        """
+        deadline = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        self._data[key] = (deadline, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """
+        Remove a single entry if present.
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Remove every entry.
+        """
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -1,3 +1,4 @@
 from .auth_config import AuthConfig, AuthConfigManager
+from .engine_profile import EngineProfile
 
-__all__ = ["AuthConfig", "AuthConfigManager"]
+__all__ = ["AuthConfig", "AuthConfigManager", "EngineProfile"]
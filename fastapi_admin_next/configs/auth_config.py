@@ -10,6 +10,11 @@ class AuthConfig:
     algorithm: str
     token_expiry_minutes: int
     cookie_name: str
+    # bcrypt work factor, stored hashes with another cost are upgraded on login
+    password_hash_rounds: int = 12
+    # Hashes computed concurrently, and running plus queued before answering 429
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 32
 
 
 class AuthConfigManager:
@@ -0,0 +1,46 @@
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """
+    Engine and connection pool settings used by `DBConnector.register_db`.
+
+    Options left as None keep SQLAlchemy's defaults for the dialect, so the
+    same profile works for pooled (PostgreSQL, MySQL) and SQLite engines.
+    `statement_cache_size` sizes SQLAlchemy's compiled statement cache;
+    driver level prepared statement caches (e.g. asyncpg's
+    `prepared_statement_cache_size`) go through `connect_args`.
+    """
+
+    pool_size: int | None = None
+    max_overflow: int | None = None
+    pool_timeout: float | None = None
+    pool_pre_ping: bool = False
+    pool_recycle: int = -1
+    statement_cache_size: int | None = None
+    echo: bool | Literal["debug"] = False
+    connect_args: dict[str, Any] = field(default_factory=dict)
+
+    def engine_kwargs(self) -> dict[str, Any]:
+        """
+        Keyword arguments for `create_async_engine`.
+        """
+        kwargs: dict[str, Any] = {
+            "echo": self.echo,
+            "pool_pre_ping": self.pool_pre_ping,
+            "pool_recycle": self.pool_recycle,
+        }
+        optional = {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "query_cache_size": self.statement_cache_size,
+        }
+        kwargs.update(
+            {key: value for key, value in optional.items() if value is not None}
+        )
+        if self.connect_args:
+            kwargs["connect_args"] = dict(self.connect_args)
+        return kwargs
@@ -1,4 +1,5 @@
 from typing import Any
+
 from sqlalchemy.sql import operators
 
 OPERATORS_MAP: dict[str, Any] = {
@@ -1,14 +1,26 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import (
+    HTMLResponse,
+    JSONResponse,
+    RedirectResponse,
+    StreamingResponse,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import UploadFile
 
 from fastapi_admin_next.db_connect import DBConnector
 from fastapi_admin_next.dependencies import CommonQueryParam
 from fastapi_admin_next.exceptions import ValidationException
+from fastapi_admin_next.export import CSV, EXPORT_FORMATS, MEDIA_TYPES
+from fastapi_admin_next.importer import DEFAULT_CHUNK_SIZE, import_format
+from fastapi_admin_next.index_advisor import advise
+from fastapi_admin_next.model_admin import SNAPSHOT_FIELD
 from fastapi_admin_next.schemas import NotFoundResponse
 from fastapi_admin_next.services import AdminNextService
+from fastapi_admin_next.slow_queries import slow_query_log
 
 router = APIRouter(prefix="")
 
@@ -24,26 +36,62 @@ async def admin_index(request: Request) -> Any:
     )
 
 
+@router.get("/slow-queries", response_class=HTMLResponse, name="slow_queries")
+async def slow_queries(request: Request) -> Any:
+    return service.templates.TemplateResponse(
+        "slow_queries.html",
+        {
+            "request": request,
+            "models": service.get_models(),
+            "entries": slow_query_log.entries(),
+            "threshold": slow_query_log.threshold,
+        },
+    )
+
+
+@router.post("/slow-queries/clear", name="clear_slow_queries")
+async def clear_slow_queries(request: Request) -> Any:
+    slow_query_log.clear()
+    return RedirectResponse(request.url_for("slow_queries"), status_code=303)
+
+
+@router.get("/index-advisor", response_class=HTMLResponse, name="index_advisor")
+async def index_advisor(
+    request: Request,
+    db: AsyncSession = Depends(DBConnector.read_dependency()),
+) -> Any:
+    connection = await db.connection()
+    return service.templates.TemplateResponse(
+        "index_advisor.html",
+        {
+            "request": request,
+            "models": service.get_models(),
+            "advice": await advise(connection, service.registry),
+            "dialect": connection.dialect.name,
+        },
+    )
+
+
 @router.get("/{model_name}/list", response_class=HTMLResponse, name="list_view")
 async def list_view(
     request: Request,
     model_name: str,
-    db: AsyncSession = Depends(DBConnector.dependency()),
+    db: AsyncSession = Depends(DBConnector.read_dependency()),
 ) -> Any:
-    model_name = model_name.title()
-    model = next(
-        (m for m in service.registry.get_models() if m.__name__ == model_name),
-        None,
-    )
+    model = service.registry.get_model_by_name(model_name)
     if not model:
         raise ValidationException(message="Model not found")
+    model_name = model.__name__
     query_params = CommonQueryParam(
         filter_fields=service.registry.get_filter_fields(model=model)
     )(request=request)
+    if not service.is_sortable(model, query_params.sorting):
+        return HTMLResponse(content="Unknown sort field", status_code=400)
 
     response = await service.get_list_view(
         model=model, query_params=query_params, db=db
     )
+    action_result = request.session.pop("action_result", None)
 
     return service.templates.TemplateResponse(
         "list.html",
@@ -52,35 +100,237 @@ async def list_view(
             "model_name": model_name,
             "rows": response.rows,
             "columns": response.columns,
+            "sortable_fields": response.sortable_fields,
             "filter_options": response.filter_options,  # Pass filter options to template
             "query_params": query_params,
             "total": response.total,
+            "total_is_estimate": response.total_is_estimate,
             "models": response.models,
             "fk_to_rel_map": response.fk_to_rel_map,
-            "fetch_related_data": query_params.fetch_related_data == "true",
+            "related_labels": response.related_labels,
+            "fk_to_model_name": response.fk_to_model_name,
+            "actions": response.actions,
+            "action_result": action_result,
+            "pagination": response.pagination,
+            "next_cursor": response.next_cursor,
+            "prev_cursor": response.prev_cursor,
         },
     )
 
 
-@router.get("/{model_name}/create", response_class=HTMLResponse)
-async def create_form(
+@router.get("/{model_name}/export", name="export")
+async def export(
+    request: Request,
+    model_name: str,
+    export_format: str = Query(CSV, alias="format"),
+    columns: list[str] | None = Query(None),
+) -> Any:
+    model = service.registry.get_model_by_name(model_name)
+    if not model:
+        return HTMLResponse(content="Model not found", status_code=404)
+    if export_format not in EXPORT_FORMATS:
+        return HTMLResponse(content="Unknown export format", status_code=400)
+    export_columns = service.get_export_columns(model, columns)
+    if export_columns is None:
+        return HTMLResponse(content="Unknown export column", status_code=400)
+
+    # Same filters, search and sort as the list view
+    query_params = CommonQueryParam(
+        filter_fields=service.registry.get_filter_fields(model=model)
+    )(request=request)
+    if not service.is_sortable(model, query_params.sorting):
+        return HTMLResponse(content="Unknown sort field", status_code=400)
+    use_primary = DBConnector.reads_from_primary(request)
+    return StreamingResponse(
+        service.export_view(
+            model=model,
+            query_params=query_params,
+            columns=export_columns,
+            export_format=export_format,
+            session_factory=lambda: DBConnector.get_read_db(use_primary=use_primary),
+        ),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{model.__name__.lower()}.{export_format}"'
+            )
+        },
+    )
+
+
+@router.get("/{model_name}/import", response_class=HTMLResponse)
+async def import_form(request: Request, model_name: str) -> Any:
+    model = service.registry.get_model_by_name(model_name)
+    if not model:
+        return HTMLResponse(content="Model not found", status_code=404)
+    admin = service.registry.get_admin(model)
+    return service.templates.TemplateResponse(
+        "import.html",
+        {
+            "request": request,
+            "model_name": model.__name__,
+            "columns": admin.column_names,
+            "chunk_size": DEFAULT_CHUNK_SIZE,
+            "result": None,
+            "models": service.get_models(),
+        },
+    )
+
+
+@router.post("/{model_name}/import", response_class=HTMLResponse, name="import_rows")
+async def import_action(
     request: Request,
     model_name: str,
     db: AsyncSession = Depends(DBConnector.dependency()),
 ) -> Any:
-    model_name = model_name.title()
-    model = next(
-        (m for m in service.registry.get_models() if m.__name__ == model_name),
-        None,
+    model = service.registry.get_model_by_name(model_name)
+    if not model:
+        return HTMLResponse(content="Model not found", status_code=404)
+    admin = service.registry.get_admin(model)
+
+    # Multipart uploads are spooled to a temporary file, parsed chunk by chunk
+    form_data = await request.form()
+    upload = form_data.get("file")
+    if not isinstance(upload, UploadFile):
+        return HTMLResponse(content="No file uploaded", status_code=400)
+    file_format = str(form_data.get("format") or "") or import_format(upload.filename)
+    if file_format not in EXPORT_FORMATS:
+        return HTMLResponse(content="Unknown import format", status_code=400)
+    upsert_on = [str(value) for value in form_data.getlist("upsert_on") if value]
+    if not admin.column_keys.issuperset(upsert_on):
+        return HTMLResponse(content="Unknown upsert column", status_code=400)
+    try:
+        chunk_size = int(str(form_data.get("chunk_size") or DEFAULT_CHUNK_SIZE))
+        chunk_size = min(max(chunk_size, 1), 10000)
+    except ValueError:
+        chunk_size = DEFAULT_CHUNK_SIZE
+
+    try:
+        result = await service.import_view(
+            model=model,
+            file=upload.file,
+            import_format=file_format,
+            db=db,
+            upsert_on=upsert_on,
+            chunk_size=chunk_size,
+        )
+    except ValueError as e:  # Undecodable file or upsert not supported
+        return HTMLResponse(content=str(e), status_code=400)
+    DBConnector.mark_write(request)
+
+    if "application/json" in request.headers.get("accept", ""):
+        return JSONResponse(content=result.model_dump())
+    return service.templates.TemplateResponse(
+        "import.html",
+        {
+            "request": request,
+            "model_name": model.__name__,
+            "columns": admin.column_names,
+            "chunk_size": chunk_size,
+            "result": result,
+            "models": service.get_models(),
+        },
     )
+
+
+@router.post("/{model_name}/actions", name="bulk_action")
+async def bulk_action(
+    request: Request,
+    model_name: str,
+    db: AsyncSession = Depends(DBConnector.dependency()),
+) -> Any:
+    model = service.registry.get_model_by_name(model_name)
     if not model:
         return HTMLResponse(content="Model not found", status_code=404)
 
-    response = await service.get_create_view(model=model, db=db)
+    # The list view's filters and search ride along in the query string
+    query_params = CommonQueryParam(
+        filter_fields=service.registry.get_filter_fields(model=model)
+    )(request=request)
+    form_data = await request.form()
+    select_all = form_data.get("select_all") == "true"
+    try:
+        response = await service.run_bulk_action(
+            model=model,
+            action_name=str(form_data.get("action", "")),
+            db=db,
+            ids=(
+                None
+                if select_all
+                else [str(value) for value in form_data.getlist("ids")]
+            ),
+            query_params=query_params,
+            confirm_all=form_data.get("confirm_all") == "true",
+        )
+    except ValidationException as e:
+        return HTMLResponse(content=e.message, status_code=400)
+    if response is None:
+        return HTMLResponse(content="Action not found", status_code=404)
+
+    request.session["action_result"] = response.model_dump()
+    DBConnector.mark_write(request)
+    return RedirectResponse(
+        request.url_for("list_view", model_name=model_name).include_query_params(
+            **request.query_params
+        ),
+        status_code=303,
+    )
+
+
+@router.get("/{model_name}/filter-options/{field}", name="filter_options")
+async def filter_options_search(
+    model_name: str,
+    field: str,
+    q: str = "",
+    page: int = Query(1, ge=1),
+    db: AsyncSession = Depends(DBConnector.read_dependency()),
+) -> Any:
+    model = service.registry.get_model_by_name(model_name)
+    if not model or field not in service.registry.get_filter_fields(model):
+        return JSONResponse(content={"message": "Not found"}, status_code=404)
+
+    options = await service.registry.search_filter_options(
+        model, field, db, term=q, page=page
+    )
+    return JSONResponse(content=jsonable_encoder({"results": options}))
+
+
+@router.get("/{model_name}/autocomplete/{relation}", name="autocomplete")
+async def autocomplete(
+    model_name: str,
+    relation: str,
+    q: str = "",
+    page: int = Query(1, ge=1),
+    db: AsyncSession = Depends(DBConnector.read_dependency()),
+) -> Any:
+    model = service.registry.get_model_by_name(model_name)
+    if not model:
+        return JSONResponse(content={"message": "Not found"}, status_code=404)
+
+    options = await service.get_autocomplete(
+        model=model, relation=relation, db=db, term=q, page=page
+    )
+    if options is None:
+        return JSONResponse(content={"message": "Not found"}, status_code=404)
+    return JSONResponse(content=jsonable_encoder({"results": options}))
+
+
+@router.get("/{model_name}/create", response_class=HTMLResponse)
+async def create_form(
+    request: Request,
+    model_name: str,
+    db: AsyncSession = Depends(DBConnector.read_dependency()),
+) -> Any:
+    model = service.registry.get_model_by_name(model_name)
+    if not model:
+        return HTMLResponse(content="Model not found", status_code=404)
+    model_name = model.__name__
 
     error_messages = request.session.get("errors", [])
     form_data = request.session.get("form_data", {})
 
+    response = await service.get_create_view(model=model, db=db, form_data=form_data)
+
     request.session.pop("errors", None)
     request.session.pop("form_data", None)
 
@@ -106,14 +356,10 @@ async def create_action(
     model_name: str,
     db: AsyncSession = Depends(DBConnector.dependency()),
 ) -> Any:
-    # Fetch the model from the registry
-    model_name = model_name.title()
-    model = next(
-        (m for m in service.registry.get_models() if m.__name__ == model_name),
-        None,
-    )
+    model = service.registry.get_model_by_name(model_name)
     if not model:
         return HTMLResponse(content="Model not found", status_code=404)
+    model_name = model.__name__
 
     form_data = await request.form()
     data_dict = {key: value or None for key, value in form_data.items()}
@@ -124,9 +370,12 @@ async def create_action(
         request.session["form_data"] = {
             key: value for key, value in data_dict.items() if value is not None
         }
-        return RedirectResponse(f"/admin/{model.__name__}/create", status_code=303)
+        return RedirectResponse(
+            f"/admin/apps/{model_name.lower()}/create", status_code=303
+        )
 
-    return RedirectResponse(f"/admin/{model_name}/list", status_code=303)
+    DBConnector.mark_write(request)
+    return RedirectResponse(f"/admin/apps/{model_name.lower()}/list", status_code=303)
 
 
 # Edit form
@@ -135,15 +384,12 @@ async def update_form(
     request: Request,
     model_name: str,
     obj_id: str,
-    db: AsyncSession = Depends(DBConnector.dependency()),
+    db: AsyncSession = Depends(DBConnector.read_dependency()),
 ) -> Any:
-    model_name = model_name.title()
-    model = next(
-        (m for m in service.registry.get_models() if m.__name__ == model_name),
-        None,
-    )
+    model = service.registry.get_model_by_name(model_name)
     if not model:
         return HTMLResponse(content="Model not found", status_code=404)
+    model_name = model.__name__
     response = await service.get_detail_view(model=model, obj_id=obj_id, db=db)
 
     if isinstance(response, NotFoundResponse):
@@ -161,9 +407,12 @@ async def update_form(
             "row": response.row,
             "columns": response.columns,
             "foreign_keys": response.related_data,
+            "fk_to_rel_map": response.fk_to_rel_map,
             "enum_fields": response.enum_fields,
             "errors": error_messages,
             "models": response.models,
+            "snapshot": response.snapshot,
+            "snapshot_field": SNAPSHOT_FIELD,
         },
     )
 
@@ -175,13 +424,10 @@ async def update_action(
     obj_id: int,
     db: AsyncSession = Depends(DBConnector.dependency()),
 ) -> Any:
-    model_name = model_name.title()
-    model = next(
-        (m for m in service.registry.get_models() if m.__name__ == model_name),
-        None,
-    )
+    model = service.registry.get_model_by_name(model_name)
     if not model:
         return HTMLResponse(content="Model not found", status_code=404)
+    model_name = model.__name__
 
     form_data = await request.form()
     data_dict = {key: value or None for key, value in form_data.items()}
@@ -197,6 +443,9 @@ async def update_action(
         request.session["form_data"] = {
             key: value for key, value in data_dict.items() if value is not None
         }
-        return RedirectResponse(f"/admin/{model_name}/update/{obj_id}", status_code=303)
+        return RedirectResponse(
+            f"/admin/apps/{model_name.lower()}/update/{obj_id}", status_code=303
+        )
 
-    return RedirectResponse(f"/admin/{model_name}/list", status_code=303)
+    DBConnector.mark_write(request)
+    return RedirectResponse(f"/admin/apps/{model_name.lower()}/list", status_code=303)
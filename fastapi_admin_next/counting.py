@@ -0,0 +1,177 @@
+import json
+from typing import Any, NamedTuple
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_admin_next.cache import TTLCache
+from fastapi_admin_next.db_connect import Base
+from fastapi_admin_next.logger import logger
+
+# How the list view total is fetched alongside the page rows
+SEQUENTIAL = "sequential"  # count query, then page query
+WINDOW = "window"  # one statement, `count(*) OVER ()` next to every row
+CONCURRENT = "concurrent"  # both queries at once on two connections
+COUNT_EXECUTIONS = (SEQUENTIAL, WINDOW, CONCURRENT)
+
+
+class CountResult(NamedTuple):
+    value: int
+    estimated: bool = False
+
+
+class CountStrategy:
+    """
+    Decides how the list view computes the total number of matching rows.
+    """
+
+    async def count(
+        self,
+        session: AsyncSession,
+        model: type[Base],
+        query: Select[Any],
+        filtered: bool,
+    ) -> CountResult:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """
+        Drop any state kept between requests.
+        """
+
+
+class ExactCount(CountStrategy):
+    """
+    Runs `SELECT count(*)` over the filtered query on every request.
+    """
+
+    async def count(
+        self,
+        session: AsyncSession,
+        model: type[Base],
+        query: Select[Any],
+        filtered: bool,
+    ) -> CountResult:
+        total_query = select(func.count()).select_from(query.subquery())
+        return CountResult(await session.scalar(total_query) or 0)
+
+
+class CachedCount(ExactCount):
+    """
+    Exact count cached for `ttl` seconds, keyed by the compiled filter/search
+    statement so that every filter combination gets its own entry.
+    """
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 1024) -> None:
+        self._cache: TTLCache[int] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def count(
+        self,
+        session: AsyncSession,
+        model: type[Base],
+        query: Select[Any],
+        filtered: bool,
+    ) -> CountResult:
+        compiled = query.compile()
+        key = (model.__name__, str(compiled), repr(sorted(compiled.params.items())))
+        total = self._cache.get(key)
+        if total is None:
+            total = (await super().count(session, model, query, filtered)).value
+            self._cache.set(key, total)
+        return CountResult(total)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+class EstimatedCount(ExactCount):
+    """
+    Uses the planner's row estimate instead of counting: `pg_class.reltuples`
+    or an `EXPLAIN` row estimate on PostgreSQL, `sqlite_stat1` on SQLite.
+
+    When `exact_below` is set, an estimate below that number is replaced by
+    an exact count, so small tables stay precise. Falls back to an exact
+    count when the database has no statistics to offer.
+    """
+
+    def __init__(self, exact_below: int | None = None) -> None:
+        self.exact_below = exact_below
+
+    async def count(
+        self,
+        session: AsyncSession,
+        model: type[Base],
+        query: Select[Any],
+        filtered: bool,
+    ) -> CountResult:
+        try:
+            estimate = await self._estimate(session, model, query, filtered)
+        except DBAPIError as e:
+            logger.warning("Could not estimate count for %s: %s", model.__name__, e)
+            estimate = None
+
+        if estimate is None or (
+            self.exact_below is not None and estimate < self.exact_below
+        ):
+            return await super().count(session, model, query, filtered)
+        return CountResult(estimate, estimated=True)
+
+    async def _estimate(
+        self,
+        session: AsyncSession,
+        model: type[Base],
+        query: Select[Any],
+        filtered: bool,
+    ) -> int | None:
+        connection = await session.connection()
+        dialect = connection.dialect.name
+        table_name = model.__table__.name  # type: ignore
+
+        if dialect == "postgresql":
+            if not filtered:
+                reltuples = await connection.scalar(
+                    text(
+                        "SELECT reltuples::bigint FROM pg_class "
+                        "WHERE oid = to_regclass(:table_name)"
+                    ),
+                    {"table_name": table_name},
+                )
+                # -1 means the table has never been vacuumed or analyzed
+                return (
+                    int(reltuples) if reltuples is not None and reltuples >= 0 else None
+                )
+
+            compiled = query.compile(
+                dialect=connection.dialect,
+                compile_kwargs={"render_postcompile": True},
+            )
+            params: Any = compiled.params
+            if compiled.positional:
+                params = tuple(params[name] for name in compiled.positiontup or [])
+            result = await connection.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {compiled}", params
+            )
+            plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+
+        if dialect == "sqlite" and not filtered:
+            # sqlite_stat1 only exists once ANALYZE has been run
+            analyzed = await connection.scalar(
+                text(
+                    "SELECT 1 FROM sqlite_master "
+                    "WHERE type = 'table' AND name = 'sqlite_stat1'"
+                )
+            )
+            if not analyzed:
+                return None
+            # The first number of `stat` is the approximate row count of the table
+            stat = await connection.scalar(
+                text("SELECT stat FROM sqlite_stat1 WHERE tbl = :table_name LIMIT 1"),
+                {"table_name": table_name},
+            )
+            return int(str(stat).split()[0]) if stat else None
+
+        return None
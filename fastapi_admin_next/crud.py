@@ -1,26 +1,66 @@
-from collections.abc import Sequence
+import asyncio
+from collections.abc import AsyncIterator, Sequence
 from typing import Any, Generic, TypeVar
 
-from sqlalchemy import JSON, Select, and_, cast, func, inspect, or_, select, update
+from sqlalchemy import (
+    JSON,
+    Select,
+    and_,
+    cast,
+    delete,
+    func,
+    insert,
+    inspect,
+    or_,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.orm import joinedload
 
+from fastapi_admin_next.actions import DEFAULT_CHUNK_SIZE, BulkAction
 from fastapi_admin_next.constants import OPERATORS_MAP
-from fastapi_admin_next.db_connect import Base
-from fastapi_admin_next.schemas import FilterOptions
+from fastapi_admin_next.counting import (
+    CONCURRENT,
+    SEQUENTIAL,
+    WINDOW,
+    CountResult,
+    CountStrategy,
+    ExactCount,
+)
+from fastapi_admin_next.db_connect import Base, DBConnector
+from fastapi_admin_next.exceptions import ValidationException
+from fastapi_admin_next.filter_options import get_primary_key, resolve_field
+from fastapi_admin_next.pagination import (
+    CURSOR_NEXT,
+    CURSOR_PREV,
+    KEYSET,
+    decode_cursor,
+    encode_cursor,
+)
+from fastapi_admin_next.schemas import BulkActionResult, FilterOptions, PageInfo
+from fastapi_admin_next.search import IlikeSearch, SearchBackend
+from fastapi_admin_next.slow_queries import slow_query_log
 
 ModelType = TypeVar("ModelType", bound=Base)  # pylint: disable=invalid-name
 
+WINDOW_TOTAL_LABEL = "_total"
+
 
 class CRUDGenerator(Generic[ModelType]):
     def __init__(
         self,
         model: type[ModelType],
         session: AsyncSession,
+        count_strategy: CountStrategy | None = None,
+        search_backend: SearchBackend | None = None,
     ):
         self.session = session
         self.model: type[ModelType] = model
+        self.count_strategy = count_strategy or ExactCount()
+        self.search_backend = search_backend or IlikeSearch()
 
     async def get_related_options(
         self,
@@ -50,7 +90,11 @@ class CRUDGenerator(Generic[ModelType]):
         self,
         prefetch: tuple[str, ...] | None = None,
         options: list[Any] | None = None,
-    ) -> Select[tuple[ModelType]]:
+        only: tuple[str, ...] | None = None,
+    ) -> Select[Any]:
+        if only:
+            # Core-level projection: plain rows, nothing enters the identity map
+            return select(*(getattr(self.model, name).label(name) for name in only))
         query = select(self.model)
         if prefetch:
             if not options:
@@ -59,26 +103,46 @@ class CRUDGenerator(Generic[ModelType]):
             query = query.options(*options).execution_options(populate_existing=True)
         return query
 
+    def _sort_column(self, field_name: str, direction: str) -> Any:
+        if direction not in ("asc", "desc"):
+            raise KeyError(f"Sort direction {direction} is not asc or desc")
+        if field_name not in inspect(self.model).column_attrs:
+            raise KeyError(f"Sort field {field_name} is not a column")
+        return getattr(self.model, field_name)
+
     def _build_sorting(self, sorting: dict[str, str]) -> list[Any]:
         """Build list of ORDER_BY clauses."""
         result = []
         for field_name, direction in sorting.items():
-            field = getattr(self.model, field_name)
+            field = self._sort_column(field_name, direction)
             result.append(getattr(field, direction)())
         return result
 
     def _build_filters(self, filters: dict[str, Any]) -> list[Any]:
-        """Build list of WHERE conditions."""
+        """
+        Build list of WHERE conditions from `field__operator` expressions.
+        The field may follow relationships (`relation__field__operator`);
+        those conditions become `EXISTS` subqueries instead of joins.
+        """
         result = []
         for expression, value in filters.items():
             parts = expression.split("__")
-            op_name = parts[1] if len(parts) > 1 else "exact"
+            op_name = "exact"
+            if len(parts) > 1 and (
+                parts[-1] in OPERATORS_MAP
+                or resolve_field(self.model, expression) is None
+            ):
+                op_name = parts.pop()
             if op_name not in OPERATORS_MAP:
                 msg = f"Expression {expression} has incorrect operator {op_name}"
                 raise KeyError(msg)
             operator = OPERATORS_MAP[op_name]
-            column = getattr(self.model, parts[0])
-            result.append(operator(column, value))
+            field = "__".join(parts)
+            path = resolve_field(self.model, field)
+            if path is None:
+                msg = f"Expression {expression} has unknown field {field}"
+                raise KeyError(msg)
+            result.append(path.where(operator(path.column, value)))
         return result
 
     async def filter(
@@ -101,56 +165,293 @@ class CRUDGenerator(Generic[ModelType]):
             if filter_options.use_or
             else and_(*self._build_filters(filter_options.filters))
         )
-        # Get the session directly
-        db_execute = await self.session.execute(query.where(condition))
-        result = db_execute.scalars().all()
+        async with slow_query_log.watch(self.session, self.model.__name__, "filter"):
+            db_execute = await self.session.execute(query.where(condition))
+            result = db_execute.scalars().all()
         return result
 
-    async def paginate_filter(
+    def _build_condition(self, filter_options: FilterOptions) -> Any:
+        """Build the WHERE clause from filters and the search term."""
+        condition = (
+            or_(*self._build_filters(filter_options.filters))
+            if filter_options.use_or
+            else and_(True, *self._build_filters(filter_options.filters))
+        )
+
+        # Add search condition if `search` is provided
+        query_params = filter_options.query_params
+        if query_params and query_params.search and query_params.search_fields:
+            search_condition = self.search_backend.condition(
+                self.model, query_params.search_fields, query_params.search
+            )
+            if search_condition is not None:
+                condition = condition & search_condition
+        return condition
+
+    def _keyset_columns(self, sorting: dict[str, str] | None) -> tuple[list[Any], str]:
+        """
+        Resolve the seek columns for keyset pagination: the first sort column
+        followed by the primary key as a unique tie-breaker.
+
+        Raises:
+            KeyError: If the sort field is not a column.
+            ValueError: If the sort column is nullable; NULLs never satisfy
+                the seek comparison, so their rows would be skipped.
+        """
+        pk = inspect(self.model).primary_key[0]
+        pk_column = getattr(self.model, pk.key)
+        direction = "asc"
+        columns = [pk_column]
+        if sorting:
+            field_name, direction = next(iter(sorting.items()))
+            column = self._sort_column(field_name, direction)
+            if field_name != pk.key:
+                if column.property.columns[0].nullable:
+                    raise ValueError(
+                        f"Keyset pages can't sort on nullable {field_name}"
+                    )
+                columns.insert(0, column)
+        return columns, direction
+
+    async def _fetch(self, query: Select[Any], projected: bool) -> list[Any]:
+        db_execute = await self.session.execute(query)
+        if projected:
+            return list(db_execute.all())
+        return list(db_execute.scalars().all())
+
+    async def _keyset_page(
         self,
+        query: Select[Any],
         filter_options: FilterOptions,
-    ) -> tuple[Sequence[ModelType], int]:
-        query = self._get_query(filter_options.prefetch)
+        projected: bool = False,
+    ) -> tuple[Sequence[Any], str | None, str | None]:
+        """
+        Fetch one page by seeking past the cursor row instead of skipping
+        `OFFSET` rows, so every page costs the same as the first one.
+        """
+        query_params = filter_options.query_params
+        assert query_params is not None
+        columns, direction = self._keyset_columns(query_params.sorting)
 
-        if (
-            filter_options.query_params
-            and filter_options.query_params.sorting is not None
+        seek_direction = CURSOR_NEXT
+        if query_params.cursor:
+            seek_direction, values = decode_cursor(query_params.cursor, columns)
+            forward = (direction == "asc") == (seek_direction == CURSOR_NEXT)
+            keyset = tuple_(*columns)
+            boundary = tuple_(*values)
+            query = query.where(keyset > boundary if forward else keyset < boundary)
+
+        reverse = seek_direction == CURSOR_PREV
+        order = "desc" if (direction == "asc") == reverse else "asc"
+        query = query.order_by(*(getattr(column, order)() for column in columns))
+        query = query.limit(query_params.page_size + 1)
+
+        rows = await self._fetch(query, projected)
+        has_more = len(rows) > query_params.page_size
+        rows = rows[: query_params.page_size]
+        if reverse:
+            rows.reverse()
+        if not rows:
+            return rows, None, None
+
+        def _cursor(row: Any, cursor_direction: str) -> str:
+            return encode_cursor(
+                [getattr(row, column.key) for column in columns], cursor_direction
+            )
+
+        has_next = has_more if not reverse else True
+        has_prev = has_more if reverse else bool(query_params.cursor)
+        return (
+            rows,
+            _cursor(rows[-1], CURSOR_NEXT) if has_next else None,
+            _cursor(rows[0], CURSOR_PREV) if has_prev else None,
+        )
+
+    def _resolve_count_execution(self, requested: str, keyset: bool) -> str:
+        """
+        Fall back to sequential execution where the requested one can't apply:
+        a window count only matches an exact count of an `OFFSET` page, and
+        concurrent execution needs an engine to open a second session on.
+        """
+        if requested not in (WINDOW, CONCURRENT):
+            return SEQUENTIAL
+        if requested == WINDOW and (
+            keyset or type(self.count_strategy) is not ExactCount
         ):
-            query = query.order_by(
-                *self._build_sorting(filter_options.query_params.sorting)
+            return SEQUENTIAL
+        if requested == CONCURRENT and not isinstance(self.session.bind, AsyncEngine):
+            return SEQUENTIAL
+        return requested
+
+    async def _fetch_with_total(
+        self, query: Select[Any], projected: bool
+    ) -> tuple[list[Any], int | None]:
+        """
+        Fetch a page and the total of the unpaged query in one statement.
+        The total is None when the page is empty.
+        """
+        result = await self.session.execute(
+            query.add_columns(func.count().over().label(WINDOW_TOTAL_LABEL))
+        )
+        rows = list(result.all())
+        if not rows:
+            return rows, None
+        total = rows[0][-1]
+        if projected:
+            # Projected rows keep the extra column, templates read by name
+            return rows, total
+        return [row[0] for row in rows], total
+
+    async def _count_concurrently(
+        self, query: Select[Any], filtered: bool
+    ) -> CountResult:
+        """
+        Count on a session of its own, so it can run while the page query
+        holds `self.session`. The session comes from the engine's monitored
+        factory, so its connection shows up in the pool stats.
+        """
+        bind = self.session.bind
+        assert isinstance(bind, AsyncEngine)
+        async with DBConnector.session_factory(bind)() as count_session:
+            return await self.count_strategy.count(
+                count_session, self.model, query, filtered
             )
-        condition = (
-            or_(*self._build_filters(filter_options.filters))
-            if filter_options.use_or
-            else and_(*self._build_filters(filter_options.filters))
+
+    async def paginate(  # pylint: disable=too-many-locals
+        self,
+        filter_options: FilterOptions,
+        only: tuple[str, ...] | None = None,
+    ) -> tuple[Sequence[Any], PageInfo]:
+        """
+        Fetch one page of filtered rows along with its pagination metadata.
+        Uses `OFFSET/LIMIT` or keyset seeking depending on
+        `filter_options.pagination`.
+
+        `filter_options.count_execution` decides how the total is fetched:
+        "sequential" (count, then page), "window" (one statement with
+        `count(*) OVER ()`) or "concurrent" (count and page at once on two
+        connections). The execution that ran is reported in `PageInfo`.
+
+        When `only` names columns, the page is fetched as read-only `Row`
+        tuples holding just those columns instead of ORM instances.
+        """
+        keyset = bool(
+            filter_options.pagination == KEYSET and filter_options.query_params
         )
+        if only and keyset and filter_options.query_params:
+            # The cursor is built from the seek columns, so they must be loaded
+            keyset_columns, _ = self._keyset_columns(
+                filter_options.query_params.sorting
+            )
+            only = tuple(dict.fromkeys((*only, *(c.key for c in keyset_columns))))
+        projected = bool(only)
+        query = self._get_query(filter_options.prefetch, only=only)
+        condition = self._build_condition(filter_options)
+        query = query.where(condition)
 
-        # Add search condition if `search` is provided
-        if filter_options.query_params and filter_options.query_params.search:
-            search_condition = []
-            if filter_options.query_params.search_fields:
-                for field in filter_options.query_params.search_fields:
-                    column = getattr(self.model, field, None)
-                    if column:
-                        search_condition.append(
-                            column.ilike(f"%{filter_options.query_params.search}%")
-                        )
-
-            if search_condition:
-                condition = condition & or_(*search_condition)
+        filtered = bool(filter_options.filters) or bool(
+            filter_options.query_params and filter_options.query_params.search
+        )
+        execution = self._resolve_count_execution(
+            filter_options.count_execution, keyset
+        )
 
-        # Get the session directly
-        total_query = select(func.count()).select_from(
-            query.where(condition).subquery()
+        async def fetch_page() -> tuple[Sequence[Any], str | None, str | None]:
+            if keyset:
+                return await self._keyset_page(query, filter_options, projected)
+            return (
+                await self._fetch(self._offset_query(query, filter_options), projected),
+                None,
+                None,
+            )
+
+        rows: Sequence[Any]
+        async with slow_query_log.watch(self.session, self.model.__name__, "paginate"):
+            if execution == WINDOW:
+                rows, window_total = await self._fetch_with_total(
+                    self._offset_query(query, filter_options), projected
+                )
+                next_cursor = prev_cursor = None
+                if window_total is not None:
+                    count_result = CountResult(window_total)
+                elif not (
+                    filter_options.query_params and filter_options.query_params.skip
+                ):
+                    # An empty first page means nothing matched at all
+                    count_result = CountResult(0)
+                else:
+                    # Past the last page: the window had no row to report on
+                    count_result = await self.count_strategy.count(
+                        self.session, self.model, query, filtered
+                    )
+            elif execution == CONCURRENT:
+                count_result, (rows, next_cursor, prev_cursor) = await asyncio.gather(
+                    self._count_concurrently(query, filtered), fetch_page()
+                )
+            else:
+                count_result = await self.count_strategy.count(
+                    self.session, self.model, query, filtered
+                )
+                rows, next_cursor, prev_cursor = await fetch_page()
+
+        return rows, PageInfo(
+            total=count_result.value,
+            total_is_estimate=count_result.estimated,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+            count_execution=execution,
         )
-        total = await self.session.scalar(total_query) or 0
+
+    def _offset_query(
+        self, query: Select[Any], filter_options: FilterOptions
+    ) -> Select[Any]:
+        query_params = filter_options.query_params
+        if query_params and query_params.sorting is not None:
+            query = query.order_by(*self._build_sorting(query_params.sorting))
+        elif query_params and query_params.search and query_params.search_fields:
+            # Without an explicit sort, best matches come first
+            query = self.search_backend.order_by_rank(
+                query, self.model, query_params.search_fields, query_params.search
+            )
         if filter_options.query_params:
             query = query.offset(filter_options.query_params.skip).limit(
                 filter_options.query_params.page_size
             )
-        db_execute = await self.session.execute(query.where(condition))
-        result = db_execute.scalars().all()
-        return result, total
+        return query
+
+    async def stream(
+        self,
+        filter_options: FilterOptions,
+        columns: Sequence[str],
+        yield_per: int = 1000,
+    ) -> AsyncIterator[Sequence[Any]]:
+        """
+        Stream the `columns` of every row matching `filter_options` in
+        partitions of `yield_per` rows, fetched from a server-side cursor
+        where the driver supports one, sorted like the list view (by primary
+        key when no sort is given).
+        """
+        query = (
+            select(*(getattr(self.model, column) for column in columns))
+            .where(self._build_condition(filter_options))
+            .execution_options(yield_per=yield_per)
+        )
+        query_params = filter_options.query_params
+        if query_params and query_params.sorting is not None:
+            query = query.order_by(*self._build_sorting(query_params.sorting))
+        else:
+            query = query.order_by(get_primary_key(self.model))
+
+        result = await self.session.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
+    async def paginate_filter(
+        self,
+        filter_options: FilterOptions,
+    ) -> tuple[Sequence[ModelType], int]:
+        rows, page_info = await self.paginate(filter_options)
+        return rows, page_info.total
 
     async def get_all(
         self,
@@ -189,16 +490,79 @@ class CRUDGenerator(Generic[ModelType]):
         return result
 
     async def create(self, db: AsyncSession, obj_data: dict[str, Any]) -> ModelType:
-        obj = self.model(**obj_data)
-        db.add(obj)
+        """
+        Insert a row and read it back in the same `INSERT ... RETURNING`
+        statement, or with a refresh on dialects without RETURNING. A version
+        column starts at the mapper's first version, as with `session.add`.
+        """
+        connection = await db.connection()
+        if not connection.dialect.insert_returning:
+            obj = self.model(**obj_data)
+            db.add(obj)
+            await db.commit()
+            await db.refresh(obj)
+            return obj
+
+        mapper = inspect(self.model)
+        if mapper.version_id_col is not None and mapper.version_id_generator:
+            # Core inserts skip the mapper, which sets the first version
+            version_key = mapper.get_property_by_column(mapper.version_id_col).key
+            obj_data = {**obj_data, version_key: mapper.version_id_generator(None)}
+        result = await db.execute(
+            insert(self.model).values(**obj_data).returning(self.model)
+        )
+        obj = result.scalar_one()
+        # Detach the returned row so that committing doesn't expire it
+        db.expunge(obj)
         await db.commit()
-        await db.refresh(obj)
         return obj
 
-    async def update(self, where: dict[str, Any], values: dict[str, Any]) -> int:
-        # Get the session directly
-        filters = self._build_filters(where)
+    async def update_returning(
+        self,
+        obj_id: Any,
+        values: dict[str, Any],
+        expected: dict[str, Any] | None = None,
+    ) -> ModelType | None:
+        """
+        Update one row with a single `UPDATE ... WHERE pk = :id RETURNING`
+        statement, only applied while every column of `expected` still holds
+        the given value. Returns the updated row, or None when no row matched
+        because it is gone or was changed meanwhile.
+        """
+        conditions = [get_primary_key(self.model) == obj_id]
+        conditions.extend(
+            getattr(self.model, key).is_not_distinct_from(value)
+            for key, value in (expected or {}).items()
+        )
+        query = (
+            update(self.model)
+            .where(*conditions)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+        connection = await self.session.connection()
+        if not connection.dialect.update_returning:
+            cursor = await self.session.execute(query)
+            await self.session.commit()
+            if not cursor.rowcount:
+                return None
+            return await self.session.get(self.model, obj_id, populate_existing=True)
 
+        result = await self.session.execute(
+            query.returning(self.model),
+            execution_options={"populate_existing": True},
+        )
+        obj = result.scalar_one_or_none()
+        if obj is not None:
+            self.session.expunge(obj)
+        await self.session.commit()
+        return obj
+
+    def _update_values(self, values: dict[str, Any]) -> dict[str, Any]:
+        """
+        Build the SET clause values; dicts are merged into JSON columns.
+        """
         update_values = {}
         for key, value in values.items():
             if isinstance(value, dict) and isinstance(
@@ -209,8 +573,91 @@ class CRUDGenerator(Generic[ModelType]):
                 )
             else:
                 update_values[key] = value
+        return update_values
 
-        query = update(self.model).where(and_(True, *filters)).values(**update_values)
-        result = await self.session.execute(query)
+    async def update(self, where: dict[str, Any], values: dict[str, Any]) -> int:
+        # Get the session directly
+        filters = self._build_filters(where)
+        rowcount = await self.update_where(and_(True, *filters), values)
         await self.session.commit()
+        return rowcount
+
+    async def update_where(self, condition: Any, values: dict[str, Any]) -> int:
+        """
+        Set `values` on every row matching `condition` in one statement,
+        without committing.
+        """
+        query = (
+            update(self.model)
+            .where(condition)
+            .values(**self._update_values(values))
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(query)
+        return result.rowcount
+
+    async def delete_where(self, condition: Any) -> int:
+        """
+        Delete every row matching `condition` in one statement, without
+        committing.
+        """
+        query = (
+            delete(self.model)
+            .where(condition)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(query)
         return result.rowcount
+
+    async def run_action(
+        self,
+        action: BulkAction,
+        ids: Sequence[Any] | None = None,
+        filter_options: FilterOptions | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        confirm_all: bool = False,
+    ) -> BulkActionResult:
+        """
+        Run a bulk action on the selected primary keys, `chunk_size` keys per
+        `pk IN (...)` statement, or else on all rows matching
+        `filter_options` in a single statement that never loads their keys.
+        All statements share one transaction, rolled back if any fails.
+
+        Raises:
+            ValidationException: If a destructive action would run on the
+                whole table, with neither filters nor a search, without
+                `confirm_all`.
+        """
+        filter_options = filter_options or FilterOptions(filters={})
+        query_params = filter_options.query_params
+        unfiltered = not filter_options.filters and not (
+            query_params and query_params.search
+        )
+        if ids is None and unfiltered and action.destructive and not confirm_all:
+            raise ValidationException(
+                message=f"{action.label} would affect every row; confirm to proceed"
+            )
+
+        if ids is not None:
+            pk = get_primary_key(self.model)
+            conditions = [
+                pk.in_(ids[start : start + chunk_size])
+                for start in range(0, len(ids), chunk_size)
+            ]
+        else:
+            conditions = [self._build_condition(filter_options)]
+
+        rowcount = 0
+        try:
+            for condition in conditions:
+                rowcount += await action.run(self, condition)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return BulkActionResult(
+            action=action.name,
+            label=action.label,
+            rowcount=rowcount,
+            statements=len(conditions),
+        )
@@ -1,33 +1,297 @@
-from collections.abc import AsyncGenerator, Callable
+import itertools
+import time
+from collections.abc import AsyncGenerator, Callable, Sequence
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, NamedTuple
+from weakref import WeakKeyDictionary
 
+from fastapi import Request
+from sqlalchemy import Connection, Engine, event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
+
+from fastapi_admin_next.configs import EngineProfile
+
+ROUND_ROBIN = "round_robin"
+LEAST_LOADED = "least_loaded"
+REPLICA_SELECTIONS = (ROUND_ROBIN, LEAST_LOADED)
+
+# Session key holding the time until which reads stay on the primary
+READ_PRIMARY_UNTIL = "_read_primary_until"
 
 
 class Base(DeclarativeBase):
     """Base class for SQLAlchemy declarative models."""
 
 
+class PoolStats(NamedTuple):
+    """
+    A snapshot of an engine's connection pool. Pool counters are None for
+    pools that do not track them (e.g. `NullPool`, `StaticPool`).
+    """
+
+    size: int | None
+    checked_in: int | None
+    checked_out: int | None
+    overflow: int | None
+    acquisitions: int
+    wait_time_total: float
+    wait_time_max: float
+
+
+# When the current task's admin session last asked for a connection
+_checkout_requested: ContextVar[float | None] = ContextVar(
+    "admin_checkout_requested", default=None
+)
+
+
+class MonitoredSession(Session):
+    """
+    A session noting when it asks for a connection, so that the pool's
+    checkout event can time the wait. Like any session, it only checks a
+    connection out for its first statement.
+    """
+
+    def get_bind(self, *args: Any, **kwargs: Any) -> Engine | Connection:
+        # Called before every connection is acquired
+        _checkout_requested.set(time.perf_counter())
+        return super().get_bind(*args, **kwargs)
+
+
+class PoolMonitor:
+    """
+    Tracks the connections checked out of an engine's pool and how long
+    admin sessions waited for them, through the pool's checkout and checkin
+    events. One monitor per engine, see `for_engine`.
+    """
+
+    _monitors: "WeakKeyDictionary[Engine, PoolMonitor]" = WeakKeyDictionary()
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.in_use = 0
+        self.acquisitions = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        event.listen(engine.sync_engine, "checkout", self._on_checkout)
+        event.listen(engine.sync_engine, "checkin", self._on_checkin)
+
+    @classmethod
+    def for_engine(cls, engine: AsyncEngine) -> "PoolMonitor":
+        monitor = cls._monitors.get(engine.sync_engine)
+        if monitor is None:
+            monitor = cls._monitors[engine.sync_engine] = cls(engine)
+        return monitor
+
+    def _on_checkout(self, *_: Any) -> None:
+        self.in_use += 1
+        requested = _checkout_requested.get()
+        if requested is not None:
+            _checkout_requested.set(None)
+            self.record_wait(time.perf_counter() - requested)
+
+    def _on_checkin(self, *_: Any) -> None:
+        self.in_use = max(self.in_use - 1, 0)
+
+    def record_wait(self, seconds: float) -> None:
+        self.acquisitions += 1
+        self.wait_time_total += seconds
+        self.wait_time_max = max(self.wait_time_max, seconds)
+
+    def checked_out(self) -> int:
+        """
+        Connections currently in use, 0 for pools that do not count them.
+        """
+        checkedout = getattr(self.engine.pool, "checkedout", None)
+        return int(checkedout()) if checkedout else 0
+
+    def stats(self) -> PoolStats:
+        pool = self.engine.pool
+
+        def counter(name: str) -> int | None:
+            method = getattr(pool, name, None)
+            return int(method()) if method else None
+
+        return PoolStats(
+            size=counter("size"),
+            checked_in=counter("checkedin"),
+            checked_out=counter("checkedout"),
+            overflow=counter("overflow"),
+            acquisitions=self.acquisitions,
+            wait_time_total=self.wait_time_total,
+            wait_time_max=self.wait_time_max,
+        )
+
+
+class _Database(NamedTuple):
+    sessionmaker: async_sessionmaker  # type: ignore
+    monitor: PoolMonitor
+    owned: bool
+
+
+def _create_database(
+    database: str | AsyncEngine, profile: EngineProfile | None
+) -> _Database:
+    if isinstance(database, AsyncEngine):
+        engine, owned = database, False
+    else:
+        engine = create_async_engine(
+            database, **(profile or EngineProfile()).engine_kwargs()
+        )
+        owned = True
+    return _Database(_sessionmaker(engine), PoolMonitor.for_engine(engine), owned)
+
+
+def _sessionmaker(engine: AsyncEngine) -> async_sessionmaker:  # type: ignore
+    return async_sessionmaker(
+        bind=engine, expire_on_commit=False, sync_session_class=MonitoredSession
+    )
+
+
 class DBConnector:
     _engine: AsyncEngine | None = None
+    _owns_engine: bool = False
+    _monitor: PoolMonitor | None = None
     _sessionmaker: async_sessionmaker | None = None  # type: ignore
+    _replicas: list[_Database] = []
+    _replica_selection: str = ROUND_ROBIN
+    _replica_counter = itertools.count()
+    read_after_write_seconds: float = 5.0
 
     @classmethod
-    def register_db(cls, database_url: str) -> None:
+    def register_db(
+        cls,
+        database_url: str | None = None,
+        profile: EngineProfile | None = None,
+        engine: AsyncEngine | None = None,
+    ) -> None:
         """
-        Registers the database URL and initializes the engine and sessionmaker.
+        Registers the database and initializes the engine and sessionmaker.
 
         Args:
-            database_url (str): The database URL to connect to.
+            database_url (str | None): The database URL to connect to.
+            profile (EngineProfile | None): Engine and pool settings used when
+                the engine is created from `database_url`.
+            engine (AsyncEngine | None): An existing engine to share, e.g. the
+                host application's, instead of opening a second pool.
+
+        Raises:
+            ValueError: If neither or both of `database_url` and `engine` are given.
         """
-        cls._engine = create_async_engine(database_url, echo=True, future=True)
-        cls._sessionmaker = async_sessionmaker(bind=cls._engine, expire_on_commit=False)
+        if (database_url is None) == (engine is None):
+            raise ValueError("Pass either `database_url` or `engine`.")
+
+        database = _create_database(
+            engine if engine is not None else database_url, profile  # type: ignore
+        )
+        cls._engine = database.monitor.engine
+        cls._owns_engine = database.owned
+        cls._monitor = database.monitor
+        cls._sessionmaker = database.sessionmaker
+
+    @classmethod
+    def register_replicas(
+        cls,
+        replicas: Sequence[str | AsyncEngine],
+        profile: EngineProfile | None = None,
+        selection: str = ROUND_ROBIN,
+        read_after_write_seconds: float = 5.0,
+    ) -> None:
+        """
+        Registers read replicas used by `get_read_db`, replacing any
+        registered before.
+
+        Args:
+            replicas (Sequence[str | AsyncEngine]): Replica URLs, opened with
+                `profile`, or existing engines.
+            profile (EngineProfile | None): Engine and pool settings for URLs.
+            selection (str): "round_robin", or "least_loaded" to pick the
+                replica with the fewest connections checked out.
+            read_after_write_seconds (float): How long reads of a client stay
+                on the primary after it wrote, so it sees its own changes.
+
+        Raises:
+            ValueError: If `selection` is unknown.
+        """
+        if selection not in REPLICA_SELECTIONS:
+            raise ValueError(f"Unknown replica selection {selection!r}")
+        cls._replicas = [_create_database(replica, profile) for replica in replicas]
+        cls._replica_selection = selection
+        cls._replica_counter = itertools.count()
+        cls.read_after_write_seconds = read_after_write_seconds
+
+    @classmethod
+    def _pick_replica(cls) -> _Database | None:
+        if not cls._replicas:
+            return None
+        start = next(cls._replica_counter) % len(cls._replicas)
+        # Rotating the starting point spreads ties between equally loaded replicas
+        ordered = cls._replicas[start:] + cls._replicas[:start]
+        if cls._replica_selection == LEAST_LOADED:
+            return min(ordered, key=lambda replica: replica.monitor.in_use)
+        return ordered[0]
+
+    @classmethod
+    def pool_stats(cls) -> PoolStats:
+        """
+        Returns live statistics of the registered engine's pool.
+
+        Raises:
+            ValueError: If the database is not registered.
+        """
+        if cls._monitor is None:
+            raise ValueError(
+                "Database is not registered. Call `DBConnector.register_db` first."
+            )
+        return cls._monitor.stats()
+
+    @classmethod
+    def engines(cls) -> list[AsyncEngine]:
+        """
+        The registered primary and replica engines.
+        """
+        engines = [replica.monitor.engine for replica in cls._replicas]
+        if cls._engine is not None:
+            engines.insert(0, cls._engine)
+        return engines
+
+    @classmethod
+    def session_factory(cls, engine: AsyncEngine) -> async_sessionmaker:  # type: ignore
+        """
+        The sessionmaker of a registered engine, so that extra sessions (such
+        as a concurrent count's) are monitored too; a new monitored one for
+        other engines.
+        """
+        if engine is cls._engine and cls._sessionmaker is not None:
+            return cls._sessionmaker
+        for replica in cls._replicas:
+            if replica.monitor.engine is engine:
+                return replica.sessionmaker
+        return _sessionmaker(engine)
+
+    @classmethod
+    def replica_pool_stats(cls) -> list[PoolStats]:
+        """
+        Returns live statistics of each replica's pool, in registration order.
+        """
+        return [replica.monitor.stats() for replica in cls._replicas]
+
+    @classmethod
+    async def dispose(cls) -> None:
+        """
+        Closes the pools, except engines shared with the host application.
+        """
+        if cls._engine is not None and cls._owns_engine:
+            await cls._engine.dispose()
+        for replica in cls._replicas:
+            if replica.owned:
+                await replica.monitor.engine.dispose()
 
     @classmethod
     @asynccontextmanager
@@ -45,9 +309,51 @@ class DBConnector:
             raise ValueError(
                 "Database is not registered. Call `DBConnector.register_db` first."
             )
-        async with cls._sessionmaker() as session:  # pylint: disable=not-callable
+        async with cls._sessionmaker() as session:
             yield session
 
+    @classmethod
+    @asynccontextmanager
+    async def get_read_db(
+        cls, use_primary: bool = False
+    ) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Provides a session for read-only work: on a replica when any are
+        registered, otherwise (or with `use_primary`) on the primary.
+
+        Yields:
+            AsyncSession: An instance of the SQLAlchemy AsyncSession.
+        """
+        replica = None if use_primary else cls._pick_replica()
+        if replica is None:
+            async with cls.get_db() as session:
+                yield session
+            return
+        async with replica.sessionmaker() as session:
+            yield session
+
+    @classmethod
+    def mark_write(cls, request: Request) -> None:
+        """
+        Keeps the client's reads on the primary for `read_after_write_seconds`,
+        so the page it is redirected to shows its own write.
+        """
+        if cls._replicas and "session" in request.scope:
+            request.session[READ_PRIMARY_UNTIL] = (
+                time.time() + cls.read_after_write_seconds
+            )
+
+    @classmethod
+    def reads_from_primary(cls, request: Request) -> bool:
+        session: dict[str, Any] = request.scope.get("session") or {}
+        read_primary_until = session.get(READ_PRIMARY_UNTIL)
+        if read_primary_until is None:
+            return False
+        if read_primary_until > time.time():
+            return True
+        request.session.pop(READ_PRIMARY_UNTIL, None)
+        return False
+
     @classmethod
     def dependency(cls) -> Callable[[], AsyncGenerator[AsyncSession, None]]:
         """
@@ -62,3 +368,21 @@ class DBConnector:
                 yield session
 
         return _get_db
+
+    @classmethod
+    def read_dependency(cls) -> Callable[..., AsyncGenerator[AsyncSession, None]]:
+        """
+        Returns a FastAPI dependency for a read-only database session, routed
+        to a replica unless the client wrote recently.
+
+        Returns:
+            Callable[..., AsyncGenerator[AsyncSession, None]]: A callable dependency for FastAPI.
+        """
+
+        async def _get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+            async with cls.get_read_db(
+                use_primary=cls.reads_from_primary(request)
+            ) as session:
+                yield session
+
+        return _get_read_db
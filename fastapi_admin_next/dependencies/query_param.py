@@ -1,10 +1,12 @@
+from collections.abc import Sequence
+
 from fastapi import Request
 
 from fastapi_admin_next.schemas import QueryParams
 
 
 class CommonQueryParam:
-    def __init__(self, filter_fields: list[str] | None = None):
+    def __init__(self, filter_fields: Sequence[str] | None = None):
         self.filter_fields = filter_fields
 
     def __call__(self, request: Request) -> QueryParams:
@@ -14,6 +16,14 @@ class CommonQueryParam:
         page = int(query_params.get("page", 1))
         page_size = int(query_params.get("page_size", 10))
         fetch_related_data = query_params.get("fetch_related_data")
+        cursor = query_params.get("cursor")
+        # `sort=field` ascending, `sort=-field` descending
+        sort = query_params.get("sort")
+        sorting = (
+            {sort.lstrip("-"): "desc" if sort.startswith("-") else "asc"}
+            if sort
+            else None
+        )
 
         # Filter and clean additional query parameters
         filter_params = {
@@ -28,4 +38,6 @@ class CommonQueryParam:
             page_size=page_size,
             fetch_related_data=fetch_related_data,
             filter_params=filter_params,
+            cursor=cursor,
+            sorting=sorting,
         )
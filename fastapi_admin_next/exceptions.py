@@ -20,3 +20,8 @@ class DatabaseError(CustomException):
 class ValidationException(CustomException):
     code = status.HTTP_400_BAD_REQUEST
     message = "Validation failed"
+
+
+class TooManyRequestsException(CustomException):
+    code = status.HTTP_429_TOO_MANY_REQUESTS
+    message = "Too many requests"
@@ -0,0 +1,61 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Iterable, Sequence
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any
+
+CSV = "csv"
+NDJSON = "ndjson"
+EXPORT_FORMATS = (CSV, NDJSON)
+MEDIA_TYPES = {CSV: "text/csv; charset=utf-8", NDJSON: "application/x-ndjson"}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value)  # Decimal, UUID, ...
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def encode_rows(
+    columns: Sequence[str], rows: Iterable[Sequence[Any]], export_format: str
+) -> str:
+    """
+    Encode a batch of rows as CSV lines or NDJSON records.
+    """
+    if export_format == NDJSON:
+        return "".join(
+            json.dumps(dict(zip(columns, row)), default=_json_default) + "\n"
+            for row in rows
+        )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+async def export_stream(
+    columns: Sequence[str],
+    partitions: AsyncIterator[Sequence[Sequence[Any]]],
+    export_format: str,
+) -> AsyncIterator[str]:
+    """
+    Encode partitions of rows one at a time, so memory use depends on the
+    partition size and never on the size of the export. CSV starts with a
+    header line.
+    """
+    if export_format == CSV:
+        yield encode_rows(columns, [columns], CSV)
+    async for rows in partitions:
+        yield encode_rows(columns, rows, export_format)
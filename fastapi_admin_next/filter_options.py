@@ -0,0 +1,438 @@
+from collections import defaultdict
+from collections.abc import Callable, Hashable, Iterable, Sequence
+from typing import Any, NamedTuple
+
+from sqlalchemy import Column, Result, Select, String, cast, func, inspect, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_admin_next.cache import TTLCache
+from fastapi_admin_next.db_connect import Base
+from fastapi_admin_next.schemas import FilterFieldOptions
+
+
+def get_column(model: type[Base], field: str) -> Column[Any] | None:
+    """
+    Find a table column of `model` by name.
+    """
+    for column in inspect(model).columns:
+        if column.name == field:
+            return column
+    return None
+
+
+RELATION_SEPARATOR = "__"
+
+
+class FieldPath(NamedTuple):
+    """
+    A column reached from a model, possibly through relationships
+    (`relation__field`).
+    """
+
+    column: Any
+    relationships: tuple[Any, ...] = ()
+
+    @property
+    def model(self) -> type[Base]:
+        """
+        The model the column belongs to.
+        """
+        return self.column.class_  # type: ignore
+
+    def where(self, condition: Any) -> Any:
+        """
+        Wrap a condition on the column into `EXISTS` subqueries along the
+        relationships (`has()` for many-to-one, `any()` for collections), so
+        the outer query keeps one row per instance and needs no join.
+        """
+        for relationship in reversed(self.relationships):
+            if relationship.property.uselist:
+                condition = relationship.any(condition)
+            else:
+                condition = relationship.has(condition)
+        return condition
+
+
+def resolve_field(model: type[Base], path: str) -> FieldPath | None:
+    """
+    Resolve `field` or `relation__field` (any depth) against `model`.
+    """
+    *relation_names, field = path.split(RELATION_SEPARATOR)
+    if not relation_names:
+        attribute = getattr(model, field, None)
+        return FieldPath(attribute) if attribute is not None else None
+
+    relationships = []
+    current = model
+    for name in relation_names:
+        relationship = inspect(current).relationships.get(name)
+        if relationship is None:
+            return None
+        relationships.append(getattr(current, name))
+        current = relationship.mapper.class_
+    if field not in inspect(current).column_attrs:
+        return None
+    return FieldPath(getattr(current, field), tuple(relationships))
+
+
+def get_related_model(model: type[Base], column: Column[Any]) -> type[Base]:
+    """
+    Resolve the ORM model a foreign key column points to.
+    """
+    foreign_key = list(column.foreign_keys)[0]
+    related_table = foreign_key.column.table
+
+    for mapper in model.registry.mappers:
+        if mapper.persist_selectable == related_table:
+            return mapper.class_
+
+    raise ValueError(f"Could not find ORM model for table {related_table}")
+
+
+def get_primary_key(model: type[Base]) -> Any:
+    """
+    Get the mapped primary key attribute of `model`.
+    """
+    return getattr(model, inspect(model).primary_key[0].key)
+
+
+def _options_query(related_model: type[Base], label_column: Any = None) -> Select[Any]:
+    """
+    Select (value, label) pairs of a related model: the label expression when
+    one is registered, otherwise the whole entity to be rendered with `str()`.
+    """
+    related_pk = get_primary_key(related_model)
+    if label_column is not None:
+        return select(related_pk, label_column.label("label")).order_by(related_pk)
+    return select(related_model).order_by(related_pk)
+
+
+def _to_options(result: Result[Any], label_column: Any = None) -> list[dict[str, Any]]:
+    if label_column is not None:
+        return [{"value": value, "label": str(label)} for value, label in result]
+    return [{"value": obj.id, "label": str(obj)} for obj in result.scalars().all()]
+
+
+async def fetch_related_labels(
+    related_model: type[Base],
+    db_session: AsyncSession,
+    ids: Iterable[Any],
+    label_column: Any = None,
+) -> dict[Any, str]:
+    """
+    Resolve the labels of the given primary keys with a single `IN` query.
+    """
+    ids = list(ids)
+    if not ids:
+        return {}
+    query = _options_query(related_model, label_column).where(
+        get_primary_key(related_model).in_(ids)
+    )
+    result = await db_session.execute(query)
+    return {
+        option["value"]: option["label"] for option in _to_options(result, label_column)
+    }
+
+
+class RelatedLabelLoader:
+    """
+    Resolves foreign key values to labels of the related rows, with one
+    `IN (...)` query per related model selecting only the primary key and
+    label. Labels are memoized for the loader's lifetime, one request.
+    """
+
+    def __init__(
+        self,
+        db_session: AsyncSession,
+        label_column: Callable[[type[Base]], Any] | None = None,
+    ) -> None:
+        self.db_session = db_session
+        self.label_column = label_column or (lambda model: None)
+        self._labels: dict[type[Base], dict[Any, str]] = defaultdict(dict)
+
+    async def load(self, related_model: type[Base], ids: Iterable[Any]) -> None:
+        """
+        Fetch the labels of the given keys that are not known yet.
+        """
+        labels = self._labels[related_model]
+        missing = {value for value in ids if value is not None} - labels.keys()
+        if missing:
+            labels.update(
+                await fetch_related_labels(
+                    related_model,
+                    self.db_session,
+                    missing,
+                    self.label_column(related_model),
+                )
+            )
+
+    def labels(self, related_model: type[Base]) -> dict[Any, str]:
+        return self._labels[related_model]
+
+    async def resolve(
+        self, rows: Iterable[Any], relations: Iterable[Any]
+    ) -> dict[str, dict[Any, str]]:
+        """
+        Label the foreign keys of `rows` for each of `relations` (having
+        `fk_column` and `related_model`), keyed by foreign key column.
+        Columns pointing to the same model share a single query.
+        """
+        rows = list(rows)
+        relations = list(relations)
+        ids_by_model: dict[type[Base], set[Any]] = defaultdict(set)
+        for relation in relations:
+            ids_by_model[relation.related_model].update(
+                getattr(row, relation.fk_column) for row in rows
+            )
+        for related_model, ids in ids_by_model.items():
+            await self.load(related_model, ids)
+
+        related_labels = {}
+        for relation in relations:
+            labels = self.labels(relation.related_model)
+            related_labels[relation.fk_column] = {
+                value: labels[value]
+                for value in (getattr(row, relation.fk_column) for row in rows)
+                if value in labels
+            }
+        return related_labels
+
+
+async def search_related(  # pylint: disable=too-many-arguments
+    related_model: type[Base],
+    db_session: AsyncSession,
+    term: str,
+    search_fields: Sequence[str] | None = None,
+    label_column: Any = None,
+    page: int = 1,
+    page_size: int = 20,
+) -> list[dict[str, Any]]:
+    """
+    Page through the rows of a related model matching `term` on its
+    `search_fields`, falling back to its label expression, then its primary
+    key.
+    """
+    query = _options_query(related_model, label_column)
+    if term:
+        columns = [
+            getattr(related_model, name)
+            for name in search_fields or []
+            if hasattr(related_model, name)
+        ] or [
+            (
+                label_column
+                if label_column is not None
+                else cast(get_primary_key(related_model), String)
+            )
+        ]
+        query = query.where(or_(*(c.ilike(f"%{term}%") for c in columns)))
+    result = await db_session.execute(
+        query.offset((page - 1) * page_size).limit(page_size)
+    )
+    return _to_options(result, label_column)
+
+
+class FilterOptionsEngine:
+    """
+    Builds the choices shown for list view filter fields.
+
+    Options are cached per (model, field) for `ttl` seconds and dropped as
+    soon as the admin writes to either table involved. A field whose
+    cardinality exceeds `typeahead_threshold` is not listed at all; it is
+    marked `remote` and the list view searches it through the filter options
+    endpoint instead. With `top_n`, only the most frequent values are listed.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        maxsize: int = 512,
+        typeahead_threshold: int = 100,
+        label_column: Callable[[type[Base]], Any] | None = None,
+    ) -> None:
+        self.typeahead_threshold = typeahead_threshold
+        self.label_column = label_column or (lambda model: None)
+        self._cache: TTLCache[FilterFieldOptions] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._keys_by_model: dict[type[Base], set[Hashable]] = defaultdict(set)
+
+    @staticmethod
+    def _resolve_column(
+        model: type[Base], field: str
+    ) -> tuple[Column[Any] | None, type[Base]]:
+        """
+        Find the table column behind a filter field and the model owning it;
+        `relation__field` paths list the values of the related table.
+        """
+        column = get_column(model, field)
+        if column is not None or RELATION_SEPARATOR not in field:
+            return column, model
+        path = resolve_field(model, field)
+        if path is None:
+            return None, model
+        return get_column(path.model, path.column.key), path.model
+
+    async def get_options(
+        self,
+        model: type[Base],
+        field: str,
+        db_session: AsyncSession,
+        top_n: int | None = None,
+    ) -> FilterFieldOptions:
+        key = (model.__name__, field)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        column, owner = self._resolve_column(model, field)
+        if column is None:
+            return FilterFieldOptions()
+
+        if hasattr(column.type, "enums"):
+            # Enum choices never touch the database, nothing to cache
+            return FilterFieldOptions(
+                options=[
+                    {"value": value, "label": value} for value in column.type.enums
+                ]
+            )
+
+        related_model = None
+        if column.foreign_keys:
+            related_model = get_related_model(owner, column)
+
+        if top_n:
+            field_options = await self._top_values(
+                owner, column, related_model, db_session, top_n
+            )
+        else:
+            field_options = await self._bounded_values(
+                owner, column, related_model, db_session
+            )
+
+        self._cache.set(key, field_options)
+        self._keys_by_model[model].add(key)
+        self._keys_by_model[owner].add(key)
+        if related_model is not None:
+            self._keys_by_model[related_model].add(key)
+        return field_options
+
+    async def _bounded_values(
+        self,
+        model: type[Base],
+        column: Column[Any],
+        related_model: type[Base] | None,
+        db_session: AsyncSession,
+    ) -> FilterFieldOptions:
+        """
+        List every value, or switch to typeahead if there are too many.
+        """
+        limit = self.typeahead_threshold + 1
+        if related_model is not None:
+            label_column = self.label_column(related_model)
+            result = await db_session.execute(
+                _options_query(related_model, label_column).limit(limit)
+            )
+            options = _to_options(result, label_column)
+        else:
+            result = await db_session.execute(
+                select(column).distinct().order_by(column).limit(limit)
+            )
+            options = [
+                {"value": value, "label": str(value)}
+                for value in result.scalars().all()
+            ]
+
+        if len(options) > self.typeahead_threshold:
+            return FilterFieldOptions(remote=True)
+        return FilterFieldOptions(options=options)
+
+    async def _top_values(
+        self,
+        model: type[Base],
+        column: Column[Any],
+        related_model: type[Base] | None,
+        db_session: AsyncSession,
+        top_n: int,
+    ) -> FilterFieldOptions:
+        """
+        List the `top_n` most frequent values; the rest stay reachable
+        through typeahead.
+        """
+        result = await db_session.execute(
+            select(column)
+            .where(column.is_not(None))
+            .group_by(column)
+            .order_by(func.count().desc())
+            .limit(top_n + 1)
+        )
+        values = list(result.scalars().all())
+        remote = len(values) > top_n
+        values = values[:top_n]
+
+        if related_model is None:
+            return FilterFieldOptions(
+                options=[{"value": value, "label": str(value)} for value in values],
+                remote=remote,
+            )
+
+        labels = await fetch_related_labels(
+            related_model, db_session, values, self.label_column(related_model)
+        )
+        return FilterFieldOptions(
+            options=[
+                {"value": value, "label": labels.get(value, str(value))}
+                for value in values
+            ],
+            remote=remote,
+        )
+
+    async def search(  # pylint: disable=too-many-arguments
+        self,
+        model: type[Base],
+        field: str,
+        db_session: AsyncSession,
+        term: str,
+        search_fields: Sequence[str] | None = None,
+        page: int = 1,
+        page_size: int = 20,
+    ) -> list[dict[str, Any]]:
+        """
+        Page through the values of a filter field matching `term`. Foreign
+        keys are matched against the related model's `search_fields`, falling
+        back to its primary key.
+        """
+        column, owner = self._resolve_column(model, field)
+        if column is None:
+            return []
+
+        if column.foreign_keys:
+            related_model = get_related_model(owner, column)
+            return await search_related(
+                related_model,
+                db_session,
+                term,
+                search_fields=search_fields,
+                label_column=self.label_column(related_model),
+                page=page,
+                page_size=page_size,
+            )
+
+        query = select(column).where(column.is_not(None)).distinct().order_by(column)
+        if term:
+            query = query.where(cast(column, String).ilike(f"{term}%"))
+        result = await db_session.execute(
+            query.offset((page - 1) * page_size).limit(page_size)
+        )
+        return [
+            {"value": value, "label": str(value)} for value in result.scalars().all()
+        ]
+
+    def invalidate(self, model: type[Base]) -> None:
+        """
+        Drop every cached option list that reads from the model's table.
+        """
+        for key in self._keys_by_model.pop(model, set()):
+            self._cache.pop(key)
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._keys_by_model.clear()
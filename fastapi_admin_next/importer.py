@@ -0,0 +1,237 @@
+import csv
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from functools import lru_cache
+from itertools import groupby, islice
+from typing import IO, Any
+
+from pydantic import BaseModel, TypeAdapter, ValidationError, create_model
+from sqlalchemy import insert, inspect
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from fastapi_admin_next.db_connect import Base
+from fastapi_admin_next.export import CSV, NDJSON
+from fastapi_admin_next.schemas import ImportResult
+from fastapi_admin_next.validation import generate_pydantic_model
+
+DEFAULT_CHUNK_SIZE = 1000
+# Row errors kept for the report, the rest are only counted
+MAX_REPORTED_ERRORS = 1000
+
+# (row number, values or a parse error)
+ParsedRow = tuple[int, dict[str, Any] | str]
+
+
+def import_format(filename: str | None) -> str | None:
+    """
+    Guess the import format from a file name.
+    """
+    extension = (filename or "").rsplit(".", 1)[-1].lower()
+    if extension == CSV:
+        return CSV
+    if extension in (NDJSON, "jsonl"):
+        return NDJSON
+    return None
+
+
+def parse_rows(lines: Iterable[str], import_format: str) -> Iterator[ParsedRow]:
+    """
+    Lazily parse CSV (with a header line) or NDJSON into rows numbered from
+    1. Empty CSV fields are left out, so the validator's default applies.
+    """
+    if import_format == CSV:
+        reader = csv.DictReader(lines)
+        for row, record in enumerate(reader, start=1):
+            if None in record:
+                yield row, "Row has more fields than the header"
+            else:
+                yield row, {key: value for key, value in record.items() if value}
+        return
+
+    for row, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row, f"Invalid JSON: {e.msg}"
+            continue
+        if isinstance(value, dict):
+            yield row, value
+        else:
+            yield row, "Expected a JSON object"
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(
+    validator: type[BaseModel], model: type[Base], keys: tuple[str, ...] = ()
+) -> TypeAdapter[list[BaseModel]]:
+    """
+    The list validator of a chunk, built once per model as it compiles a
+    validator. Natural key columns the form validator leaves out (such as
+    the primary key) are added, typed from the model's columns.
+    """
+    missing = [key for key in keys if key not in validator.model_fields]
+    if missing:
+        columns = generate_pydantic_model(
+            model,  # type: ignore
+            exclude=[
+                key for key in inspect(model).column_attrs.keys() if key not in missing
+            ],
+        )
+        validator = create_model(  # type: ignore
+            validator.__name__,
+            __base__=validator,
+            **{key: (columns.model_fields[key].annotation, ...) for key in missing},
+        )
+    return TypeAdapter(list[validator])  # type: ignore
+
+
+def _upsert_statement(
+    dialect: str, model: type[Base], key: Sequence[str], columns: Iterable[str]
+) -> Any:
+    update_columns = [column for column in columns if column not in key]
+    if dialect == "postgresql":
+        pg_insert = postgresql.insert(model)
+        if not update_columns:
+            return pg_insert.on_conflict_do_nothing(index_elements=list(key))
+        return pg_insert.on_conflict_do_update(
+            index_elements=list(key),
+            set_={column: pg_insert.excluded[column] for column in update_columns},
+        )
+    if dialect == "sqlite":
+        sqlite_insert = sqlite.insert(model)
+        if not update_columns:
+            return sqlite_insert.on_conflict_do_nothing(index_elements=list(key))
+        return sqlite_insert.on_conflict_do_update(
+            index_elements=list(key),
+            set_={column: sqlite_insert.excluded[column] for column in update_columns},
+        )
+    if dialect in ("mysql", "mariadb"):
+        mysql_insert = mysql.insert(model)
+        return mysql_insert.on_duplicate_key_update(
+            {column: mysql_insert.inserted[column] for column in update_columns or key}
+        )
+    raise ValueError(f"Upsert is not supported on {dialect}")
+
+
+class BulkImporter:
+    """
+    Validates and writes imported rows one chunk at a time.
+
+    A chunk is validated with a single `TypeAdapter(list[validator])` call
+    and inserted with one executemany statement (batched by SQLAlchemy's
+    `insertmanyvalues`), then committed. With `upsert_on`, rows whose natural
+    key already exists update the stored row instead. Invalid rows are
+    reported and skipped; when the database rejects a chunk, its rows are
+    retried one by one so that only the offending rows fail.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        model: type[Base],
+        validator: type[BaseModel],
+        upsert_on: Sequence[str] = (),
+        max_errors: int = MAX_REPORTED_ERRORS,
+    ) -> None:
+        self.session = session
+        self.model = model
+        self.validator = validator
+        self.upsert_on = tuple(upsert_on)
+        self.max_errors = max_errors
+        self.result = ImportResult()
+
+    def _error(self, row: int, errors: dict[str, str]) -> None:
+        self.result.failed += 1
+        if len(self.result.errors) < self.max_errors:
+            self.result.errors.append({"row": row, "errors": errors})
+
+    def _validate(self, rows: list[ParsedRow]) -> list[tuple[int, dict[str, Any]]]:
+        candidates: list[tuple[int, dict[str, Any]]] = []
+        for row, values in rows:
+            if isinstance(values, str):
+                self._error(row, {"__row__": values})
+            elif any("password" in key.lower() for key in values):
+                self._error(row, {"__row__": "Password columns can't be imported"})
+            else:
+                candidates.append((row, values))
+
+        adapter = _list_adapter(self.validator, self.model, self.upsert_on)
+        try:
+            validated = adapter.validate_python([values for _, values in candidates])
+        except ValidationError as e:
+            errors_by_index: dict[int, dict[str, str]] = {}
+            for error in e.errors():
+                index, *field = error["loc"]
+                errors_by_index.setdefault(int(index), {})[
+                    str(field[-1]) if field else "__row__"
+                ] = error["msg"]
+            for index, errors in errors_by_index.items():
+                self._error(candidates[index][0], errors)
+            candidates = [
+                candidate
+                for index, candidate in enumerate(candidates)
+                if index not in errors_by_index
+            ]
+            validated = adapter.validate_python([values for _, values in candidates])
+
+        return [
+            (row, item.model_dump(exclude_unset=True))
+            for (row, _), item in zip(candidates, validated)
+        ]
+
+    async def _write(self, values: list[dict[str, Any]]) -> None:
+        # Rows providing the same columns share one executemany statement
+        def columns_of(item: dict[str, Any]) -> tuple[str, ...]:
+            return tuple(sorted(item))
+
+        dialect = (await self.session.connection()).dialect.name
+        for columns, group in groupby(sorted(values, key=columns_of), key=columns_of):
+            statement = (
+                _upsert_statement(dialect, self.model, self.upsert_on, columns)
+                if self.upsert_on
+                else insert(self.model)
+            )
+            await self.session.execute(statement, list(group))
+
+    async def import_chunk(self, rows: list[ParsedRow]) -> None:
+        valid = self._validate(rows)
+        self.result.chunks += 1
+        if not valid:
+            return
+        try:
+            await self._write([values for _, values in valid])
+            await self.session.commit()
+            self.result.imported += len(valid)
+            return
+        except DBAPIError:
+            await self.session.rollback()
+
+        for row, values in valid:
+            try:
+                await self._write([values])
+                await self.session.commit()
+                self.result.imported += 1
+            except DBAPIError as e:
+                await self.session.rollback()
+                self._error(row, {"__row__": str(e.orig)})
+
+    async def import_file(
+        self,
+        file: IO[str],
+        import_format: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> ImportResult:
+        """
+        Import a text file chunk by chunk. The file is read and parsed in a
+        worker thread, `chunk_size` rows at a time, so the whole upload is
+        never held in memory.
+        """
+        rows = parse_rows(file, import_format)
+        while chunk := await run_in_threadpool(lambda: list(islice(rows, chunk_size))):
+            await self.import_chunk(chunk)
+        return self.result
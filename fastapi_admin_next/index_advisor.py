@@ -0,0 +1,366 @@
+"""
+Compare the fields registered models filter, sort, join and search on with
+the indexes the database actually has.
+
+    python -m fastapi_admin_next.index_advisor example.app
+"""
+
+import argparse
+import asyncio
+import importlib
+import sys
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+from sqlalchemy import Column, Index, MetaData, Table, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Dialect, Inspector
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.schema import CreateIndex
+
+from fastapi_admin_next.db_connect import Base, DBConnector
+from fastapi_admin_next.filter_options import FieldPath, resolve_field
+from fastapi_admin_next.model_admin import ModelAdmin
+from fastapi_admin_next.registry import ModelRegistry, registry
+from fastapi_admin_next.schemas import IndexAdvice
+from fastapi_admin_next.search import (
+    IlikeSearch,
+    PostgresFullTextSearch,
+    SQLiteFTS5Search,
+)
+
+FILTER = "filter"
+SORT = "sort"
+FOREIGN_KEY = "foreign_key"
+SEARCH = "search"
+
+DIALECTS: dict[str, Dialect] = {
+    "postgresql": postgresql.dialect(),  # type: ignore
+    "sqlite": sqlite.dialect(),  # type: ignore
+}
+
+_REASON_TEXT = {
+    FILTER: "filtering",
+    SORT: "sorting",
+    FOREIGN_KEY: "foreign key lookups",
+}
+
+
+class _TableIndexes(NamedTuple):
+    # First column of each B-tree index, primary key and unique constraint
+    leading: frozenset[str]
+    # Columns with a pg_trgm GIN index
+    trigram: frozenset[str]
+    names: frozenset[str]
+
+
+def _reflect(inspector: Inspector, table_name: str) -> _TableIndexes:
+    leading: set[str] = set()
+    trigram: set[str] = set()
+    names: set[str] = set()
+    primary_key = inspector.get_pk_constraint(table_name)["constrained_columns"]
+    if primary_key:
+        leading.add(primary_key[0])
+    for unique in inspector.get_unique_constraints(table_name):
+        if unique["column_names"]:
+            leading.add(unique["column_names"][0])
+    for index in inspector.get_indexes(table_name):
+        if index["name"]:
+            names.add(index["name"])
+        options = index.get("dialect_options", {})
+        if options.get("postgresql_using", "btree") == "btree":
+            if index["column_names"] and index["column_names"][0]:
+                leading.add(index["column_names"][0])
+        else:
+            trigram.update(
+                column
+                for column, ops in options.get("postgresql_ops", {}).items()
+                if ops == "gin_trgm_ops"
+            )
+    return _TableIndexes(frozenset(leading), frozenset(trigram), frozenset(names))
+
+
+@lru_cache(maxsize=None)
+def _detached(table: Table) -> Table:
+    # Indexes built for DDL must not end up in the application's metadata
+    return table.to_metadata(MetaData())
+
+
+def _create_index_ddl(
+    table: Table, index_name: str, column: str, **kwargs: Any
+) -> dict[str, str]:
+    detached = _detached(table)
+    index = Index(
+        index_name, detached.c[column], postgresql_concurrently=True, **kwargs
+    )
+    try:
+        return {
+            name: str(
+                CreateIndex(index, if_not_exists=True).compile(  # type: ignore
+                    dialect=dialect
+                )
+            )
+            for name, dialect in DIALECTS.items()
+        }
+    finally:
+        detached.indexes.discard(index)
+
+
+def btree_ddl(table: Table, column: str) -> dict[str, list[str]]:
+    """
+    `CREATE INDEX` for one column, built concurrently on PostgreSQL so the
+    table stays writable.
+    """
+    ddl = _create_index_ddl(table, f"ix_{table.name}_{column}", column)
+    return {name: [statement] for name, statement in ddl.items()}
+
+
+def trigram_ddl(table: Table, columns: Sequence[str]) -> list[str]:
+    """
+    pg_trgm GIN indexes serving `ILIKE '%term%'` on PostgreSQL.
+    """
+    return ["CREATE EXTENSION IF NOT EXISTS pg_trgm"] + [
+        _create_index_ddl(
+            table,
+            f"ix_{table.name}_{column}_trgm",
+            column,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )["postgresql"]
+        for column in columns
+    ]
+
+
+def _column(path: FieldPath) -> Column[Any]:
+    return path.column.property.columns[0]  # type: ignore
+
+
+def _collection_keys(path: FieldPath) -> Iterable[tuple[type[Base], str]]:
+    # EXISTS over a collection matches the child's foreign key to the parent
+    for relationship in path.relationships:
+        prop = relationship.property
+        if prop.uselist:
+            for _, remote in prop.local_remote_pairs:
+                yield prop.mapper.class_, remote.name
+
+
+class _Reflection:
+    """
+    Table indexes reflected once per advisor run.
+    """
+
+    def __init__(self, inspector: Inspector) -> None:
+        self.inspector = inspector
+        self._tables: dict[str, _TableIndexes] = {}
+        self._table_names: set[str] | None = None
+
+    def __call__(self, table_name: str) -> _TableIndexes:
+        if table_name not in self._tables:
+            self._tables[table_name] = _reflect(self.inspector, table_name)
+        return self._tables[table_name]
+
+    def has_table(self, table_name: str) -> bool:
+        if self._table_names is None:
+            self._table_names = set(self.inspector.get_table_names())
+        return table_name in self._table_names
+
+
+def _add_btree_candidates(
+    admin: ModelAdmin, candidates: dict[tuple[type[Base], str], list[str]]
+) -> None:
+    def add(model: type[Base], column: str, reason: str) -> None:
+        reasons = candidates.setdefault((model, column), [])
+        if reason not in reasons:
+            reasons.append(reason)
+
+    table: Table = admin.model.__table__  # type: ignore
+    for field in admin.filter_fields:
+        path = resolve_field(admin.model, field)
+        if path is not None and hasattr(path.column, "property"):
+            add(path.model, _column(path).name, FILTER)
+            for model, column in _collection_keys(path):
+                add(model, column, FOREIGN_KEY)
+    for field in admin.search_fields:
+        path = resolve_field(admin.model, field)
+        if path is not None:
+            for model, column in _collection_keys(path):
+                add(model, column, FOREIGN_KEY)
+    # Only the columns the list view offers to sort on
+    for name in admin.sortable_fields:
+        if name not in admin.primary_key:
+            add(admin.model, name, SORT)
+    for table_column in table.columns:
+        if table_column.foreign_keys:
+            add(admin.model, table_column.name, FOREIGN_KEY)
+
+
+def _full_text_advice(admin: ModelAdmin, indexes: _Reflection) -> list[IndexAdvice]:
+    table: Table = admin.model.__table__  # type: ignore
+    backend = admin.search_backend
+    fields = [field for field in admin.search_fields if field in table.c]
+    if not fields:
+        return []
+    if isinstance(backend, PostgresFullTextSearch):
+        dialect = "postgresql"
+        present = f"ix_{table.name}_search_tsv" in indexes(table.name).names
+    elif isinstance(backend, SQLiteFTS5Search):
+        dialect = "sqlite"
+        present = indexes.has_table(backend.fts_table_name(admin.model))
+    else:
+        return []
+    if present:
+        return []
+    return [
+        IndexAdvice(
+            model=admin.name,
+            table=table.name,
+            column=", ".join(fields),
+            reasons=[SEARCH],
+            message=(
+                f"The {type(backend).__name__} index is missing, so searches "
+                "fail or scan the table."
+            ),
+            ddl={dialect: backend.ddl(admin.model, fields)},
+        )
+    ]
+
+
+def _ilike_columns(admin: ModelAdmin) -> Iterable[tuple[type[Base], str]]:
+    if isinstance(admin.search_backend, IlikeSearch):
+        for field in admin.search_fields:
+            path = resolve_field(admin.model, field)
+            if path is not None and hasattr(path.column, "property"):
+                yield path.model, _column(path).name
+
+
+def _ilike_advice(model: type[Base], columns: Sequence[str]) -> IndexAdvice:
+    table: Table = model.__table__  # type: ignore
+    return IndexAdvice(
+        model=model.__name__,
+        table=table.name,
+        column=", ".join(columns),
+        reasons=[SEARCH],
+        message=(
+            "ILIKE searches can't use a B-tree index and scan the table. On "
+            "PostgreSQL pg_trgm indexes serve them; on SQLite switch the model "
+            "to SQLiteFTS5Search."
+        ),
+        ddl={
+            "postgresql": trigram_ddl(table, columns),
+            "sqlite": SQLiteFTS5Search().ddl(model, columns),
+        },
+    )
+
+
+def _advise(inspector: Inspector, admins: Sequence[ModelAdmin]) -> list[IndexAdvice]:
+    indexes = _Reflection(inspector)
+    advice: list[IndexAdvice] = []
+    # Columns needing a B-tree index and why, gathered from every admin
+    candidates: dict[tuple[type[Base], str], list[str]] = {}
+    # Columns searched with ILIKE by any admin, per table
+    searched: dict[type[Base], list[str]] = {}
+    for admin in admins:
+        if not indexes.has_table(admin.model.__table__.name):  # type: ignore
+            continue
+        _add_btree_candidates(admin, candidates)
+        advice.extend(_full_text_advice(admin, indexes))
+        for model, column in _ilike_columns(admin):
+            columns = searched.setdefault(model, [])
+            if column not in columns:
+                columns.append(column)
+
+    for (model, column), reasons in candidates.items():
+        table: Table = model.__table__  # type: ignore
+        if not indexes.has_table(table.name) or column in indexes(table.name).leading:
+            continue
+        uses = " and ".join(_REASON_TEXT[reason] for reason in reasons)
+        verb = "scan" if len(reasons) > 1 else "scans"
+        advice.append(
+            IndexAdvice(
+                model=model.__name__,
+                table=table.name,
+                column=column,
+                reasons=reasons,
+                message=f"No index starts with {column}, so {uses} {verb} the table.",
+                ddl=btree_ddl(table, column),
+            )
+        )
+    for model, columns in searched.items():
+        table_indexes = indexes(model.__table__.name)  # type: ignore
+        missing = [column for column in columns if column not in table_indexes.trigram]
+        if missing:
+            advice.append(_ilike_advice(model, missing))
+    return advice
+
+
+async def advise(
+    connection: AsyncConnection, model_registry: ModelRegistry = registry
+) -> list[IndexAdvice]:
+    """
+    Reflect the live indexes of the registered models' tables and report
+    the filter, sort, foreign key and search fields no index serves, with
+    the DDL that would create one.
+    """
+    admins = [model_registry.get_admin(model) for model in model_registry.get_models()]
+    return await connection.run_sync(
+        lambda sync_connection: _advise(inspect(sync_connection), admins)
+    )
+
+
+async def _run(url: str | None) -> tuple[str, list[IndexAdvice]]:
+    if url:
+        engine = create_async_engine(url)
+    else:
+        engines = DBConnector.engines()
+        if not engines:
+            raise ValueError("The module registered no database, pass --url")
+        engine = engines[0]
+    try:
+        async with engine.connect() as connection:
+            return connection.dialect.name, await advise(connection)
+    finally:
+        if url:
+            await engine.dispose()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m fastapi_admin_next.index_advisor",
+        description=(
+            "Report the filter, sort, foreign key and search fields of "
+            "registered models that no index serves. Exits with 1 when "
+            "there are any, so it can run in CI."
+        ),
+    )
+    parser.add_argument(
+        "module", help="module registering the models, e.g. example.app"
+    )
+    parser.add_argument(
+        "--url", help="database URL, defaults to the engine the module registered"
+    )
+    parser.add_argument(
+        "--dialect",
+        choices=list(DIALECTS),
+        help="print DDL for this dialect instead of the database's",
+    )
+    args = parser.parse_args(argv)
+
+    importlib.import_module(args.module)
+    try:
+        dialect, advice = asyncio.run(_run(args.url))
+    except ValueError as e:
+        parser.error(str(e))
+    dialect = args.dialect or dialect
+
+    for item in advice:
+        print(f"{item.model}.{item.column} [{', '.join(item.reasons)}]: {item.message}")
+        for statement in item.ddl.get(dialect, []):
+            print(f"    {statement};")
+    if not advice:
+        print("Every filter, sort, foreign key and search field is indexed.")
+    return 1 if advice else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
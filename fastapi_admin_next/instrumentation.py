@@ -0,0 +1,152 @@
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class QueryCollector(Protocol):
+    def record(self, statement: str, duration: float, parameters: Any) -> None:
+        """
+        Called after each statement with its SQL and parameters as sent to
+        the driver.
+        """
+
+
+# Collectors recording the statements of the current request (or test block)
+_collectors: ContextVar[tuple[QueryCollector, ...]] = ContextVar(
+    "admin_query_collectors", default=()
+)
+
+# `IN (?, ?, ?)` lists of any length share one shape
+_IN_LIST = re.compile(
+    r"\(\s*(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|\$\d+|:\w+))*\s*\)"
+)
+_SPACES = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    The statement without its bound values: whitespace is collapsed and
+    placeholder lists are folded into `(...)`.
+    """
+    return _IN_LIST.sub("(...)", _SPACES.sub(" ", statement).strip())
+
+
+@dataclass
+class QueryStats:
+    """
+    Statements executed while collecting: how many, the time spent in the
+    database and how often each statement shape ran.
+    """
+
+    count: int = 0
+    duration: float = 0.0
+    shapes: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, duration: float, parameters: Any = None) -> None:
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int = 2) -> list[tuple[str, int]]:
+        """
+        Shapes executed at least `threshold` times, most repeated first.
+        """
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+
+@dataclass
+class QueryTimer:
+    """
+    Statements executed while collecting, counted and timed only: cheaper
+    than `QueryStats`, and not shown in the page footer.
+    """
+
+    count: int = 0
+    duration: float = 0.0
+
+    def record(self, statement: str, duration: float, parameters: Any = None) -> None:
+        self.count += 1
+        self.duration += duration
+
+
+def current_query_stats() -> QueryStats | None:
+    """
+    The stats of the innermost active `collect_queries` block, None outside
+    of one.
+    """
+    for collector in reversed(_collectors.get()):
+        if isinstance(collector, QueryStats):
+            return collector
+    return None
+
+
+@contextmanager
+def collecting(collector: QueryCollector) -> Iterator[None]:
+    """
+    Pass the statements executed by instrumented engines within the block
+    to `collector`. Collectors nest: an outer collector also sees the inner
+    block's queries.
+    """
+    token = _collectors.set((*_collectors.get(), collector))
+    try:
+        yield
+    finally:
+        _collectors.reset(token)
+
+
+@contextmanager
+def collect_queries() -> Iterator[QueryStats]:
+    """
+    Count and time the statements executed within the block.
+    """
+    stats = QueryStats()
+    with collecting(stats):
+        yield stats
+
+
+def _before_cursor_execute(conn: Connection, *_: Any) -> None:
+    if _collectors.get():
+        conn.info.setdefault("admin_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Connection, _cursor: Any, statement: str, parameters: Any, *_: Any
+) -> None:
+    collectors = _collectors.get()
+    starts = conn.info.get("admin_query_start")
+    if not collectors or not starts:
+        return
+    duration = time.perf_counter() - starts.pop()
+    for collector in collectors:
+        collector.record(statement, duration, parameters)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Listen to the engine's cursor events. Statements are only timed while a
+    collector is active, so idle instrumentation costs one context lookup
+    per statement. Instrumenting an engine twice has no effect.
+    """
+    sync_engine = engine.sync_engine
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+    ):
+        if not event.contains(sync_engine, name, listener):
+            event.listen(sync_engine, name, listener)
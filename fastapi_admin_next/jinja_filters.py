@@ -15,6 +15,35 @@ def ceil_filter(value: int | float) -> int:
     return ceil(value)
 
 
+def page_window_filter(
+    page: int, total_pages: int, radius: int = 2
+) -> list[int | None]:
+    """
+    Picks the page links to show: the first and last pages and `radius`
+    pages either side of the current one, so large tables do not render a
+    link per page.
+
+    Args:
+        page (int): The current page.
+        total_pages (int): The number of pages.
+        radius (int): How many pages to show either side of the current one.
+
+    Returns:
+        list[int | None]: The page numbers, with None where pages are skipped.
+    """
+    if total_pages < 1:
+        return []
+    # Only the window itself is built, whatever the number of pages
+    around = range(max(1, page - radius), min(total_pages, page + radius) + 1)
+    pages = sorted({1, total_pages, *around})
+    window: list[int | None] = []
+    for page_num in pages:
+        if window and page_num - (window[-1] or 0) > 1:
+            window.append(None)
+        window.append(page_num)
+    return window
+
+
 def getattr_filter(obj: object, attr: str) -> Any:
     """
     Gets the given attribute from the given object.
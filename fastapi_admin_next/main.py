@@ -1,18 +1,37 @@
 """Fast Api module"""
 
 import os
+from collections.abc import Sequence
 
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
+from jinja2 import BytecodeCache
+from sqlalchemy.ext.asyncio import AsyncEngine
 from starlette.middleware.authentication import AuthenticationMiddleware
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 
-from fastapi_admin_next.configs import AuthConfig, AuthConfigManager
-from fastapi_admin_next.db_connect import DBConnector
-from fastapi_admin_next.middleware import ExceptionRedirectMiddleware
+from fastapi_admin_next.configs import AuthConfig, AuthConfigManager, EngineProfile
+from fastapi_admin_next.db_connect import ROUND_ROBIN, DBConnector
+from fastapi_admin_next.exceptions import TooManyRequestsException
+from fastapi_admin_next.instrumentation import instrument_engine
+from fastapi_admin_next.metrics import metrics_endpoint
+from fastapi_admin_next.middleware import (
+    AdminStackMiddleware,
+    ExceptionRedirectMiddleware,
+    MetricsMiddleware,
+    PathPrefixBypass,
+    QueryInstrumentationMiddleware,
+    too_many_requests_handler,
+)
 from fastapi_admin_next.router import app_router as router
-from fastapi_admin_next.security import JWTCookieBackend
+from fastapi_admin_next.security import (
+    AsyncPasswordHasher,
+    JWTCookieBackend,
+    PasswordHasherManager,
+)
+from fastapi_admin_next.slow_queries import DEFAULT_MAX_ENTRIES, slow_query_log
+from fastapi_admin_next.templating import configure_templates
 
 
 class FastAPIAdminNextApp:
@@ -37,22 +56,110 @@ class FastAPIAdminNextApp:
     def init_routers(self) -> None:
         self.app.include_router(router)
 
-    def create_app(self, db_url: str, auth_config: AuthConfig) -> FastAPI:
+    def create_app(
+        self,
+        db_url: str | None,
+        auth_config: AuthConfig,
+        public_path_prefixes: tuple[str, ...] = ("/static",),
+        combined_middleware: bool = False,
+        engine_profile: EngineProfile | None = None,
+        engine: AsyncEngine | None = None,
+        replicas: Sequence[str | AsyncEngine] = (),
+        replica_selection: str = ROUND_ROBIN,
+        instrument_queries: bool = False,
+        metrics_path: str | None = None,
+        slow_query_threshold: float | None = None,
+        slow_query_max_entries: int = DEFAULT_MAX_ENTRIES,
+        template_auto_reload: bool = False,
+        template_bytecode_cache: BytecodeCache | None = None,
+    ) -> FastAPI:
+        """
+        Configure and return the admin app. The database is either opened
+        from `db_url` with `engine_profile`, or shared through an existing
+        `engine` (pass `db_url=None`). Read-only views use `replicas` when
+        given, picked with `replica_selection`. Requests under
+        `public_path_prefixes` skip session loading and authentication.
+        With `combined_middleware`, sessions, authentication and the login
+        redirect run as a single `AdminStackMiddleware` layer.
+        With `instrument_queries`, each request reports its query count and
+        database time in a `Server-Timing` header and the page footer.
+        With `metrics_path` (e.g. "/metrics"), request latency, DB time, pool,
+        password hasher and template metrics are served there in Prometheus
+        text format, without authentication: keep the path off the public
+        network.
+        With `slow_query_threshold` (seconds), list, filter and filter option
+        statements at least that slow are kept with their plan, the last
+        `slow_query_max_entries` of them, on the admin's slow queries page.
+        Every admin template is compiled here, into `template_bytecode_cache`
+        (a `FileSystemBytecodeCache` by default). Templates are not checked
+        for changes unless `template_auto_reload` is set, for development.
+        """
         AuthConfigManager.set_auth_config(auth_config)
-        DBConnector.register_db(db_url)
+        PasswordHasherManager.set_hasher(
+            AsyncPasswordHasher(
+                rounds=auth_config.password_hash_rounds,
+                max_workers=auth_config.password_hash_workers,
+                max_pending=auth_config.password_hash_max_pending,
+            )
+        )
+        DBConnector.register_db(db_url, profile=engine_profile, engine=engine)
+        if replicas:
+            DBConnector.register_replicas(
+                replicas, profile=engine_profile, selection=replica_selection
+            )
         static_dir = os.path.join(os.path.dirname(__file__), "static")
         self.app.mount(
             "/static",
             StaticFiles(directory=static_dir, html=True),
             name="static",
         )
+        configure_templates(
+            auto_reload=template_auto_reload, bytecode_cache=template_bytecode_cache
+        )
         self.init_routers()
+        if metrics_path:
+            self.app.add_route(metrics_path, metrics_endpoint, include_in_schema=False)
+            public_path_prefixes = (*public_path_prefixes, metrics_path)
+        self.app.add_exception_handler(
+            TooManyRequestsException, too_many_requests_handler  # type: ignore
+        )
 
-        self.app.add_middleware(ExceptionRedirectMiddleware)
+        if combined_middleware:
+            self.app.add_middleware(
+                AdminStackMiddleware,
+                secret_key="your-secret-key",
+                backend=JWTCookieBackend(),
+                public_path_prefixes=public_path_prefixes,
+            )
+        else:
+            self._add_middleware_stack(public_path_prefixes)
 
-        self.app.add_middleware(SessionMiddleware, secret_key="your-secret-key")
-        self.app.add_middleware(AuthenticationMiddleware, backend=JWTCookieBackend())
+        slow_query_log.configure(slow_query_threshold, slow_query_max_entries)
+        if instrument_queries or metrics_path or slow_query_log.enabled:
+            for db_engine in DBConnector.engines():
+                instrument_engine(db_engine)
+        # Outermost, so authentication queries are counted too
+        if instrument_queries:
+            self.app.add_middleware(QueryInstrumentationMiddleware)
+        if metrics_path:
+            self.app.add_middleware(MetricsMiddleware)
         return self.app
 
+    def _add_middleware_stack(self, public_path_prefixes: tuple[str, ...]) -> None:
+        self.app.add_middleware(ExceptionRedirectMiddleware)
+
+        self.app.add_middleware(
+            PathPrefixBypass,
+            middleware=SessionMiddleware,
+            prefixes=public_path_prefixes,
+            secret_key="your-secret-key",
+        )
+        self.app.add_middleware(
+            PathPrefixBypass,
+            middleware=AuthenticationMiddleware,
+            prefixes=public_path_prefixes,
+            backend=JWTCookieBackend(),
+        )
+
 
 fastapi_admin_next_app = FastAPIAdminNextApp()
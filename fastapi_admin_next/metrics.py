@@ -0,0 +1,220 @@
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from fastapi_admin_next.db_connect import DBConnector, PoolStats
+from fastapi_admin_next.security import PasswordHasherManager
+
+# Seconds; request, query and render times of an admin page
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _sample(name: str, labels: str, value: float) -> str:
+    return (
+        f"{name}{{{labels}}} {_number(value)}" if labels else f"{name} {_number(value)}"
+    )
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    A Prometheus histogram with fixed buckets per label set. An observation
+    is one bisect and two list increments, without locking: the event loop
+    runs them one at a time, and a rare lost update from a worker thread is
+    acceptable for monitoring.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: a count per bucket, the +Inf count, then the sum
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series.setdefault(
+                label_values, [0] * (len(self.buckets) + 1) + [0.0]
+            )
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for label_values, series in list(self._series.items()):
+            labels = _labels(self.label_names, label_values)
+            prefix = f"{labels}," if labels else ""
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), series):
+                cumulative += int(count)
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(_sample(f"{self.name}_sum", labels, series[-1]))
+            lines.append(_sample(f"{self.name}_count", labels, cumulative))
+        return lines
+
+
+def _metric(
+    name: str,
+    kind: str,
+    documentation: str,
+    samples: Iterable[tuple[dict[str, str], float]],
+) -> list[str]:
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(_sample(name, _labels(list(labels), list(labels.values())), value))
+    return lines
+
+
+def _pool_stats() -> list[tuple[str, PoolStats]]:
+    try:
+        databases = [("primary", DBConnector.pool_stats())]
+    except ValueError:
+        databases = []
+    databases.extend(
+        (f"replica{index}", stats)
+        for index, stats in enumerate(DBConnector.replica_pool_stats())
+    )
+    return databases
+
+
+class AdminMetrics:
+    """
+    The admin's metrics. Histograms are updated as requests are served;
+    pool and password hasher gauges are read when scraped.
+    """
+
+    def __init__(self) -> None:
+        self.request_duration = Histogram(
+            "admin_request_duration_seconds",
+            "Time to serve an admin request.",
+            ("view", "model"),
+        )
+        self.db_duration = Histogram(
+            "admin_db_duration_seconds",
+            "Time spent executing SQL statements per admin request.",
+            ("view",),
+        )
+        self.template_render_duration = Histogram(
+            "admin_template_render_seconds",
+            "Time to render an admin template.",
+            ("template",),
+        )
+
+    @property
+    def histograms(self) -> tuple[Histogram, ...]:
+        return (self.request_duration, self.db_duration, self.template_render_duration)
+
+    def render(self) -> str:
+        """
+        All metrics in the Prometheus text exposition format.
+        """
+        lines: list[str] = []
+        for histogram in self.histograms:
+            lines.extend(histogram.render())
+
+        databases = _pool_stats()
+        lines.extend(
+            _metric(
+                "admin_db_pool_connections",
+                "gauge",
+                "Connections of the pool by state.",
+                (
+                    ({"database": database, "state": state}, value)
+                    for database, stats in databases
+                    for state, value in (
+                        ("checked_in", stats.checked_in),
+                        ("checked_out", stats.checked_out),
+                        ("overflow", stats.overflow),
+                    )
+                    if value is not None
+                ),
+            )
+        )
+        lines.extend(
+            _metric(
+                "admin_db_pool_size",
+                "gauge",
+                "Configured size of the pool.",
+                (
+                    ({"database": database}, stats.size)
+                    for database, stats in databases
+                    if stats.size is not None
+                ),
+            )
+        )
+        lines.extend(
+            _metric(
+                "admin_db_pool_acquisitions_total",
+                "counter",
+                "Connections checked out by admin sessions.",
+                (({"database": db}, stats.acquisitions) for db, stats in databases),
+            )
+        )
+        lines.extend(
+            _metric(
+                "admin_db_pool_wait_seconds_total",
+                "counter",
+                "Time admin sessions waited for a connection.",
+                (({"database": db}, stats.wait_time_total) for db, stats in databases),
+            )
+        )
+        lines.extend(
+            _metric(
+                "admin_db_pool_wait_seconds_max",
+                "gauge",
+                "Longest wait for a connection.",
+                (({"database": db}, stats.wait_time_max) for db, stats in databases),
+            )
+        )
+
+        hasher = PasswordHasherManager.get_hasher()
+        lines.extend(
+            _metric(
+                "admin_password_hash_pending",
+                "gauge",
+                "Password hashes running or queued.",
+                [({}, hasher.pending)],
+            )
+        )
+        lines.extend(
+            _metric(
+                "admin_password_hash_max_pending",
+                "gauge",
+                "Password hashes allowed to run or wait before rejecting.",
+                [({}, hasher.max_pending)],
+            )
+        )
+        return "\n".join(lines) + "\n"
+
+
+metrics = AdminMetrics()
+
+
+async def metrics_endpoint(_: Request) -> Response:
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
@@ -1,5 +1,14 @@
-from .error_handler import ExceptionRedirectMiddleware
+from .admin_stack import AdminStackMiddleware
+from .bypass import PathPrefixBypass
+from .error_handler import ExceptionRedirectMiddleware, too_many_requests_handler
+from .instrumentation import QueryInstrumentationMiddleware
+from .metrics import MetricsMiddleware
 
 __all__ = [
+    "AdminStackMiddleware",
     "ExceptionRedirectMiddleware",
+    "MetricsMiddleware",
+    "PathPrefixBypass",
+    "QueryInstrumentationMiddleware",
+    "too_many_requests_handler",
 ]
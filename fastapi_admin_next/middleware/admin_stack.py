@@ -0,0 +1,116 @@
+import json
+from base64 import b64decode, b64encode
+from collections.abc import Sequence
+from typing import Any
+
+from itsdangerous.exc import BadSignature
+from starlette.authentication import (
+    AuthCredentials,
+    AuthenticationBackend,
+    UnauthenticatedUser,
+)
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.requests import HTTPConnection
+from starlette.responses import RedirectResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from fastapi_admin_next.error import CustomException
+
+from .bypass import path_matches
+from .error_handler import LOGIN_URL
+
+
+class AdminStackMiddleware(SessionMiddleware):
+    """
+    Session loading, authentication and the 401-to-login redirect folded into
+    a single ASGI layer, instead of `SessionMiddleware`,
+    `AuthenticationMiddleware` and `ExceptionRedirectMiddleware` stacked on
+    top of each other. Sessions are signed exactly like `SessionMiddleware`
+    does, so both can be swapped without logging anyone out.
+
+    Requests under `public_path_prefixes` skip all three.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        app: ASGIApp,
+        secret_key: str,
+        backend: AuthenticationBackend,
+        public_path_prefixes: Sequence[str] = ("/static",),
+        login_url: str = LOGIN_URL,
+        **session_options: Any,
+    ) -> None:
+        super().__init__(app, secret_key=secret_key, **session_options)
+        self.backend = backend
+        self.login_url = login_url
+        self.public_path_prefixes = tuple(
+            prefix.rstrip("/") for prefix in public_path_prefixes
+        )
+
+    def load_session(self, connection: HTTPConnection) -> bool:
+        """
+        Put the signed session cookie into the scope, returning whether the
+        request carried a valid one.
+        """
+        scope = connection.scope
+        scope["session"] = {}
+        cookie = connection.cookies.get(self.session_cookie)
+        if cookie is None:
+            return False
+        try:
+            data = self.signer.unsign(cookie.encode("utf-8"), max_age=self.max_age)
+        except BadSignature:
+            return False
+        scope["session"] = json.loads(b64decode(data))
+        return True
+
+    def session_cookie_header(self, session: dict[str, Any]) -> str:
+        if session:
+            data = self.signer.sign(b64encode(json.dumps(session).encode("utf-8")))
+            max_age = f"Max-Age={self.max_age}; " if self.max_age else ""
+            return (
+                f"{self.session_cookie}={data.decode('utf-8')}; path={self.path}; "
+                f"{max_age}{self.security_flags}"
+            )
+        # The session has been cleared
+        return (
+            f"{self.session_cookie}=null; path={self.path}; "
+            f"expires=Thu, 01 Jan 1970 00:00:00 GMT; {self.security_flags}"
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket") or path_matches(
+            scope, self.public_path_prefixes
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        connection = HTTPConnection(scope)
+        had_session = self.load_session(connection)
+
+        auth_result = await self.backend.authenticate(connection)
+        if auth_result is None:
+            auth_result = AuthCredentials(), UnauthenticatedUser()
+        scope["auth"], scope["user"] = auth_result
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                if scope["session"] or had_session:
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Set-Cookie", self.session_cookie_header(scope["session"])
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except CustomException as e:
+            if scope["type"] != "http" or e.code != 401 or response_started:
+                raise
+            response = RedirectResponse(url=self.login_url, status_code=303)
+            await response(scope, receive, send_wrapper)
@@ -0,0 +1,59 @@
+from collections.abc import Sequence
+from typing import Any
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+def get_route_path(scope: Scope) -> str:
+    """
+    The request path relative to the application the middleware wraps, so
+    that prefixes also match when the admin app is mounted (e.g. `/admin`).
+    """
+    path: str = scope["path"]
+    root_path: str = scope.get("root_path", "")
+    if root_path and path.startswith(root_path):
+        return path[len(root_path) :] or "/"
+    return path
+
+
+def path_matches(scope: Scope, prefixes: Sequence[str]) -> bool:
+    """
+    Whether an HTTP or websocket request falls under one of `prefixes`.
+    """
+    if scope["type"] not in ("http", "websocket"):
+        return False
+    path = get_route_path(scope)
+    return any(path == prefix or path.startswith(prefix + "/") for prefix in prefixes)
+
+
+class PathPrefixBypass:
+    """
+    Wraps another middleware and skips it entirely for requests whose path
+    starts with one of `prefixes`, e.g. static assets that need neither a
+    session nor an authenticated user.
+
+    Usage:
+        app.add_middleware(
+            PathPrefixBypass,
+            middleware=SessionMiddleware,
+            prefixes=("/static",),
+            secret_key="...",
+        )
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        middleware: Any,
+        prefixes: Sequence[str] = (),
+        **options: Any,
+    ) -> None:
+        self.app = app
+        self.prefixes = tuple(prefix.rstrip("/") for prefix in prefixes)
+        self.wrapped = middleware(app, **options)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if path_matches(scope, self.prefixes):
+            await self.app(scope, receive, send)
+            return
+        await self.wrapped(scope, receive, send)
@@ -1,26 +1,56 @@
-from collections.abc import Awaitable, Callable
-
 from fastapi import Request, Response
-from fastapi.responses import RedirectResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import PlainTextResponse, RedirectResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from fastapi_admin_next.error import CustomException
+from fastapi_admin_next.exceptions import TooManyRequestsException
+
+LOGIN_URL = "/admin/auth/login/"
+
+
+class ExceptionRedirectMiddleware:
+    """
+    Pure ASGI middleware that redirects to the login page when a view raises
+    a 401 `CustomException` (e.g. `LoginRequiredException`).
+
+    Unlike a `BaseHTTPMiddleware` it does not buffer responses through a
+    memory stream or spawn a task per request, so streaming responses pass
+    through untouched.
+    """
 
+    def __init__(self, app: ASGIApp, login_url: str = LOGIN_URL) -> None:
+        self.app = app
+        self.login_url = login_url
 
-class ExceptionRedirectMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        """
-        Middleware that intercepts exceptions and redirects accordingly.
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
-        :param request: The incoming request object.
-        :param call_next: A callable that processes the request and returns a response.
-        :return: A response (either redirected or the original response).
-        """
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except CustomException as e:
-            if e.code == 401:
-                return RedirectResponse(url="/admin/auth/login/", status_code=303)
-        return response
+            # Once headers are sent the response can no longer be replaced
+            if e.code != 401 or response_started:
+                raise
+            response = RedirectResponse(url=self.login_url, status_code=303)
+            await response(scope, receive, send)
+
+
+async def too_many_requests_handler(
+    _: Request, exc: TooManyRequestsException
+) -> Response:
+    """
+    Answer with 429 and a short `Retry-After` when the server sheds load.
+    """
+    return PlainTextResponse(
+        exc.message, status_code=exc.code, headers={"Retry-After": "1"}
+    )
@@ -0,0 +1,57 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from fastapi_admin_next.instrumentation import collect_queries
+from fastapi_admin_next.logger import logger
+
+# A statement shape executed this many times in one request is logged as a
+# likely N+1 query
+REPEATED_QUERY_THRESHOLD = 5
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Pure ASGI middleware collecting the queries of each HTTP request. The
+    totals are sent in a `Server-Timing` header, and statement shapes
+    repeated `repeated_threshold` times are logged as likely N+1 queries.
+
+    Queries made after the response has started (e.g. while streaming an
+    export) are not part of the header.
+    """
+
+    def __init__(
+        self, app: ASGIApp, repeated_threshold: int = REPEATED_QUERY_THRESHOLD
+    ) -> None:
+        self.app = app
+        self.repeated_threshold = repeated_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with collect_queries() as stats:
+            start = time.perf_counter()
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    total = (time.perf_counter() - start) * 1000
+                    headers.append(
+                        "Server-Timing",
+                        f"{stats.server_timing()}, total;dur={total:.1f}",
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        for shape, count in stats.repeated(self.repeated_threshold):
+            logger.warning(
+                "%s %s ran the same statement %d times: %s",
+                scope["method"],
+                scope["path"],
+                count,
+                shape,
+            )
@@ -0,0 +1,46 @@
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from fastapi_admin_next.instrumentation import QueryTimer, collecting
+from fastapi_admin_next.metrics import AdminMetrics, metrics
+from fastapi_admin_next.registry import registry
+
+
+def _request_labels(scope: Scope) -> tuple[str, str]:
+    # Label values are bounded: route endpoints and registered models only
+    endpoint = scope.get("endpoint")
+    view = getattr(endpoint, "__name__", "unmatched")
+    model_name = scope.get("path_params", {}).get("model_name", "")
+    if model_name and registry.get_model_by_name(model_name) is None:
+        model_name = ""
+    return view, model_name.lower()
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing each HTTP request, and the SQL it runs on
+    instrumented engines, per view and model.
+    """
+
+    def __init__(self, app: ASGIApp, admin_metrics: AdminMetrics = metrics) -> None:
+        self.app = app
+        self.metrics = admin_metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        # Not a `QueryStats`: metrics alone keep the query footer hidden
+        timer = QueryTimer()
+        with collecting(timer):
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                view, model_name = _request_labels(scope)
+                self.metrics.request_duration.observe(
+                    time.perf_counter() - start, view, model_name
+                )
+                self.metrics.db_duration.observe(timer.duration, view)
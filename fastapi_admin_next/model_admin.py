@@ -0,0 +1,297 @@
+import json
+from collections.abc import Sequence
+from types import MappingProxyType
+from typing import Any, NamedTuple
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, ValidationError, create_model
+from sqlalchemy import ColumnElement, Enum
+from sqlalchemy.inspection import inspect
+
+from fastapi_admin_next.actions import BulkAction
+from fastapi_admin_next.counting import SEQUENTIAL, CountStrategy, ExactCount
+from fastapi_admin_next.db_connect import Base
+from fastapi_admin_next.pagination import KEYSET, OFFSET
+from fastapi_admin_next.search import IlikeSearch, SearchBackend
+from fastapi_admin_next.validation import generate_pydantic_model
+
+# Hidden update form field carrying the values the form was rendered with
+SNAPSHOT_FIELD = "_snapshot"
+
+
+class RelationInfo(NamedTuple):
+    key: str
+    fk_column: str
+    related_model: type[Base]
+
+
+def get_version_field(model: type[Base]) -> str | None:
+    """
+    The attribute configured as the mapper's `version_id_col`, if any.
+    """
+    mapper = inspect(model)
+    if mapper.version_id_col is None:
+        return None
+    return mapper.get_property_by_column(mapper.version_id_col).key
+
+
+def is_secret_column(name: str) -> bool:
+    """
+    Password columns: never exported, nor echoed back in update forms.
+    """
+    return "password" in name.lower()
+
+
+def _snapshot_model(
+    model: type[Base], secret_columns: Sequence[str]
+) -> type[BaseModel] | None:
+    try:
+        return generate_pydantic_model(
+            model, exclude=["id", *secret_columns], optional=True  # type: ignore
+        )
+    except (AssertionError, NotImplementedError):
+        # Columns without a Python type can't be round-tripped through a form
+        return None
+
+
+def _update_validator(
+    validator: type[BaseModel] | None, secret_columns: frozenset[str]
+) -> type[BaseModel] | None:
+    """
+    `validator` with the secret fields made optional: update forms leave them
+    blank to keep the stored value.
+    """
+    if validator is None:
+        return None
+    optional = {
+        name: (field.annotation | None, None)  # type: ignore
+        for name, field in validator.model_fields.items()
+        if name in secret_columns
+    }
+    if not optional:
+        return validator
+    return create_model(  # type: ignore
+        validator.__name__, __base__=validator, **optional
+    )
+
+
+class ModelAdmin:  # pylint: disable=too-many-instance-attributes
+    """
+    Immutable metadata of a registered model, compiled once by
+    `ModelRegistry.register` so that requests never have to inspect the
+    mapper again.
+    """
+
+    __slots__ = (
+        "model",
+        "name",
+        "url_name",
+        "primary_key",
+        "column_names",
+        "column_keys",
+        "form_columns",
+        "secret_columns",
+        "fk_to_rel_map",
+        "list_fk_to_rel_map",
+        "relations",
+        "enum_fields",
+        "filter_fields",
+        "search_fields",
+        "display_fields",
+        "list_columns",
+        "sortable_fields",
+        "list_projection",
+        "list_relations",
+        "validator",
+        "update_validator",
+        "pagination",
+        "count_strategy",
+        "count_execution",
+        "search_backend",
+        "filter_options_top_n",
+        "label_column",
+        "version_column",
+        "snapshot_model",
+        "actions",
+    )
+
+    model: type[Base]
+    name: str
+    url_name: str
+    primary_key: tuple[str, ...]
+    column_names: tuple[str, ...]
+    column_keys: frozenset[str]
+    form_columns: tuple[str, ...]
+    secret_columns: frozenset[str]
+    fk_to_rel_map: MappingProxyType[str, str]
+    list_fk_to_rel_map: MappingProxyType[str, str]
+    relations: tuple[RelationInfo, ...]
+    enum_fields: MappingProxyType[str, tuple[Any, ...]]
+    filter_fields: tuple[str, ...]
+    search_fields: tuple[str, ...]
+    display_fields: tuple[str, ...]
+    list_columns: tuple[str, ...]
+    sortable_fields: tuple[str, ...]
+    list_projection: tuple[str, ...] | None
+    list_relations: tuple[RelationInfo, ...]
+    validator: type[BaseModel] | None
+    update_validator: type[BaseModel] | None
+    pagination: str
+    count_strategy: CountStrategy
+    count_execution: str
+    search_backend: SearchBackend
+    filter_options_top_n: int | None
+    label_column: Any
+    version_column: str | None
+    snapshot_model: type[BaseModel] | None
+    actions: MappingProxyType[str, BulkAction]
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-locals
+        self,
+        model: type[Base],
+        filter_fields: list[str] | None = None,
+        search_fields: list[str] | None = None,
+        display_fields: list[str] | None = None,
+        validator: type[BaseModel] | None = None,
+        pagination: str = OFFSET,
+        count_strategy: CountStrategy | None = None,
+        filter_options_top_n: int | None = None,
+        label_field: str | ColumnElement[Any] | None = None,
+        count_execution: str = SEQUENTIAL,
+        search_backend: SearchBackend | None = None,
+        version_field: str | None = None,
+        actions: Sequence[BulkAction] | None = None,
+    ) -> None:
+        mapper = inspect(model)
+        relationships = mapper.relationships
+        column_names = tuple(column.name for column in model.__table__.columns)
+
+        relations = tuple(
+            RelationInfo(rel.key, list(rel.local_columns)[0].name, rel.mapper.class_)
+            for rel in relationships.values()
+            if not rel.uselist  # Only single relationships point to one row
+        )
+
+        list_fk_to_rel_map = {
+            fk.name: rel.key
+            for rel in relationships.values()
+            if not rel.uselist
+            for fk in rel._calculated_foreign_keys  # pylint: disable=protected-access
+        }
+        primary_key = tuple(column.key for column in mapper.primary_key)
+        version_field = version_field or get_version_field(model)
+        list_columns = tuple(display_fields or column_names)
+        column_keys = frozenset(mapper.column_attrs.keys())
+        # Columns the list view loads on its read-only fast path
+        list_projection: tuple[str, ...] | None = tuple(
+            dict.fromkeys((*primary_key, *list_columns, *list_fk_to_rel_map))
+        )
+        if not column_keys.issuperset(list_projection):  # type: ignore
+            list_projection = None
+        form_columns = tuple(
+            col.key for col in mapper.columns if col.key not in ("id", version_field)
+        )
+        secret_columns = frozenset(filter(is_secret_column, form_columns))
+        # Keyset pages seek with a row value comparison, which NULLs never
+        # satisfy: nullable columns would drop rows, so they aren't offered
+        nullable = {col.key for col in mapper.columns if col.nullable}
+        sortable_fields = tuple(
+            name
+            for name in list_columns
+            if name in column_keys and not (pagination == KEYSET and name in nullable)
+        )
+
+        values = {
+            "model": model,
+            "name": model.__name__,
+            "url_name": model.__name__.lower(),
+            "primary_key": primary_key,
+            "column_names": column_names,
+            "column_keys": column_keys,
+            "form_columns": form_columns,
+            "secret_columns": secret_columns,
+            "fk_to_rel_map": MappingProxyType(
+                {
+                    fk.name: rel.key
+                    for rel in relationships.values()
+                    for fk in rel._calculated_foreign_keys  # pylint: disable=protected-access
+                }
+            ),
+            "list_fk_to_rel_map": MappingProxyType(list_fk_to_rel_map),
+            "relations": relations,
+            "enum_fields": MappingProxyType(
+                {
+                    col.key: tuple(col.type.enums)
+                    for col in mapper.columns.values()
+                    if isinstance(col.type, Enum)
+                }
+            ),
+            "filter_fields": tuple(filter_fields or ()),
+            "search_fields": tuple(search_fields or ()),
+            "display_fields": tuple(display_fields or ()),
+            "list_columns": list_columns,
+            "sortable_fields": sortable_fields,
+            "list_projection": list_projection,
+            # Foreign keys shown in the list view, rendered with their labels
+            "list_relations": tuple(
+                relation for relation in relations if relation.fk_column in list_columns
+            ),
+            "validator": validator,
+            "update_validator": _update_validator(validator, secret_columns),
+            "pagination": pagination,
+            "count_strategy": count_strategy or ExactCount(),
+            "count_execution": count_execution,
+            "search_backend": search_backend or IlikeSearch(),
+            "filter_options_top_n": filter_options_top_n,
+            "label_column": (
+                getattr(model, label_field)
+                if isinstance(label_field, str)
+                else label_field
+            ),
+            "version_column": version_field,
+            "snapshot_model": _snapshot_model(model, sorted(secret_columns)),
+            "actions": MappingProxyType(
+                {action.name: action for action in actions or ()}
+            ),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def snapshot(self, obj: Any) -> dict[str, Any]:
+        """
+        The editable values of `obj` (and its version), which updates are
+        diffed against. Secret columns are left out: the snapshot is sent to
+        the browser.
+        """
+        names = tuple(
+            name for name in self.form_columns if name not in self.secret_columns
+        )
+        if self.version_column:
+            names = (*names, self.version_column)
+        return {name: getattr(obj, name) for name in names}
+
+    def encode_snapshot(self, obj: Any) -> str:
+        return json.dumps(jsonable_encoder(self.snapshot(obj)))
+
+    def decode_snapshot(self, raw: str | None) -> dict[str, Any] | None:
+        """
+        Parse a snapshot posted back by the update form, None when it is
+        missing or does not validate.
+        """
+        if not raw or self.snapshot_model is None:
+            return None
+        try:
+            return self.snapshot_model.model_validate_json(raw).model_dump(
+                exclude_unset=True
+            )
+        except ValidationError:
+            return None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return f"ModelAdmin({self.name})"
@@ -0,0 +1,77 @@
+import base64
+import binascii
+import json
+from functools import lru_cache
+from typing import Any
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.orm import InstrumentedAttribute
+
+from fastapi_admin_next.exceptions import ValidationException
+
+OFFSET = "offset"
+KEYSET = "keyset"
+PAGINATION_MODES = (OFFSET, KEYSET)
+
+CURSOR_NEXT = "next"
+CURSOR_PREV = "prev"
+
+
+@lru_cache(maxsize=None)
+def _type_adapter(python_type: type) -> TypeAdapter[Any]:
+    return TypeAdapter(python_type)
+
+
+def encode_cursor(values: list[Any], direction: str = CURSOR_NEXT) -> str:
+    """
+    Encodes keyset values into an opaque, URL-safe cursor.
+
+    Args:
+        values (list): The (sort column, primary key) values of the boundary row.
+        direction (str): Whether the cursor seeks forward ("next") or back ("prev").
+
+    Returns:
+        str: The encoded cursor.
+    """
+    payload = json.dumps({"d": direction, "v": values}, default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(
+    cursor: str, columns: list[InstrumentedAttribute[Any]]
+) -> tuple[str, list[Any]]:
+    """
+    Decodes a cursor produced by `encode_cursor` and coerces its values back
+    to the python types of the keyset columns.
+
+    Args:
+        cursor (str): The opaque cursor.
+        columns (list): The keyset columns the cursor was produced for.
+
+    Returns:
+        tuple: The seek direction and the typed keyset values.
+
+    Raises:
+        ValidationException: If the cursor is malformed.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        direction, values = payload["d"], payload["v"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise ValidationException(message="Invalid pagination cursor") from e
+
+    if direction not in (CURSOR_NEXT, CURSOR_PREV) or len(values) != len(columns):
+        raise ValidationException(message="Invalid pagination cursor")
+
+    typed_values = []
+    for column, value in zip(columns, values):
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            typed_values.append(value)
+            continue
+        try:
+            typed_values.append(_type_adapter(python_type).validate_python(value))
+        except ValidationError as e:
+            raise ValidationException(message="Invalid pagination cursor") from e
+    return direction, typed_values
@@ -1,11 +1,28 @@
+from collections.abc import Sequence
 from typing import Any
 
 from pydantic import BaseModel
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.inspection import inspect
+from sqlalchemy import ColumnElement
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
+from fastapi_admin_next.actions import BulkAction
+from fastapi_admin_next.counting import (
+    COUNT_EXECUTIONS,
+    SEQUENTIAL,
+    CountStrategy,
+    ExactCount,
+)
 from fastapi_admin_next.db_connect import Base
+from fastapi_admin_next.filter_options import (
+    FilterOptionsEngine,
+    get_column,
+    get_related_model,
+)
+from fastapi_admin_next.model_admin import ModelAdmin, get_version_field
+from fastapi_admin_next.pagination import OFFSET, PAGINATION_MODES
+from fastapi_admin_next.schemas import FilterFieldOptions
+from fastapi_admin_next.search import SearchBackend
+from fastapi_admin_next.slow_queries import slow_query_log
 from fastapi_admin_next.validation import generate_pydantic_model
 
 
@@ -17,10 +34,10 @@ class ModelRegistry:
 
     def __init__(self) -> None:
         self._models: list[type[Base]] = []
-        self._pydantic_models: dict[type[Base], type[BaseModel]] = {}
-        self._filter_fields: dict[Any, Any] = {}
-        self._search_fields: dict[Any, Any] = {}
-        self._display_fields: dict[Any, Any] = {}
+        self._admins: dict[type[Base], ModelAdmin] = {}
+        self._admins_by_name: dict[str, ModelAdmin] = {}
+        self._model_names: list[str] = []
+        self.filter_options = FilterOptionsEngine(label_column=self.get_label_column)
 
     def register(
         self,
@@ -29,33 +46,100 @@ class ModelRegistry:
         search_fields: list[str] | None = None,
         display_fields: list[str] | None = None,
         pydantic_validate_class: BaseModel | None = None,
+        pagination: str = OFFSET,
+        count_strategy: CountStrategy | None = None,
+        filter_options_top_n: int | None = None,
+        label_field: str | ColumnElement[Any] | None = None,
+        count_execution: str = SEQUENTIAL,
+        search_backend: SearchBackend | None = None,
+        version_field: str | None = None,
+        actions: Sequence[BulkAction] | None = None,
     ) -> None:
         """
         Register a SQLAlchemy model with its filter and search fields.
+
+        `pagination` selects how the list view pages through rows: "offset"
+        (numbered pages) or "keyset" (cursor based, constant cost per page).
+        `count_strategy` decides how the list view total is computed and
+        defaults to an exact count. `filter_options_top_n` limits filter
+        choices to the most frequent values. `label_field` labels the model's
+        rows in selects, filters and typeahead results, either a column name
+        or a SQL expression such as `User.name + " (" + User.email + ")"`,
+        so that only `(pk, label)` pairs are fetched instead of whole rows
+        rendered with `str()`. `count_execution` fetches
+        the total "sequential"ly, in the page query itself ("window") or
+        "concurrent"ly with it. `search_backend` matches the search term
+        against `search_fields`, by default with `ILIKE '%term%'`.
+        `version_field` names an integer column bumped by every update, which
+        then only applies if nobody saved the row since the form was opened
+        (defaults to the mapper's `version_id_col`). Without one, an update
+        conflicts when a changed column no longer holds its original value.
+        `actions` are the bulk actions offered on the list view; none are
+        offered unless passed. Built in are `DeleteSelected`, `SetField` and
+        `CallableAction` (an async `func(crud, condition)`).
         """
-        if filter_fields is None:
-            filter_fields = []
-        if search_fields is None:
-            search_fields = []
-        if display_fields is None:
-            display_fields = []
+        if pagination not in PAGINATION_MODES:
+            raise ValueError(
+                f"Unknown pagination mode {pagination!r}, "
+                f"expected one of {PAGINATION_MODES}"
+            )
+        if count_execution not in COUNT_EXECUTIONS:
+            raise ValueError(
+                f"Unknown count execution {count_execution!r}, "
+                f"expected one of {COUNT_EXECUTIONS}"
+            )
 
-        if model not in self._models:
-            self._models.append(model)
-            self._filter_fields[model] = filter_fields
-            self._search_fields[model] = search_fields
-            self._display_fields[model] = display_fields
-            self._pydantic_models[model] = (
-                pydantic_validate_class
-                if pydantic_validate_class
-                else generate_pydantic_model(model)  # type: ignore
+        if model not in self._admins:
+            version_field = version_field or get_version_field(model)
+            admin = ModelAdmin(
+                model,
+                filter_fields=filter_fields,
+                search_fields=search_fields,
+                display_fields=display_fields,
+                validator=(
+                    pydantic_validate_class  # type: ignore
+                    if pydantic_validate_class
+                    else generate_pydantic_model(
+                        model,  # type: ignore
+                        exclude=["id", version_field] if version_field else None,
+                    )
+                ),
+                pagination=pagination,
+                count_strategy=count_strategy,
+                filter_options_top_n=filter_options_top_n,
+                label_field=label_field,
+                count_execution=count_execution,
+                search_backend=search_backend,
+                version_field=version_field,
+                actions=actions,
             )
+            self._models.append(model)
+            self._admins[model] = admin
+            self._admins_by_name[admin.url_name] = admin
+            self._model_names.append(admin.name)
+
+    def get_admin(self, model: type[Base]) -> ModelAdmin:
+        """
+        Get the compiled metadata of a model. Unregistered models are
+        compiled on the fly with default settings.
+        """
+        admin = self._admins.get(model)
+        if admin is None:
+            admin = ModelAdmin(model)
+        return admin
 
     def get_model(self, model: type[Base]) -> type[Base]:
         """
         Get a registered SQLAlchemy model.
         """
-        return self._models[self._models.index(model)]
+        return self._admins[model].model
+
+    def get_model_by_name(self, model_name: str) -> type[Base] | None:
+        """
+        Get a registered SQLAlchemy model by its (case-insensitive) URL name.
+        """
+        admin = self._admins_by_name.get(model_name.lower())
+        return admin.model if admin else None
 
     def get_models(self) -> list[type[Base]]:
         """
@@ -63,74 +147,134 @@ class ModelRegistry:
         """
         return self._models
 
-    def get_filter_fields(self, model: type[Base]) -> list[str]:
+    def get_model_names(self) -> list[str]:
+        """
+        Get the names of all registered SQLAlchemy models.
+        """
+        return self._model_names
+
+    def get_filter_fields(self, model: type[Base]) -> tuple[str, ...]:
         """
         Get the filter fields for a model.
         """
-        return self._filter_fields.get(model, [])  # type: ignore
+        admin = self._admins.get(model)
+        return admin.filter_fields if admin else ()
 
-    def get_search_fields(self, model: type[Base]) -> list[str]:
+    def get_search_fields(self, model: type[Base]) -> tuple[str, ...]:
         """
         Get the search fields for a model.
         """
-        return self._search_fields.get(model, [])  # type: ignore
+        admin = self._admins.get(model)
+        return admin.search_fields if admin else ()
 
-    def get_display_fields(self, model: type[Base]) -> list[str]:
+    def get_display_fields(self, model: type[Base]) -> tuple[str, ...]:
         """
         Get the display fields for a model.
         """
-        return self._display_fields.get(model, [])  # type: ignore
+        admin = self._admins.get(model)
+        return admin.display_fields if admin else ()
+
+    def get_pagination(self, model: type[Base]) -> str:
+        """
+        Get the pagination mode for a model.
+        """
+        admin = self._admins.get(model)
+        return admin.pagination if admin else OFFSET
+
+    def get_count_strategy(self, model: type[Base]) -> CountStrategy:
+        """
+        Get the count strategy for a model.
+        """
+        admin = self._admins.get(model)
+        return admin.count_strategy if admin else ExactCount()
+
+    def get_label_column(self, model: type[Base]) -> Any:
+        """
+        Get the SQL expression labelling a model's rows, or None to fall back
+        to `str()`.
+        """
+        admin = self._admins.get(model)
+        return admin.label_column if admin else None
 
     def get_pydantic_model(self, model: type[Base]) -> type[BaseModel]:
         """
         Get the Pydantic model for a model.
         """
-        return self._pydantic_models[model]
+        return self._admins[model].validator  # type: ignore
+
+    def get_update_model(self, model: type[Base]) -> type[BaseModel]:
+        """
+        Get the Pydantic model validating update forms of a model, where
+        secret fields may be left blank.
+        """
+        return self._admins[model].update_validator  # type: ignore
+
+    def get_filter_options_top_n(self, model: type[Base]) -> int | None:
+        """
+        Get how many of the most frequent values filter fields list for a model.
+        """
+        admin = self._admins.get(model)
+        return admin.filter_options_top_n if admin else None
 
     async def get_filter_options(
         self, model: type[Base], field: str, db_session: AsyncSession
-    ) -> list[dict[str, Any]]:
+    ) -> FilterFieldOptions:
         """
         Get filter options for a given field, such as foreign key options,
         choice options, or enum options, using AsyncSession.
         """
+        async with slow_query_log.watch(db_session, model.__name__, "filter_options"):
+            return await self.filter_options.get_options(
+                model,
+                field,
+                db_session,
+                top_n=self.get_filter_options_top_n(model),
+            )
 
-        inspected_model = inspect(model)
-        column = None
-
-        for c in inspected_model.columns:
-            if c.name == field:
-                column = c
-                break
-
-        if column is None:
-            return []
-
-        if column.foreign_keys:
-            foreign_key = list(column.foreign_keys)[0]
-            related_table = foreign_key.column.table
-
-            related_model = None
-            for mapper in model.registry.mappers:
-                if mapper.persist_selectable == related_table:
-                    related_model = mapper.class_
-                    break
-
-            if related_model is None:
-                raise ValueError(f"Could not find ORM model for table {related_table}")
-
-            result = await db_session.execute(select(related_model))
-            related_objects = result.scalars().all()
-            return [{"value": obj.id, "label": str(obj)} for obj in related_objects]
-        if hasattr(column.type, "enums"):
-            return [{"value": value, "label": value} for value in column.type.enums]
+    async def search_filter_options(  # pylint: disable=too-many-arguments
+        self,
+        model: type[Base],
+        field: str,
+        db_session: AsyncSession,
+        term: str,
+        page: int = 1,
+    ) -> list[dict[str, Any]]:
+        """
+        Search the options of a filter field that is too large to list.
+        """
+        column = get_column(model, field)
+        search_fields = None
+        if column is not None and column.foreign_keys:
+            search_fields = self.get_search_fields(get_related_model(model, column))
+        async with slow_query_log.watch(
+            db_session, model.__name__, "filter_options_search"
+        ):
+            return await self.filter_options.search(
+                model,
+                field,
+                db_session,
+                term,
+                search_fields=search_fields,
+                page=page,
+            )
 
-        result = await db_session.execute(
-            model.__table__.select().with_only_columns([column]).distinct()  # type: ignore
-        )
-        distinct_values = result.scalars().all()
+    async def create_search_indexes(self, connection: AsyncConnection) -> None:
+        """
+        Create the indexes the search backend of every registered model relies
+        on. Safe to run on every startup.
+        """
+        for admin in self._admins.values():
+            if admin.search_fields:
+                await admin.search_backend.create_indexes(
+                    connection, admin.model, admin.search_fields
+                )
 
-        return [{"value": value, "label": str(value)} for value in distinct_values]
+    def invalidate(self, model: type[Base]) -> None:
+        """
+        Drop cached filter options and counts after the model's data changed.
+        """
+        self.filter_options.invalidate(model)
+        self.get_count_strategy(model).clear()
 
 
 registry = ModelRegistry()
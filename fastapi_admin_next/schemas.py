@@ -1,4 +1,5 @@
 from collections.abc import Sequence
+from datetime import datetime
 from typing import Any, Generic, TypeVar
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -28,6 +29,7 @@ class QueryParams(BaseModel):
     filter_params: dict[str, Any] | None = None
     sorting: dict[str, str] | None = None
     fetch_related_data: str | None = None
+    cursor: str | None = Field(None, description="The keyset pagination cursor")
 
     @property
     def skip(self) -> int:
@@ -39,17 +41,80 @@ class FilterOptions(BaseModel):
     query_params: QueryParams | None = None
     prefetch: tuple[str, ...] | None = None
     use_or: bool = False
+    pagination: str = "offset"
+    count_execution: str = "sequential"
 
     distinct_on: str | None = None
 
 
+class PageInfo(BaseModel):
+    total: int
+    total_is_estimate: bool = False
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    # The count execution that actually ran
+    count_execution: str = "sequential"
+
+
+class BulkActionResult(BaseModel):
+    action: str
+    label: str
+    rowcount: int
+    statements: int = 1
+
+
+class ImportResult(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    chunks: int = 0
+    # {"row": <1-based row number>, "errors": {field: message}}
+    errors: list[dict[str, Any]] = []
+
+
+class SlowQuery(BaseModel):
+    recorded_at: datetime
+    model: str
+    view: str
+    duration: float
+    statement: str
+    parameters: Any = None
+    plan: list[str] = []
+
+
+class IndexAdvice(BaseModel):
+    model: str
+    table: str
+    column: str
+    # Why the column needs an index: filter, sort, foreign_key or search
+    reasons: list[str]
+    message: str
+    # Suggested statements per dialect ("postgresql", "sqlite")
+    ddl: dict[str, list[str]] = {}
+
+
+class FilterFieldOptions(BaseModel):
+    options: list[dict[str, Any]] = []
+    remote: bool = False
+
+
 class ListResponse(BaseModel, Generic[T]):
     rows: Sequence[T]
     total: int
+    total_is_estimate: bool = False
     columns: list[str]
     filter_options: dict[str, Any]
     models: list[str]
     fk_to_rel_map: dict[str, Any]
+    sortable_fields: list[str] = []
+    # Labels of the foreign key values on the page, and the admin model
+    # name each foreign key column links to
+    related_labels: dict[str, dict[Any, str]] = {}
+    fk_to_model_name: dict[str, str] = {}
+    # Bulk actions offered for the selected rows, name to label
+    actions: dict[str, str] = {}
+    pagination: str = "offset"
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
@@ -69,8 +134,11 @@ class DetailResponse(BaseModel, Generic[T]):
     row: T
     columns: list[str]
     related_data: dict[str, Any]
+    fk_to_rel_map: dict[str, Any] = {}
     enum_fields: dict[str, Any]
     models: list[str]
+    # Values the form is rendered with, posted back to diff the update
+    snapshot: str | None = None
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
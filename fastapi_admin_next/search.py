@@ -0,0 +1,292 @@
+import re
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    column,
+    func,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from fastapi_admin_next.db_connect import Base
+from fastapi_admin_next.filter_options import get_primary_key, resolve_field
+
+
+def search_tokens(term: str) -> list[str]:
+    """
+    Split a search term into words, dropping every character that has a
+    meaning in a full-text query syntax.
+    """
+    return re.findall(r"\w+", term)
+
+
+def _columns(model: type[Base], fields: Sequence[str]) -> list[Any]:
+    return [getattr(model, field) for field in fields if hasattr(model, field)]
+
+
+class SearchBackend:
+    """
+    Turns the list view search term into a WHERE condition over a model's
+    `search_fields`, optionally with a relevance ranking, and knows the DDL
+    that makes that condition use an index. Full-text backends index the
+    model's own columns and ignore `relation__field` paths.
+    """
+
+    def condition(
+        self, model: type[Base], fields: Sequence[str], term: str
+    ) -> ColumnElement[bool] | None:
+        raise NotImplementedError
+
+    def rank(
+        self, model: type[Base], fields: Sequence[str], term: str
+    ) -> ColumnElement[Any] | None:
+        """
+        An ascending sort key putting the best matches first, or None when
+        the backend does not rank.
+        """
+        return None
+
+    def order_by_rank(
+        self, query: Select[Any], model: type[Base], fields: Sequence[str], term: str
+    ) -> Select[Any]:
+        """
+        `query` with the best matches first, unchanged when the backend does
+        not rank.
+        """
+        rank = self.rank(model, fields, term)
+        if rank is None:
+            return query
+        return query.order_by(rank, get_primary_key(model))
+
+    def ddl(self, model: type[Base], fields: Sequence[str]) -> list[str]:
+        """
+        The statements creating the indexes the backend relies on, safe to
+        run more than once (e.g. from a migration with `op.execute`).
+        """
+        return []
+
+    async def create_indexes(
+        self, connection: AsyncConnection, model: type[Base], fields: Sequence[str]
+    ) -> None:
+        for statement in self.ddl(model, fields):
+            await connection.exec_driver_sql(statement)
+
+
+class IlikeSearch(SearchBackend):
+    """
+    `ILIKE '%term%'` OR'd across the fields. Works everywhere but can't use
+    a B-tree index, so every search scans the table. With `prefix_only`,
+    `ILIKE 'term%'` can use an index on databases that support it.
+    `relation__field` paths are matched through `EXISTS` subqueries.
+    """
+
+    def __init__(self, prefix_only: bool = False) -> None:
+        self.prefix_only = prefix_only
+
+    def condition(
+        self, model: type[Base], fields: Sequence[str], term: str
+    ) -> ColumnElement[bool] | None:
+        pattern = f"{term}%" if self.prefix_only else f"%{term}%"
+        conditions = []
+        for field in fields:
+            path = resolve_field(model, field)
+            if path is not None:
+                conditions.append(path.where(path.column.ilike(pattern)))
+        return or_(*conditions) if conditions else None
+
+
+class PostgresFullTextSearch(SearchBackend):
+    """
+    PostgreSQL full-text search over a `tsvector` of the concatenated fields,
+    backed by a GIN expression index. Words match as prefixes (`word:*`) when
+    `prefix` is set and results are ranked with `ts_rank`.
+
+    With `trigram`, each field is also matched with `ILIKE '%term%'` served
+    by `pg_trgm` GIN indexes, which finds substrings inside words too.
+    """
+
+    def __init__(
+        self, config: str = "simple", prefix: bool = True, trigram: bool = False
+    ) -> None:
+        if not re.fullmatch(r"\w+", config):
+            raise ValueError(f"Invalid text search configuration {config!r}")
+        self.config = config
+        self.prefix = prefix
+        self.trigram = trigram
+
+    @property
+    def _regconfig(self) -> Any:
+        return literal_column(f"'{self.config}'::regconfig")
+
+    def _vector(self, model: type[Base], fields: Sequence[str]) -> Any:
+        # Constants are rendered inline: the expression has to match the one
+        # indexed by `ddl` for the planner to use the GIN index
+        document: Any = None
+        for col in _columns(model, fields):
+            value = func.coalesce(col, literal_column("''"))
+            document = (
+                value
+                if document is None
+                else document.concat(literal_column("' '")).concat(value)
+            )
+        if document is None:
+            return None
+        return func.to_tsvector(self._regconfig, document)
+
+    def _query(self, term: str) -> Any:
+        tokens = search_tokens(term)
+        if not tokens:
+            return None
+        suffix = ":*" if self.prefix else ""
+        return func.to_tsquery(
+            self._regconfig,
+            " & ".join(f"{token}{suffix}" for token in tokens),
+        )
+
+    def condition(
+        self, model: type[Base], fields: Sequence[str], term: str
+    ) -> ColumnElement[bool] | None:
+        vector, query = self._vector(model, fields), self._query(term)
+        conditions = []
+        if vector is not None and query is not None:
+            conditions.append(vector.op("@@")(query))
+        if self.trigram:
+            conditions.extend(c.ilike(f"%{term}%") for c in _columns(model, fields))
+        return or_(*conditions) if conditions else None
+
+    def rank(
+        self, model: type[Base], fields: Sequence[str], term: str
+    ) -> ColumnElement[Any] | None:
+        vector, query = self._vector(model, fields), self._query(term)
+        if vector is None or query is None:
+            return None
+        return func.ts_rank(vector, query).desc()
+
+    def ddl(self, model: type[Base], fields: Sequence[str]) -> list[str]:
+        table_name = model.__table__.name  # type: ignore
+        names = [c.name for c in _columns(model, fields)]
+        if not names:
+            return []
+        document = " || ' ' || ".join(f"coalesce({name}, '')" for name in names)
+        statements = [
+            f"CREATE INDEX IF NOT EXISTS ix_{table_name}_search_tsv ON {table_name} "
+            f"USING GIN (to_tsvector('{self.config}'::regconfig, {document}))"
+        ]
+        if self.trigram:
+            statements.insert(0, "CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            statements.extend(
+                f"CREATE INDEX IF NOT EXISTS ix_{table_name}_{name}_trgm "
+                f"ON {table_name} USING GIN ({name} gin_trgm_ops)"
+                for name in names
+            )
+        return statements
+
+
+class SQLiteFTS5Search(SearchBackend):
+    """
+    SQLite FTS5 search through an external-content virtual table named
+    `<table>_fts`, kept in sync with the model's table by triggers. Words
+    match as prefixes when `prefix` is set and results are ranked by bm25.
+    The model needs an integer primary key, used as the FTS rowid.
+    """
+
+    def __init__(self, prefix: bool = True, tokenize: str = "unicode61") -> None:
+        self.prefix = prefix
+        self.tokenize = tokenize
+
+    @staticmethod
+    def fts_table_name(model: type[Base]) -> str:
+        return f"{model.__table__.name}_fts"  # type: ignore
+
+    def _match(self, model: type[Base], term: str) -> tuple[Any, Any] | None:
+        tokens = search_tokens(term)
+        if not tokens:
+            return None
+        suffix = "*" if self.prefix else ""
+        name = self.fts_table_name(model)
+        fts = table(name, column("rowid"), column("rank"), column(name))
+        match = fts.c[name].op("MATCH")(
+            " ".join(f'"{token}"{suffix}' for token in tokens)
+        )
+        return fts, match
+
+    def condition(
+        self, model: type[Base], fields: Sequence[str], term: str
+    ) -> ColumnElement[bool] | None:
+        matched = self._match(model, term)
+        if matched is None:
+            return None
+        fts, match = matched
+        pk: ColumnElement[Any] = get_primary_key(model)
+        return pk.in_(select(fts.c.rowid).where(match))
+
+    def order_by_rank(
+        self, query: Select[Any], model: type[Base], fields: Sequence[str], term: str
+    ) -> Select[Any]:
+        matched = self._match(model, term)
+        if matched is None:
+            return query
+        fts, match = matched
+        # The FTS table is searched once and joined on rowid; bm25 ranks are
+        # negative, the best match has the lowest one
+        ranks = select(fts.c.rowid, fts.c.rank).where(match).subquery("fts_rank")
+        pk = get_primary_key(model)
+        return query.join(ranks, ranks.c.rowid == pk).order_by(ranks.c.rank, pk)
+
+    def _rebuild(self, model: type[Base]) -> str:
+        fts = self.fts_table_name(model)
+        return f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"
+
+    def ddl(self, model: type[Base], fields: Sequence[str]) -> list[str]:
+        """
+        The FTS table and its sync triggers. The last statement indexes the
+        rows that existed before the triggers, reading the whole table: run
+        it once, when the FTS table is created.
+        """
+        table_name = model.__table__.name  # type: ignore
+        pk = get_primary_key(model).name
+        names = [c.name for c in _columns(model, fields)]
+        if not names:
+            return []
+        fts = self.fts_table_name(model)
+        columns = ", ".join(names)
+        new_values = ", ".join(f"new.{name}" for name in names)
+        old_values = ", ".join(f"old.{name}" for name in names)
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({columns}, "
+            f"content='{table_name}', content_rowid='{pk}', "
+            f"tokenize='{self.tokenize}')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN "
+            f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.{pk}, {new_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {columns}) "
+            f"VALUES ('delete', old.{pk}, {old_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table_name} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {columns}) "
+            f"VALUES ('delete', old.{pk}, {old_values}); "
+            f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.{pk}, {new_values}); END",
+            self._rebuild(model),
+        ]
+
+    async def create_indexes(
+        self, connection: AsyncConnection, model: type[Base], fields: Sequence[str]
+    ) -> None:
+        """
+        Create the FTS table and triggers when missing, and only index the
+        existing rows when the FTS table was just created.
+        """
+        exists = await connection.scalar(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": self.fts_table_name(model)},
+        )
+        rebuild = self._rebuild(model)
+        for statement in self.ddl(model, fields):
+            if statement != rebuild or not exists:
+                await connection.exec_driver_sql(statement)
@@ -1,5 +1,12 @@
 from .backend import JWTCookieBackend
+from .hasher import AsyncPasswordHasher, PasswordHasherManager
 from .security import PasswordHandler
 from .token_handler import TokenManager
 
-__all__ = ["PasswordHandler", "TokenManager", "JWTCookieBackend"]
+__all__ = [
+    "AsyncPasswordHasher",
+    "PasswordHandler",
+    "PasswordHasherManager",
+    "TokenManager",
+    "JWTCookieBackend",
+]
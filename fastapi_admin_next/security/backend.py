@@ -1,3 +1,5 @@
+import hashlib
+import time
 from typing import Any
 
 from jose import ExpiredSignatureError, jwt
@@ -9,12 +11,35 @@ from starlette.authentication import (
 )
 from starlette.requests import Request
 
+from fastapi_admin_next.cache import TTLCache
 from fastapi_admin_next.configs import AuthConfigManager
 from fastapi_admin_next.logger import logger
 
 
 class JWTCookieBackend(AuthenticationBackend):
+    """
+    Authenticates requests from the JWT stored in the `auth_token` cookie.
+
+    Verified tokens are kept in an LRU cache of `cache_size` entries keyed by
+    the token's SHA-256 digest, each expiring at the token's own `exp`, so
+    repeated requests with the same cookie skip signature checking and JSON
+    parsing. `cache_size=0` disables the cache.
+    """
+
+    def __init__(self, cache_size: int = 1024) -> None:
+        self._cache: TTLCache[dict[str, Any]] | None = (
+            TTLCache(maxsize=cache_size, ttl=None) if cache_size else None
+        )
+
     def verify_user_id(self, token: str) -> dict[str, Any] | None:
+        if not token:
+            return None
+
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+        if self._cache is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
 
         auth_config = AuthConfigManager.get_auth_config()
 
@@ -30,8 +55,17 @@ class JWTCookieBackend(AuthenticationBackend):
 
         if "id" not in data:
             return None
+
+        if self._cache is not None and isinstance(data.get("exp"), (int, float)):
+            # Translate the wall clock `exp` into the cache's monotonic clock
+            expires_at = time.monotonic() + (data["exp"] - time.time())
+            self._cache.set(key, data, expires_at=expires_at)
         return data
 
+    def clear_cache(self) -> None:
+        if self._cache is not None:
+            self._cache.clear()
+
     async def authenticate(  # pylint: disable=arguments-renamed
         self, request: Request
     ) -> tuple[AuthCredentials, SimpleUser | UnauthenticatedUser]:
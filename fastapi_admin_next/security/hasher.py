@@ -0,0 +1,95 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from fastapi_admin_next.exceptions import TooManyRequestsException
+
+from .security import DEFAULT_ROUNDS, PasswordHandler
+
+T = TypeVar("T")
+
+
+class AsyncPasswordHasher:
+    """
+    Runs bcrypt on a small dedicated thread pool so that hashing never blocks
+    the event loop.
+
+    At most `max_workers` hashes run at the same time. Calls beyond that wait
+    in the pool's queue; once `max_pending` calls are running or waiting, new
+    ones are rejected with `TooManyRequestsException` (HTTP 429) instead of
+    piling up behind a burst of logins.
+    """
+
+    def __init__(
+        self,
+        rounds: int = DEFAULT_ROUNDS,
+        max_workers: int = 2,
+        max_pending: int = 32,
+    ) -> None:
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of hash operations currently running or queued.
+        """
+        return self._pending
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._pending >= self.max_pending:
+            raise TooManyRequestsException(
+                message="Too many password operations in progress, try again"
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hasher"
+            )
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(PasswordHandler.hash, password, self.rounds)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(
+            PasswordHandler.verify_password, plain_password, hashed_password
+        )
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """
+        Whether a stored hash was made with a different work factor than the
+        configured one.
+        """
+        return PasswordHandler.needs_rehash(hashed_password, self.rounds)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+class PasswordHasherManager:
+    _instance: AsyncPasswordHasher | None = None
+
+    @classmethod
+    def set_hasher(cls, hasher: AsyncPasswordHasher) -> None:
+        """Sets the AsyncPasswordHasher instance."""
+        if cls._instance is not None and cls._instance is not hasher:
+            cls._instance.shutdown()
+        cls._instance = hasher
+
+    @classmethod
+    def get_hasher(cls) -> AsyncPasswordHasher:
+        """Retrieves the AsyncPasswordHasher instance, creating a default one."""
+        if cls._instance is None:
+            cls._instance = AsyncPasswordHasher()
+        return cls._instance
@@ -2,12 +2,14 @@ import bcrypt
 
 from fastapi_admin_next.logger import logger
 
+DEFAULT_ROUNDS = 12
+
 
 class PasswordHandler:
     @staticmethod
-    def hash(password: str) -> str:
+    def hash(password: str, rounds: int = DEFAULT_ROUNDS) -> str:
         pwd_bytes = password.encode("utf-8")
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=rounds)
         hashed_password = bcrypt.hashpw(password=pwd_bytes, salt=salt)
         string_password = hashed_password.decode("utf8")
         return str(string_password)
@@ -21,3 +23,17 @@ class PasswordHandler:
         except Exception as err:  # pylint: disable=broad-except
             logger.error("Error verifying password: %s", err)
             return False
+
+    @staticmethod
+    def get_rounds(hashed_password: str) -> int | None:
+        """
+        Read the work factor out of a bcrypt hash (`$2b$<rounds>$...`).
+        """
+        parts = hashed_password.split("$")
+        if len(parts) < 4 or not parts[2].isdigit():
+            return None
+        return int(parts[2])
+
+    @staticmethod
+    def needs_rehash(hashed_password: str, rounds: int = DEFAULT_ROUNDS) -> bool:
+        return PasswordHandler.get_rounds(hashed_password) != rounds
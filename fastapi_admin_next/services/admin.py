@@ -1,23 +1,36 @@
-from typing import Any
+import io
+from collections.abc import AsyncIterator, Callable, Sequence
+from contextlib import AbstractAsyncContextManager
+from typing import IO, Any
 
 from pydantic import ValidationError
-from sqlalchemy import Enum, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.inspection import inspect
 
-from fastapi_admin_next.configs import AuthConfigManager
 from fastapi_admin_next.crud import CRUDGenerator
 from fastapi_admin_next.db_connect import Base
+from fastapi_admin_next.exceptions import ValidationException
+from fastapi_admin_next.export import export_stream
+from fastapi_admin_next.filter_options import (
+    RelatedLabelLoader,
+    fetch_related_labels,
+    get_primary_key,
+    search_related,
+)
+from fastapi_admin_next.importer import DEFAULT_CHUNK_SIZE, BulkImporter
+from fastapi_admin_next.model_admin import SNAPSHOT_FIELD, is_secret_column
 from fastapi_admin_next.schemas import (
+    BulkActionResult,
     CreateForm,
     DetailResponse,
+    FilterFieldOptions,
     FilterOptions,
+    ImportResult,
     ListResponse,
     NotFoundResponse,
     QueryParams,
     SaveForm,
 )
-from fastapi_admin_next.security import PasswordHandler
+from fastapi_admin_next.security import PasswordHasherManager
 
 from .base import BaseService
 
@@ -25,7 +38,14 @@ from .base import BaseService
 class AdminNextService(BaseService):
 
     def get_models(self) -> list[str]:
-        return [model.__name__ for model in self.registry.get_models()]
+        return self.registry.get_model_names()
+
+    def is_sortable(self, model: type[Base], sorting: dict[str, str] | None) -> bool:
+        """
+        Whether the list view can sort on the requested fields.
+        """
+        sortable = self.registry.get_admin(model).sortable_fields
+        return not sorting or all(field in sortable for field in sorting)
 
     def get_homepage(self) -> list[str]:
         return self.get_models()
@@ -35,116 +55,268 @@ class AdminNextService(BaseService):
         model: type[Base],
         query_params: QueryParams,
         db: AsyncSession,
-    ) -> ListResponse[Base]:
+    ) -> ListResponse[Any]:
+        admin = self.registry.get_admin(model)
         filters = query_params.filter_params
-        query_params.search_fields = self.registry.get_search_fields(model)
-        filter_fields = self.registry.get_filter_fields(model)
-        filter_options = {}
-        for field in filter_fields:
+        query_params.search_fields = list(admin.search_fields)
+        filter_options: dict[str, FilterFieldOptions] = {}
+        for field in admin.filter_fields:
             filter_options[field] = await self.registry.get_filter_options(
                 model, field, db
             )
 
-        crud: CRUDGenerator[Base] = CRUDGenerator(model=model, session=db)
-
-        inspector = inspect(model)
-        relationships = inspector.relationships
-
-        fk_to_rel_map = {
-            fk.name: rel.key
-            for rel in relationships.values()
-            if not rel.uselist  # Only include single relationships
-            for fk in rel._calculated_foreign_keys  # pylint: disable=protected-access
-        }
+        crud: CRUDGenerator[Base] = CRUDGenerator(
+            model=model,
+            session=db,
+            count_strategy=admin.count_strategy,
+            search_backend=admin.search_backend,
+        )
 
-        rows, total = await crud.paginate_filter(
+        rows, page_info = await crud.paginate(
             filter_options=FilterOptions(
                 filters=filters,
                 query_params=query_params,
-                sorting=query_params.sorting,
-                prefetch=(
-                    fk_to_rel_map.values()
-                    if query_params.fetch_related_data == "true" and fk_to_rel_map
-                    else None
-                ),
+                pagination=admin.pagination,
+                count_execution=admin.count_execution,
             ),
+            # Load just what the list template renders, as read-only rows
+            only=admin.list_projection,
         )
 
-        display_fields = self.registry.get_display_fields(model)
-        columns = (
-            display_fields
-            if display_fields
-            else [column.name for column in model.__table__.columns]
-        )
+        # Foreign keys are shown with their labels, one small query per
+        # related model instead of joining whole related rows
+        related_labels = await RelatedLabelLoader(
+            db, self.registry.get_label_column
+        ).resolve(rows, admin.list_relations)
 
         return ListResponse(
             rows=rows,
-            total=total,
-            columns=columns,
+            total=page_info.total,
+            total_is_estimate=page_info.total_is_estimate,
+            columns=list(admin.list_columns),
+            sortable_fields=list(admin.sortable_fields),
             filter_options=filter_options,
-            fk_to_rel_map=fk_to_rel_map,
+            fk_to_rel_map=dict(admin.list_fk_to_rel_map),
+            actions={name: action.label for name, action in admin.actions.items()},
+            related_labels=related_labels,
+            fk_to_model_name={
+                relation.fk_column: relation.related_model.__name__.lower()
+                for relation in admin.list_relations
+            },
             models=self.get_models(),
+            pagination=admin.pagination,
+            next_cursor=page_info.next_cursor,
+            prev_cursor=page_info.prev_cursor,
+        )
+
+    def get_export_columns(
+        self, model: type[Base], columns: Sequence[str] | None = None
+    ) -> list[str] | None:
+        """
+        The columns to export, by default those of the list view. Returns
+        None if one is not an exportable column; password columns never are.
+        """
+        admin = self.registry.get_admin(model)
+        exportable = {key for key in admin.column_keys if not is_secret_column(key)}
+        if not columns:
+            return [column for column in admin.list_columns if column in exportable]
+        if not exportable.issuperset(columns):
+            return None
+        return list(columns)
+
+    async def export_view(  # pylint: disable=too-many-arguments
+        self,
+        model: type[Base],
+        query_params: QueryParams,
+        columns: Sequence[str],
+        export_format: str,
+        session_factory: Callable[[], AbstractAsyncContextManager[AsyncSession]],
+    ) -> AsyncIterator[str]:
+        """
+        Stream the rows matching the list view's filters, search and sort.
+
+        The response is still streaming after the endpoint returned, so the
+        session comes from `session_factory` and lives as long as the stream
+        instead of being a request dependency.
+        """
+        admin = self.registry.get_admin(model)
+        query_params.search_fields = list(admin.search_fields)
+        filter_options = FilterOptions(
+            filters=query_params.filter_params or {}, query_params=query_params
+        )
+        async with session_factory() as db:
+            crud: CRUDGenerator[Base] = CRUDGenerator(
+                model=model, session=db, search_backend=admin.search_backend
+            )
+            async for chunk in export_stream(
+                columns, crud.stream(filter_options, columns), export_format
+            ):
+                yield chunk
+
+    async def import_view(  # pylint: disable=too-many-arguments
+        self,
+        model: type[Base],
+        file: IO[bytes],
+        import_format: str,
+        db: AsyncSession,
+        upsert_on: Sequence[str] = (),
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> ImportResult:
+        """
+        Import an uploaded CSV or NDJSON file in chunks, validated with the
+        model's pydantic class. With `upsert_on`, rows matching an existing
+        natural key update it.
+        """
+        importer = BulkImporter(
+            db, model, self.registry.get_pydantic_model(model), upsert_on=upsert_on
         )
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        try:
+            result = await importer.import_file(text, import_format, chunk_size)
+        finally:
+            # The upload owns the underlying file
+            text.detach()
+        if result.imported:
+            self.registry.invalidate(model)
+        return result
+
+    async def run_bulk_action(  # pylint: disable=too-many-arguments
+        self,
+        model: type[Base],
+        action_name: str,
+        db: AsyncSession,
+        ids: list[str] | None = None,
+        query_params: QueryParams | None = None,
+        confirm_all: bool = False,
+    ) -> BulkActionResult | None:
+        """
+        Run a registered bulk action on the selected primary keys, or when
+        `ids` is None, on every row matching the list view's filters and
+        search. Returns None if the model has no such action.
+
+        Raises:
+            ValidationException: If an id is not a valid primary key, or a
+                destructive action would run on the whole table without
+                `confirm_all`.
+        """
+        admin = self.registry.get_admin(model)
+        action = admin.actions.get(action_name)
+        if action is None:
+            return None
+
+        filter_options = None
+        selected: list[Any] | None = None
+        if ids is not None:
+            pk_type = get_primary_key(model).type.python_type
+            try:
+                selected = [pk_type(value) for value in ids]
+            except (TypeError, ValueError) as e:
+                raise ValidationException(
+                    errors={"ids": "Invalid row id"}, message="Invalid row id"
+                ) from e
+        else:
+            query_params = query_params or QueryParams()
+            query_params.search_fields = list(admin.search_fields)
+            filter_options = FilterOptions(
+                filters=query_params.filter_params or {}, query_params=query_params
+            )
+
+        crud: CRUDGenerator[Base] = CRUDGenerator(
+            model=model, session=db, search_backend=admin.search_backend
+        )
+        result = await crud.run_action(
+            action, ids=selected, filter_options=filter_options, confirm_all=confirm_all
+        )
+        if result.rowcount:
+            self.registry.invalidate(model)
+        return result
 
     async def get_create_view(
         self,
         model: type[Base],
         db: AsyncSession,
+        form_data: dict[str, Any] | None = None,
     ) -> CreateForm:
-        inspector = inspect(model)
-        columns = [col.key for col in inspector.columns if col.key != "id"]
-        relationships = inspector.relationships
-
-        fk_to_rel_map = {
-            fk.name: rel.key
-            for rel in relationships.values()
-            for fk in rel._calculated_foreign_keys  # pylint: disable=protected-access
-        }
-
-        enum_fields = {
-            col.key: list(col.type.enums)
-            for col in inspector.columns.values()
-            if isinstance(col.type, Enum)
-        }
+        admin = self.registry.get_admin(model)
 
+        # Only the currently selected values are preloaded, everything else
+        # is searched through the autocomplete endpoint
         related_options = {}
-        for _, rel in relationships.items():
-            stmt = select(rel.mapper.class_)
-            related_rows = await db.execute(stmt)
-            related_options[rel.key] = [
-                {"id": getattr(row, "id"), "label": str(row)}
-                for row in related_rows.scalars()
+        for relation in admin.relations:
+            selected = (form_data or {}).get(relation.fk_column)
+            labels = await fetch_related_labels(
+                relation.related_model,
+                db,
+                [selected] if selected is not None else [],
+                self.registry.get_label_column(relation.related_model),
+            )
+            related_options[relation.key] = [
+                {"id": value, "label": label} for value, label in labels.items()
             ]
 
         return CreateForm(
-            columns=columns,
-            enum_fields=enum_fields,
+            columns=list(admin.form_columns),
+            enum_fields={key: list(value) for key, value in admin.enum_fields.items()},
             related_options=related_options,
-            fk_to_rel_map=fk_to_rel_map,
+            fk_to_rel_map=dict(admin.fk_to_rel_map),
             models=self.get_models(),
         )
 
+    async def get_autocomplete(  # pylint: disable=too-many-arguments
+        self,
+        model: type[Base],
+        relation: str,
+        db: AsyncSession,
+        term: str = "",
+        page: int = 1,
+    ) -> list[dict[str, Any]] | None:
+        """
+        Search the rows a many-to-one relationship can point to, one page at
+        a time. Returns None if `relation` is not such a relationship.
+        """
+        related_model = next(
+            (
+                info.related_model
+                for info in self.registry.get_admin(model).relations
+                if info.key == relation
+            ),
+            None,
+        )
+        if related_model is None:
+            return None
+        return await search_related(
+            related_model,
+            db,
+            term,
+            search_fields=self.registry.get_search_fields(related_model),
+            label_column=self.registry.get_label_column(related_model),
+            page=page,
+        )
+
     async def save_view(
         self,
         data_dict: dict[str, Any],
         model: type[Base],
         db: AsyncSession,
     ) -> SaveForm:
-
+        """
+        Insert the validated form with one `INSERT ... RETURNING`.
+        """
         try:
+            hasher = PasswordHasherManager.get_hasher()
             processed_data = {
                 key: (
-                    PasswordHandler.hash(value)
-                    if "password" in key.lower() and isinstance(value, str)
+                    await hasher.hash(value)
+                    if is_secret_column(key) and isinstance(value, str)
                     else value
                 )
                 for key, value in data_dict.items()
             }
 
             validated_data = self.registry.get_pydantic_model(model)(**processed_data)
-            obj = model(**validated_data.model_dump())
-            db.add(obj)
-            await db.commit()
+            crud = CRUDGenerator(model=model, session=db)
+            await crud.create(db, validated_data.model_dump())
+            self.registry.invalidate(model)
             return SaveForm(errors=None)
         except ValidationError as e:
             error_messages = {err["loc"][-1]: err["msg"] for err in e.errors()}
@@ -156,83 +328,114 @@ class AdminNextService(BaseService):
         obj_id: str,
         db: AsyncSession,
     ) -> DetailResponse[Base] | NotFoundResponse:
-        inspector = inspect(model)
+        admin = self.registry.get_admin(model)
         crud = CRUDGenerator(model=model, session=db)
         obj_to_update = await crud.get_by_id(obj_id=obj_id)
         if not obj_to_update:
             return NotFoundResponse(message="Object not found")
 
-        # relationships = inspect(model).relationships
-        # related_data = {}
-        # for _, rel in relationships.items():
-        #     # Use the foreign key column name as the key
-        #     fk_column = list(rel.local_columns)[0].name
-        #     stmt = select(rel.mapper.class_)
-
-        #     related_rows = await db.execute(stmt)
-        #     related_data[fk_column] = [
-        #         (getattr(row, "id"), str(row)) for row in related_rows.scalars()
-        #     ]
-
-        # print(related_data, "-----")
-
         related_data = {}
-        for _, rel in inspect(model).relationships.items():
-            related_model = rel.mapper.class_
-            related_result = await db.execute(select(related_model))
-            fk_column = list(rel.local_columns)[0].name
-            related_data[fk_column] = [
-                (obj.id, str(obj)) for obj in related_result.scalars().all()
-            ]
-
-        columns = [
-            column.name for column in model.__table__.columns if column.name != "id"
-        ]
+        fk_to_rel_map = {}
+        for relation in admin.relations:
+            fk_to_rel_map[relation.fk_column] = relation.key
+            selected = getattr(obj_to_update, relation.fk_column, None)
+            labels = await fetch_related_labels(
+                relation.related_model,
+                db,
+                [selected] if selected is not None else [],
+                self.registry.get_label_column(relation.related_model),
+            )
+            related_data[relation.fk_column] = list(labels.items())
 
-        enum_fields = {
-            col.key: list(col.type.enums)
-            for col in inspector.columns.values()
-            if isinstance(col.type, Enum)
-        }
+        columns = [name for name in admin.column_names if name != "id"]
 
         return DetailResponse(
             row=obj_to_update,
             columns=columns,
             related_data=related_data,
-            enum_fields=enum_fields,
+            fk_to_rel_map=fk_to_rel_map,
+            enum_fields={key: list(value) for key, value in admin.enum_fields.items()},
             models=self.get_models(),
+            snapshot=admin.encode_snapshot(obj_to_update),
         )
 
-    async def update_view(
+    async def update_view(  # pylint: disable=too-many-locals
         self,
         data_dict: dict[str, Any],
         model: type[Base],
         obj_id: int,
         db: AsyncSession,
     ) -> SaveForm:
+        """
+        Save the columns the form changed with one `UPDATE ... RETURNING`.
+
+        Submitted values are diffed against the snapshot the form was
+        rendered with (or the stored row when none is posted), so untouched
+        columns are left alone. The update only applies while the row still
+        has the version of the snapshot, or without a version column, while
+        the changed columns still hold their original values; otherwise a
+        conflict is reported instead of overwriting someone else's save.
+        Secret columns are rendered blank and only saved when filled in.
+        """
+        raw_snapshot = data_dict.pop(SNAPSHOT_FIELD, None)
+        # A blank secret keeps the stored value
+        data_dict = {
+            key: value
+            for key, value in data_dict.items()
+            if value or not is_secret_column(key)
+        }
         try:
-            validated_data = self.registry.get_pydantic_model(model)(**data_dict)
+            validated_data = self.registry.get_update_model(model)(**data_dict)
             data_dict = validated_data.model_dump()
-            id = obj_id  # pylint: disable=redefined-builtin
-            obj = await db.get(model, id)
+        except ValidationError as e:
+            error_messages = {err["loc"][-1]: err["msg"] for err in e.errors()}
+            return SaveForm(errors=error_messages)
+
+        snapshot = (
+            self.registry.get_admin(model).decode_snapshot(raw_snapshot)
+            if raw_snapshot
+            else None
+        )
+        if snapshot is None:
+            obj = await db.get(model, obj_id)
             if not obj:
                 return SaveForm(errors={"id": "Object not found"})
+            snapshot = self.registry.get_admin(model).snapshot(obj)
+        admin = self.registry.get_admin(model)
 
-            auth_config = AuthConfigManager.get_auth_config()
-            if data_dict.get(auth_config.password_field):
-                if data_dict.get(auth_config.password_field) != getattr(
-                    obj, auth_config.password_field
-                ):
-                    data_dict[auth_config.password_field] = PasswordHandler.hash(
-                        data_dict[auth_config.password_field]
-                    )
-                else:
-                    data_dict.pop(auth_config.password_field)
-
-            for key, value in data_dict.items():
-                setattr(obj, key, value)
-            await db.commit()
+        secrets = {
+            key: data_dict.pop(key) for key in list(data_dict) if is_secret_column(key)
+        }
+        changes = {
+            key: value
+            for key, value in data_dict.items()
+            if key not in snapshot or snapshot[key] != value
+        }
+        hasher = PasswordHasherManager.get_hasher()
+        for key, value in secrets.items():
+            if value:
+                changes[key] = (
+                    await hasher.hash(value) if isinstance(value, str) else value
+                )
+        if not changes:
             return SaveForm(errors=None)
-        except ValidationError as e:
-            error_messages = {err["loc"][-1]: err["msg"] for err in e.errors()}
-            return SaveForm(errors=error_messages)
+
+        if admin.version_column:
+            expected = {admin.version_column: snapshot.get(admin.version_column)}
+            changes[admin.version_column] = getattr(model, admin.version_column) + 1
+        else:
+            expected = {key: snapshot[key] for key in changes if key in snapshot}
+
+        crud = CRUDGenerator(model=model, session=db)
+        if await crud.update_returning(obj_id, changes, expected) is None:
+            if await db.get(model, obj_id) is None:
+                return SaveForm(errors={"id": "Object not found"})
+            return SaveForm(
+                errors={
+                    "_form": "This object was changed by someone else since you "
+                    "opened it. Review the current values and save again."
+                }
+            )
+
+        self.registry.invalidate(model)
+        return SaveForm(errors=None)
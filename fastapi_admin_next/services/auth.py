@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi_admin_next.configs import AuthConfigManager
 from fastapi_admin_next.crud import CRUDGenerator
 from fastapi_admin_next.db_connect import Base
-from fastapi_admin_next.security import PasswordHandler, TokenManager
+from fastapi_admin_next.security import PasswordHasherManager, TokenManager
 
 from .base import BaseService
 
@@ -29,12 +29,24 @@ class AuthService(BaseService):
                 ]
             }
         )
-        if not user or not PasswordHandler.verify_password(
-            data_dict[auth_config.password_field], user.password  # type: ignore
+        hasher = PasswordHasherManager.get_hasher()
+        password = data_dict[auth_config.password_field]
+        hashed_password = getattr(user, auth_config.password_field, None)
+        if (
+            not user
+            or not password
+            or not hashed_password
+            or not await hasher.verify_password(password, hashed_password)
         ):
             errors = {"credentials": "Invalid credentials"}
             return errors, False
 
+        if hasher.needs_rehash(hashed_password):
+            # The work factor changed since this hash was stored, upgrade it
+            # now that the plain password is at hand
+            setattr(user, auth_config.password_field, await hasher.hash(password))
+            await db.commit()
+
         access_token = TokenManager(
             secret_key=auth_config.secret_key,
             algorithm=auth_config.algorithm,
@@ -1,18 +1,14 @@
 from typing import Any
 
 from fastapi.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
 
-from fastapi_admin_next.jinja_filters import ceil_filter, getattr_filter
 from fastapi_admin_next.registry import registry
+from fastapi_admin_next.templating import templates
 
 
 class BaseService:
     def __init__(self) -> None:
-        templates_directory = "fastapi_admin_next/templates"
-        self.templates = Jinja2Templates(directory=templates_directory)
-        self.templates.env.filters["getattr"] = getattr_filter
-        self.templates.env.filters["ceil_filter"] = ceil_filter
+        self.templates = templates
         self.registry = registry
 
     def redirect(
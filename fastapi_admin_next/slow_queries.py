@@ -0,0 +1,144 @@
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_admin_next.instrumentation import collecting
+from fastapi_admin_next.schemas import SlowQuery
+
+DEFAULT_MAX_ENTRIES = 100
+REDACTED = "***"
+
+# Plan of a statement, without running it
+EXPLAIN_PREFIXES = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+    "mysql": "EXPLAIN ",
+    "mariadb": "EXPLAIN ",
+}
+
+
+def redact(parameters: Any) -> Any:
+    """
+    Bound parameters with every value but numbers, booleans and NULL masked:
+    limits, offsets and keys stay readable, search terms and user data don't
+    reach the log.
+    """
+    if isinstance(parameters, dict):
+        return {key: redact(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact(value) for value in parameters]
+    if parameters is None or isinstance(parameters, (bool, int, float)):
+        return parameters
+    return REDACTED
+
+
+async def explain(session: AsyncSession, statement: str, parameters: Any) -> list[str]:
+    """
+    The database's plan for a statement as captured from the cursor, one
+    line per plan row. Empty on databases without a known EXPLAIN syntax.
+    """
+    connection = await session.connection()
+    dialect = connection.dialect.name
+    prefix = EXPLAIN_PREFIXES.get(dialect)
+    if prefix is None:
+        return []
+    try:
+        result = await connection.exec_driver_sql(prefix + statement, parameters)
+    except DBAPIError as e:
+        return [f"EXPLAIN failed: {e.orig}"]
+    rows = result.all()
+    if dialect == "sqlite":
+        # (id, parent, notused, detail)
+        return [str(row[-1]) for row in rows]
+    return [
+        (
+            str(row[0])
+            if len(row) == 1
+            else ", ".join(
+                f"{key}={value}"
+                for key, value in row._mapping.items()  # pylint: disable=protected-access
+                if value is not None
+            )
+        )
+        for row in rows
+    ]
+
+
+class _SlowStatements:
+    def __init__(self, threshold: float) -> None:
+        self.threshold = threshold
+        self.statements: list[tuple[str, float, Any]] = []
+
+    def record(self, statement: str, duration: float, parameters: Any) -> None:
+        if duration >= self.threshold:
+            self.statements.append((statement, duration, parameters))
+
+
+class SlowQueryLog:
+    """
+    Keeps the last `max_entries` statements that took at least `threshold`
+    seconds inside a watched block, with their plan. Disabled while the
+    threshold is None; watched statements are timed on instrumented engines.
+    """
+
+    def __init__(
+        self, threshold: float | None = None, max_entries: int = DEFAULT_MAX_ENTRIES
+    ) -> None:
+        self.threshold = threshold
+        self._entries: deque[SlowQuery] = deque(maxlen=max_entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold is not None
+
+    def configure(
+        self, threshold: float | None, max_entries: int = DEFAULT_MAX_ENTRIES
+    ) -> None:
+        self.threshold = threshold
+        if max_entries != self._entries.maxlen:
+            self._entries = deque(self._entries, maxlen=max_entries)
+
+    def entries(self) -> list[SlowQuery]:
+        """
+        Recorded statements, most recent first.
+        """
+        return list(reversed(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @asynccontextmanager
+    async def watch(
+        self, session: AsyncSession, model: str, view: str
+    ) -> AsyncIterator[None]:
+        """
+        Log the slow statements run within the block. Their plans are asked
+        for on `session` once the block is done, so EXPLAIN never delays the
+        statements being watched.
+        """
+        if self.threshold is None:
+            yield
+            return
+        slow = _SlowStatements(self.threshold)
+        with collecting(slow):
+            yield
+        for statement, duration, parameters in slow.statements:
+            self._entries.append(
+                SlowQuery(
+                    recorded_at=datetime.now(timezone.utc),
+                    model=model,
+                    view=view,
+                    duration=duration,
+                    statement=statement,
+                    parameters=redact(parameters),
+                    plan=await explain(session, statement, parameters),
+                )
+            )
+
+
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,17 @@
+//
+// Header checkboxes carrying `data-select-rows="<name>"` (un)check every
+// checkbox of that name on the page.
+//
+
+window.addEventListener('DOMContentLoaded', event => {
+
+    document.querySelectorAll('[data-select-rows]').forEach(toggle => {
+        toggle.addEventListener('change', event => {
+            const selector = `input[type="checkbox"][name="${toggle.dataset.selectRows}"]`;
+            document.querySelectorAll(selector).forEach(checkbox => {
+                checkbox.checked = toggle.checked;
+            });
+        });
+    });
+
+});
@@ -0,0 +1,48 @@
+//
+// Remote search for inputs carrying a `data-typeahead-url` attribute.
+// Results fill the input's <datalist>; with `data-typeahead-target` the
+// picked value is copied into the select of that name.
+//
+
+window.addEventListener('DOMContentLoaded', event => {
+
+    document.querySelectorAll('[data-typeahead-url]').forEach(input => {
+        const datalist = document.getElementById(input.getAttribute('list'));
+        let timer = null;
+
+        input.addEventListener('input', event => {
+            clearTimeout(timer);
+            timer = setTimeout(async () => {
+                const url = new URL(input.dataset.typeaheadUrl, window.location.origin);
+                url.searchParams.set('q', input.value);
+                const response = await fetch(url, { credentials: 'same-origin' });
+                if (!response.ok) {
+                    return;
+                }
+                const data = await response.json();
+                datalist.replaceChildren(...data.results.map(result => {
+                    const option = document.createElement('option');
+                    option.value = result.value;
+                    option.textContent = result.label;
+                    return option;
+                }));
+            }, 250);
+        });
+
+        const targetName = input.dataset.typeaheadTarget;
+        if (targetName) {
+            input.addEventListener('change', event => {
+                const select = input.form.querySelector(`select[name="${targetName}"]`);
+                const picked = Array.from(datalist.options).find(option => option.value === input.value);
+                if (!select || !picked) {
+                    return;
+                }
+                if (!Array.from(select.options).some(option => option.value === picked.value)) {
+                    select.add(new Option(picked.textContent, picked.value));
+                }
+                select.value = picked.value;
+            });
+        }
+    });
+
+});
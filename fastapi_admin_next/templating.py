@@ -0,0 +1,120 @@
+import time
+from collections.abc import Hashable
+from typing import Any
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, PackageLoader
+from markupsafe import Markup
+from starlette.templating import _TemplateResponse
+
+from fastapi_admin_next.instrumentation import current_query_stats
+from fastapi_admin_next.jinja_filters import (
+    ceil_filter,
+    getattr_filter,
+    page_window_filter,
+)
+from fastapi_admin_next.metrics import metrics
+from fastapi_admin_next.slow_queries import slow_query_log
+
+# Rendered fragments kept by `FragmentCache`, per template and context
+MAX_FRAGMENTS = 256
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value  # type: ignore
+
+
+class FragmentCache:
+    """
+    Renders a template once per distinct context and serves the markup from
+    memory afterwards. Meant for fragments such as the sidebar that only
+    depend on a few hashable values; bypassed while templates auto-reload.
+    """
+
+    def __init__(self, env: Environment, maxsize: int = MAX_FRAGMENTS) -> None:
+        self.env = env
+        self.maxsize = maxsize
+        self._fragments: dict[Hashable, Markup] = {}
+
+    def render(self, template_name: str, **context: Any) -> Markup:
+        if self.env.auto_reload:
+            return Markup(self.env.get_template(template_name).render(context))
+        key = (template_name, _freeze(context))
+        fragment = self._fragments.get(key)
+        if fragment is None:
+            if len(self._fragments) >= self.maxsize:
+                self._fragments.clear()
+            fragment = Markup(self.env.get_template(template_name).render(context))
+            self._fragments[key] = fragment
+        return fragment
+
+    def clear(self) -> None:
+        self._fragments.clear()
+
+
+def create_environment(
+    auto_reload: bool = False, bytecode_cache: BytecodeCache | None = None
+) -> Environment:
+    """
+    The admin's Jinja environment, loading the templates shipped with the
+    package whatever the working directory.
+    """
+    env = Environment(
+        loader=PackageLoader("fastapi_admin_next", "templates"),
+        autoescape=True,
+        auto_reload=auto_reload,
+        bytecode_cache=bytecode_cache,
+    )
+    env.filters["getattr"] = getattr_filter
+    env.filters["ceil_filter"] = ceil_filter
+    env.filters["page_window"] = page_window_filter
+    env.globals["query_stats"] = current_query_stats
+    env.globals["slow_query_log"] = slow_query_log
+    return env
+
+
+class AdminTemplates(Jinja2Templates):
+    """
+    `Jinja2Templates` recording how long each template takes to render.
+    """
+
+    def TemplateResponse(  # pylint: disable=invalid-name
+        self, *args: Any, **kwargs: Any
+    ) -> _TemplateResponse:
+        start = time.perf_counter()
+        response = super().TemplateResponse(*args, **kwargs)
+        metrics.template_render_duration.observe(
+            time.perf_counter() - start, response.template.name
+        )
+        return response
+
+
+# Shared by every service, so templates are compiled once per process
+templates = AdminTemplates(env=create_environment())
+fragment_cache = FragmentCache(templates.env)
+templates.env.globals["cached_fragment"] = fragment_cache.render
+
+
+def configure_templates(
+    auto_reload: bool = False, bytecode_cache: BytecodeCache | None = None
+) -> int:
+    """
+    Set the shared environment up for serving and compile every admin
+    template ahead of the first request. Without `bytecode_cache`, compiled
+    templates are kept in Jinja's per-user directory under the system temp
+    directory, so restarted workers skip compiling. Returns how many
+    templates were compiled.
+    """
+    env = templates.env
+    env.auto_reload = auto_reload
+    env.bytecode_cache = bytecode_cache or FileSystemBytecodeCache()
+    env.cache.clear()  # type: ignore
+    fragment_cache.clear()
+    names = env.list_templates(filter_func=lambda name: name.endswith(".html"))
+    for name in names:
+        env.get_template(name)
+    return len(names)
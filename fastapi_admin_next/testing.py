@@ -0,0 +1,33 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from fastapi_admin_next.instrumentation import (
+    QueryStats,
+    collect_queries,
+    instrument_engine,
+)
+
+
+@contextmanager
+def assert_max_queries(limit: int, *engines: AsyncEngine) -> Iterator[QueryStats]:
+    """
+    Fail when the block runs more than `limit` statements on `engines` (or
+    on engines instrumented beforehand), so query count regressions of a
+    view break the test suite:
+
+        with assert_max_queries(3, engine):
+            await service.get_list_view(...)
+    """
+    for engine in engines:
+        instrument_engine(engine)
+    with collect_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        statements = "\n".join(
+            f"  {count}x {shape}" for shape, count in stats.shapes.most_common()
+        )
+        raise AssertionError(
+            f"Expected at most {limit} queries, {stats.count} ran:\n{statements}"
+        )
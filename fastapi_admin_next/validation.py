@@ -9,8 +9,13 @@ def generate_pydantic_model(
     db_model: Base,
     *,
     exclude: list[str] | None = None,
+    optional: bool = False,
 ) -> type[BaseModel]:
-    config = (ConfigDict(from_attributes=True),)
+    """
+    Build a pydantic model validating the mapped columns of `db_model`.
+    With `optional`, every field may be missing or None.
+    """
+    config = ConfigDict(from_attributes=True)
     if not exclude:
         exclude = ["id"]
     mapper = inspect(db_model)
@@ -29,7 +34,9 @@ def generate_pydantic_model(
                 python_type = column.type.python_type
             assert python_type, f"Could not infer python_type for {column}"
             default = None
-            if column.default is None and not column.nullable:
+            if optional:
+                python_type = python_type | None  # type: ignore
+            elif column.default is None and not column.nullable:
                 default = ...
             fields[name] = (python_type, default)
     pydantic_model: type[BaseModel] = create_model(
@@ -0,0 +1,43 @@
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from fastapi_admin_next.db_connect import Base
+
+from .utils import MockModel, RelatedModel
+
+
+@pytest.fixture
+async def sqlite_engine(tmp_path: Path) -> AsyncGenerator[AsyncEngine, None]:
+    """
+    A file backed SQLite database holding the test models: 3 related rows and
+    25 mock rows pointing at them in turn.
+    """
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/test.sqlite")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine) as session:
+        session.add_all(RelatedModel(id=i, name=f"related {i}") for i in range(1, 4))
+        session.add_all(
+            MockModel(
+                id=i,
+                name=f"name {i:02d}",
+                enum_field="option1" if i % 2 else "option2",
+                related_id=i % 3 + 1,
+            )
+            for i in range(1, 26)
+        )
+        await session.commit()
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def sqlite_session(
+    sqlite_engine: AsyncEngine,
+) -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSession(sqlite_engine, expire_on_commit=False) as session:
+        yield session
@@ -0,0 +1,70 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_admin_next.counting import CachedCount, CountResult, EstimatedCount
+from fastapi_admin_next.crud import CRUDGenerator
+from fastapi_admin_next.schemas import FilterOptions
+
+from .utils import MockModel
+
+
+@pytest.mark.asyncio
+async def test_cached_count_reuses_total() -> None:
+    mock_session = AsyncMock(spec=AsyncSession)
+    mock_session.scalar.return_value = 42
+    strategy = CachedCount(ttl=60)
+    query = select(MockModel).where(MockModel.name == "a")
+
+    first = await strategy.count(mock_session, MockModel, query, True)
+    second = await strategy.count(mock_session, MockModel, query, True)
+
+    assert first == second == CountResult(42)
+    mock_session.scalar.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_cached_count_keys_on_filter_values() -> None:
+    mock_session = AsyncMock(spec=AsyncSession)
+    mock_session.scalar.side_effect = [1, 2]
+    strategy = CachedCount(ttl=60)
+
+    first = await strategy.count(
+        mock_session, MockModel, select(MockModel).where(MockModel.name == "a"), True
+    )
+    second = await strategy.count(
+        mock_session, MockModel, select(MockModel).where(MockModel.name == "b"), True
+    )
+
+    assert (first.value, second.value) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_estimated_count_exact_below_threshold() -> None:
+    mock_session = AsyncMock(spec=AsyncSession)
+    mock_session.scalar.return_value = 5
+    strategy = EstimatedCount(exact_below=1000)
+    strategy._estimate = AsyncMock(return_value=7)  # type: ignore
+
+    result = await strategy.count(mock_session, MockModel, select(MockModel), False)
+
+    assert result == CountResult(5, estimated=False)
+
+
+@pytest.mark.asyncio
+async def test_paginate_reports_estimated_total() -> None:
+    mock_session = AsyncMock(spec=AsyncSession)
+    mock_query_result = MagicMock()
+    mock_query_result.scalars().all.return_value = [MockModel(id=1)]
+    mock_session.execute.return_value = mock_query_result
+    strategy = EstimatedCount()
+    strategy._estimate = AsyncMock(return_value=40_000_000)  # type: ignore
+    crud_generator = CRUDGenerator(MockModel, mock_session, count_strategy=strategy)
+
+    _, page_info = await crud_generator.paginate(FilterOptions(filters={}))
+
+    assert page_info.total == 40_000_000
+    assert page_info.total_is_estimate
+    mock_session.scalar.assert_not_called()
@@ -1,11 +1,17 @@
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from fastapi_admin_next.actions import CallableAction, DeleteSelected, SetField
 from fastapi_admin_next.crud import CRUDGenerator
+from fastapi_admin_next.exceptions import ValidationException
+from fastapi_admin_next.pagination import decode_cursor, encode_cursor
+from fastapi_admin_next.schemas import FilterOptions, QueryParams
 
-from .utils import MockModel, RelatedModel
+from .utils import MockModel, RelatedModel, VersionedModel
 
 
 @pytest.mark.asyncio
@@ -74,6 +80,8 @@ async def test_create() -> None:
     mock_session = AsyncMock(spec=AsyncSession)
     mock_session.commit = AsyncMock()
     mock_session.refresh = AsyncMock()
+    # Dialects without RETURNING read the new row back with a refresh
+    mock_session.connection.return_value.dialect.insert_returning = False
     crud_generator = CRUDGenerator(MockModel, mock_session)
     obj_data = {"id": 1}
     result = await crud_generator.create(mock_session, obj_data)
@@ -83,6 +91,46 @@ async def test_create() -> None:
     mock_session.refresh.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_create_and_update_use_returning(sqlite_session: AsyncSession) -> None:
+    crud = CRUDGenerator(MockModel, sqlite_session)
+
+    created = await crud.create(sqlite_session, {"name": "new", "related_id": 2})
+    assert (created.id, created.name, created.related_id) == (26, "new", 2)
+
+    updated = await crud.update_returning(26, {"name": "renamed"}, {"name": "new"})
+    assert updated is not None and updated.name == "renamed"
+
+    # The expected value no longer matches, nothing is overwritten
+    assert await crud.update_returning(26, {"name": "lost"}, {"name": "new"}) is None
+    stored = await sqlite_session.scalar(
+        select(MockModel.name).where(MockModel.id == 26)
+    )
+    assert stored == "renamed"
+
+
+@pytest.mark.asyncio
+async def test_create_versioned_model_then_update(sqlite_session: AsyncSession) -> None:
+    crud = CRUDGenerator(VersionedModel, sqlite_session)
+
+    created = await crud.create(sqlite_session, {"title": "draft"})
+    assert created.version == 1
+
+    bump = {"title": "final", "version": VersionedModel.version + 1}
+    updated = await crud.update_returning(created.id, bump, {"version": 1})
+    assert updated is not None and (updated.title, updated.version) == ("final", 2)
+
+    # A save based on the first version conflicts
+    stale = {"title": "lost", "version": VersionedModel.version + 1}
+    assert await crud.update_returning(created.id, stale, {"version": 1}) is None
+    stored = (
+        await sqlite_session.execute(
+            select(VersionedModel.title, VersionedModel.version)
+        )
+    ).one()
+    assert tuple(stored) == ("final", 2)
+
+
 @pytest.mark.asyncio
 async def test_update() -> None:
     mock_session = AsyncMock(spec=AsyncSession)
@@ -115,3 +163,226 @@ async def test_paginate_filter() -> None:
     result, total = await crud_generator.paginate_filter(filter_options)
     assert len(result) == 1, "Should return one filtered result"
     assert total == 1, "Should return the total count"
+
+
+@pytest.mark.asyncio
+async def test_paginate_keyset() -> None:
+    mock_session = AsyncMock(spec=AsyncSession)
+    mock_query_result = MagicMock()
+    mock_query_result.scalars().all.return_value = [
+        MockModel(id=1),
+        MockModel(id=2),
+        MockModel(id=3),
+    ]
+    mock_session.execute.return_value = mock_query_result
+    mock_session.scalar.return_value = 3
+    crud_generator = CRUDGenerator(MockModel, mock_session)
+    filter_options = FilterOptions(
+        filters={},
+        query_params=QueryParams(page_size=2),  # type: ignore
+        pagination="keyset",
+    )
+    rows, page_info = await crud_generator.paginate(filter_options)
+    assert [row.id for row in rows] == [1, 2]
+    assert page_info.total == 3
+    assert page_info.prev_cursor is None
+    assert page_info.next_cursor is not None
+    query = str(mock_session.execute.call_args.args[0])
+    assert "OFFSET" not in query, "Keyset pagination should not skip rows"
+
+
+@pytest.mark.asyncio
+async def test_paginate_keyset_rejects_unknown_and_nullable_sort_fields() -> None:
+    crud_generator = CRUDGenerator(MockModel, AsyncMock(spec=AsyncSession))
+
+    for sorting, error in (
+        ({"missing": "asc"}, KeyError),
+        ({"id": "drop"}, KeyError),
+        ({"name": "asc"}, ValueError),  # NULL names would never be reached
+    ):
+        with pytest.raises(error):
+            await crud_generator.paginate(
+                FilterOptions(
+                    filters={},
+                    query_params=QueryParams(sorting=sorting),  # type: ignore
+                    pagination="keyset",
+                )
+            )
+
+
+@pytest.mark.asyncio
+async def test_paginate_keyset_with_cursor() -> None:
+    mock_session = AsyncMock(spec=AsyncSession)
+    mock_query_result = MagicMock()
+    mock_query_result.scalars().all.return_value = [MockModel(id=3)]
+    mock_session.execute.return_value = mock_query_result
+    mock_session.scalar.return_value = 3
+    crud_generator = CRUDGenerator(MockModel, mock_session)
+    filter_options = FilterOptions(
+        filters={},
+        query_params=QueryParams(  # type: ignore
+            page_size=2, cursor=encode_cursor([2])
+        ),
+        pagination="keyset",
+    )
+    rows, page_info = await crud_generator.paginate(filter_options)
+    assert [row.id for row in rows] == [3]
+    assert page_info.next_cursor is None
+    assert page_info.prev_cursor is not None
+    query = mock_session.execute.call_args.args[0]
+    assert "(mock_model.id) > (:param_1)" in str(query)
+    assert query.compile().params["param_1"] == 2
+
+
+def test_decode_cursor_rejects_garbage() -> None:
+    with pytest.raises(ValidationException):
+        decode_cursor("not-a-cursor", [MockModel.id])  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_paginate_projected_columns() -> None:
+    mock_session = AsyncMock(spec=AsyncSession)
+    mock_query_result = MagicMock()
+    mock_query_result.all.return_value = [(1, "name")]
+    mock_session.execute.return_value = mock_query_result
+    mock_session.scalar.return_value = 1
+    crud_generator = CRUDGenerator(MockModel, mock_session)
+    rows, _ = await crud_generator.paginate(
+        FilterOptions(filters={}), only=("id", "name")
+    )
+    assert rows == [(1, "name")]
+    query = str(mock_session.execute.call_args.args[0])
+    assert "mock_model.name" in query
+    assert "enum_field" not in query, "Only requested columns should be selected"
+    mock_query_result.scalars.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("execution", ["sequential", "window", "concurrent"])
+async def test_paginate_count_executions(
+    sqlite_session: AsyncSession, execution: str
+) -> None:
+    crud = CRUDGenerator(MockModel, sqlite_session)
+
+    async def page(number: int, only: tuple[str, ...] | None = None) -> Any:
+        return await crud.paginate(
+            FilterOptions(
+                filters={"enum_field": "option1"},
+                query_params=QueryParams(page=number, sorting={"id": "asc"}),
+                count_execution=execution,
+            ),
+            only=only,
+        )
+
+    rows, page_info = await page(1)
+    assert [row.id for row in rows] == [1, 3, 5, 7, 9, 11, 13, 15, 17, 19]
+    assert page_info.total == 13
+    assert page_info.count_execution == execution
+
+    rows, page_info = await page(2, only=("id", "name"))
+    assert [row.name for row in rows] == ["name 21", "name 23", "name 25"]
+    assert page_info.total == 13
+
+    # Past the last page the window has no row to carry the total
+    rows, page_info = await page(5)
+    assert rows == []
+    assert page_info.total == 13
+
+
+@pytest.mark.asyncio
+async def test_relation_paths_filter_and_search_with_exists(
+    sqlite_session: AsyncSession,
+) -> None:
+    crud = CRUDGenerator(MockModel, sqlite_session)
+
+    (condition,) = crud._build_filters(  # pylint: disable=protected-access
+        {"related__name__istartswith": "related 2"}
+    )
+    sql = str(select(MockModel.id).where(condition))
+    assert "EXISTS" in sql and "JOIN" not in sql
+
+    rows, page_info = await crud.paginate(
+        FilterOptions(
+            filters={"related__name": "related 2"},
+            query_params=QueryParams(
+                page_size=100,
+                search="name 1",
+                search_fields=["related__name", "name"],
+            ),
+        )
+    )
+    assert [row.id for row in rows] == [10, 13, 16, 19]
+    assert page_info.total == 4
+
+    # Searching a related field alone matches through the relationship
+    rows, _ = await crud.paginate(
+        FilterOptions(
+            filters={},
+            query_params=QueryParams(
+                page_size=100, search="related 3", search_fields=["related__name"]
+            ),
+        )
+    )
+    assert {row.related_id for row in rows} == {3}
+
+    with pytest.raises(KeyError):
+        crud._build_filters({"related__missing": 1})  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_run_action_chunks_ids_or_uses_filters(
+    sqlite_session: AsyncSession,
+) -> None:
+    crud = CRUDGenerator(MockModel, sqlite_session)
+
+    result = await crud.run_action(
+        SetField("enum_field", "option2"), ids=list(range(1, 12)), chunk_size=5
+    )
+    assert (result.rowcount, result.statements) == (11, 3)
+
+    # Every row matching the filters, without selecting their keys first
+    result = await crud.run_action(
+        DeleteSelected(),
+        filter_options=FilterOptions(filters={"enum_field": "option1"}),
+    )
+    assert (result.rowcount, result.statements) == (7, 1)
+    remaining = await sqlite_session.scalar(select(func.count()).select_from(MockModel))
+    assert remaining == 18
+
+
+@pytest.mark.asyncio
+async def test_run_action_refuses_unconfirmed_unfiltered_delete(
+    sqlite_session: AsyncSession,
+) -> None:
+    crud = CRUDGenerator(MockModel, sqlite_session)
+
+    with pytest.raises(ValidationException):
+        await crud.run_action(DeleteSelected())
+    assert await sqlite_session.scalar(select(func.count()).select_from(MockModel))
+
+    result = await crud.run_action(DeleteSelected(), confirm_all=True)
+    assert result.rowcount == 25
+
+
+@pytest.mark.asyncio
+async def test_run_action_rolls_back_every_chunk_on_error(
+    sqlite_session: AsyncSession,
+) -> None:
+    crud = CRUDGenerator(MockModel, sqlite_session)
+    calls = 0
+
+    async def rename_then_fail(crud: CRUDGenerator[Any], condition: Any) -> int:
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise RuntimeError("boom")
+        return await crud.update_where(condition, {"name": "renamed"})
+
+    with pytest.raises(RuntimeError):
+        await crud.run_action(
+            CallableAction("rename", rename_then_fail), ids=[1, 2, 3], chunk_size=2
+        )
+    renamed = await sqlite_session.scalar(
+        select(func.count()).where(MockModel.name == "renamed")
+    )
+    assert renamed == 0
@@ -0,0 +1,132 @@
+from typing import Any
+
+import pytest
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from fastapi_admin_next.configs import EngineProfile
+from fastapi_admin_next.db_connect import DBConnector
+
+
+def test_engine_profile_only_passes_configured_options() -> None:
+    kwargs = EngineProfile(
+        pool_size=5, statement_cache_size=100, connect_args={"timeout": 3}
+    ).engine_kwargs()
+
+    assert kwargs == {
+        "echo": False,
+        "pool_pre_ping": False,
+        "pool_recycle": -1,
+        "pool_size": 5,
+        "query_cache_size": 100,
+        "connect_args": {"timeout": 3},
+    }
+
+
+def test_register_db_needs_a_url_or_an_engine() -> None:
+    with pytest.raises(ValueError):
+        DBConnector.register_db()
+
+
+@pytest.mark.asyncio
+async def test_shared_engine_and_pool_stats(tmp_path) -> None:  # type: ignore
+    pytest.importorskip("aiosqlite")
+
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path}/db.sqlite", poolclass=AsyncAdaptedQueuePool
+    )
+    DBConnector.register_db(engine=engine)
+
+    async with DBConnector.get_db() as session:
+        # Nothing is checked out until the first statement
+        assert DBConnector.pool_stats().checked_out == 0
+        assert await session.scalar(text("SELECT 1")) == 1
+        assert DBConnector.pool_stats().checked_out == 1
+        assert DBConnector._monitor is not None
+        assert DBConnector._monitor.in_use == 1
+
+    stats = DBConnector.pool_stats()
+    assert stats.acquisitions == 1
+    assert stats.checked_out == 0
+    assert stats.wait_time_max >= 0
+
+    # Registering the engine again does not count its checkouts twice
+    DBConnector.register_db(engine=engine)
+    async with DBConnector.session_factory(engine)() as session:
+        await session.scalar(text("SELECT 1"))
+    assert DBConnector.pool_stats().acquisitions == 2
+
+    # The host application owns the engine, the admin leaves it open
+    await DBConnector.dispose()
+    async with engine.connect() as connection:
+        assert await connection.scalar(text("SELECT 1")) == 1
+    await engine.dispose()
+
+
+async def _create_sqlite(path: str, label: str) -> AsyncEngine:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as connection:
+        await connection.execute(text("CREATE TABLE node (label TEXT)"))
+        await connection.execute(
+            text("INSERT INTO node VALUES (:label)"), {"label": label}
+        )
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replicas_until_a_write(tmp_path) -> None:  # type: ignore
+    pytest.importorskip("aiosqlite")
+    primary = await _create_sqlite(f"{tmp_path}/primary.sqlite", "primary")
+    replicas = [
+        await _create_sqlite(f"{tmp_path}/replica{i}.sqlite", f"replica{i}")
+        for i in range(2)
+    ]
+    DBConnector.register_db(engine=primary)
+    DBConnector.register_replicas(replicas)
+
+    async def read_label(request: Any) -> str:
+        async for session in DBConnector.read_dependency()(request):
+            return str(await session.scalar(text("SELECT label FROM node")))
+        raise AssertionError
+
+    request = Request({"type": "http", "session": {}})
+    assert [await read_label(request) for _ in range(3)] == [
+        "replica0",
+        "replica1",
+        "replica0",
+    ]
+
+    # The client that just wrote reads its own write from the primary
+    DBConnector.mark_write(request)
+    assert await read_label(request) == "primary"
+    async with DBConnector.get_db() as session:
+        assert await session.scalar(text("SELECT label FROM node")) == "primary"
+
+    DBConnector.register_replicas([])
+    for engine in (primary, *replicas):
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_least_loaded_replica_selection(tmp_path) -> None:  # type: ignore
+    pytest.importorskip("aiosqlite")
+    primary = await _create_sqlite(f"{tmp_path}/primary.sqlite", "primary")
+    replicas = [
+        await _create_sqlite(f"{tmp_path}/replica{i}.sqlite", f"replica{i}")
+        for i in range(2)
+    ]
+    DBConnector.register_db(engine=primary)
+    DBConnector.register_replicas(replicas, selection="least_loaded")
+
+    async with DBConnector.get_read_db() as busy:
+        busy_label = await busy.scalar(text("SELECT label FROM node"))
+        for _ in range(2):
+            async with DBConnector.get_read_db() as session:
+                label = await session.scalar(text("SELECT label FROM node"))
+                assert label != busy_label
+
+    DBConnector.register_replicas([])
+    for engine in (primary, *replicas):
+        await engine.dispose()
@@ -0,0 +1,62 @@
+import json
+from enum import Enum
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_admin_next.crud import CRUDGenerator
+from fastapi_admin_next.export import CSV, NDJSON, encode_rows, export_stream
+from fastapi_admin_next.schemas import FilterOptions, QueryParams
+
+from .utils import MockModel
+
+
+class Color(Enum):
+    RED = "red"
+
+
+def test_encode_rows() -> None:
+    rows = [(1, "a,b", None), (2, "c", Color.RED)]
+
+    assert encode_rows(["id", "name", "color"], rows, CSV) == (
+        '1,"a,b",\r\n2,c,red\r\n'
+    )
+    records = encode_rows(["id", "name", "color"], rows, NDJSON).splitlines()
+    assert [json.loads(record) for record in records] == [
+        {"id": 1, "name": "a,b", "color": None},
+        {"id": 2, "name": "c", "color": "red"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_streams_filtered_rows_in_partitions(
+    sqlite_session: AsyncSession,
+) -> None:
+    crud = CRUDGenerator(MockModel, sqlite_session)
+    filter_options = FilterOptions(
+        filters={"enum_field": "option1"},
+        query_params=QueryParams(search="name 1", search_fields=["name"]),
+    )
+
+    partitions = [
+        list(partition)
+        async for partition in crud.stream(filter_options, ["id", "name"], yield_per=2)
+    ]
+    assert [len(partition) for partition in partitions] == [2, 2, 1]
+
+    chunks = [
+        chunk
+        async for chunk in export_stream(
+            ["id", "name"],
+            crud.stream(filter_options, ["id", "name"], yield_per=2),
+            CSV,
+        )
+    ]
+    assert "".join(chunks).splitlines() == [
+        "id,name",
+        "11,name 11",
+        "13,name 13",
+        "15,name 15",
+        "17,name 17",
+        "19,name 19",
+    ]
@@ -0,0 +1,147 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import String, cast, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_admin_next.filter_options import (
+    FilterOptionsEngine,
+    RelatedLabelLoader,
+    fetch_related_labels,
+    search_related,
+)
+from fastapi_admin_next.model_admin import ModelAdmin
+
+from .utils import MockModel, RelatedModel
+
+
+def _session_returning(values: list[object]) -> AsyncMock:
+    mock_session = AsyncMock(spec=AsyncSession)
+    mock_query_result = MagicMock()
+    mock_query_result.scalars().all.return_value = values
+    mock_session.execute.return_value = mock_query_result
+    return mock_session
+
+
+@pytest.mark.asyncio
+async def test_options_are_cached_until_invalidated() -> None:
+    mock_session = _session_returning([RelatedModel(id=1)])
+    engine = FilterOptionsEngine()
+
+    first = await engine.get_options(MockModel, "related_id", mock_session)
+    second = await engine.get_options(MockModel, "related_id", mock_session)
+    assert first.options == [{"value": 1, "label": "RelatedModel"}]
+    assert second == first
+    mock_session.execute.assert_called_once()
+
+    # Writing to the related table drops the cached options
+    engine.invalidate(RelatedModel)
+    await engine.get_options(MockModel, "related_id", mock_session)
+    assert mock_session.execute.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_large_fields_switch_to_typeahead() -> None:
+    mock_session = _session_returning(["a", "b", "c"])
+    engine = FilterOptionsEngine(typeahead_threshold=2)
+
+    result = await engine.get_options(MockModel, "name", mock_session)
+
+    assert result.remote
+    assert not result.options
+    query = str(mock_session.execute.call_args.args[0])
+    assert "LIMIT" in query, "Probing cardinality should be bounded"
+
+
+@pytest.mark.asyncio
+async def test_top_n_groups_by_frequency() -> None:
+    mock_session = _session_returning(["a", "b", "c"])
+    engine = FilterOptionsEngine()
+
+    result = await engine.get_options(MockModel, "name", mock_session, top_n=2)
+
+    assert [option["value"] for option in result.options] == ["a", "b"]
+    assert result.remote
+    query = str(mock_session.execute.call_args.args[0])
+    assert "GROUP BY mock_model.name" in query
+    assert "count(*) DESC" in query
+
+
+@pytest.mark.asyncio
+async def test_enum_options_skip_database() -> None:
+    mock_session = AsyncMock(spec=AsyncSession)
+    engine = FilterOptionsEngine()
+
+    result = await engine.get_options(MockModel, "enum_field", mock_session)
+
+    assert [option["value"] for option in result.options] == ["option1", "option2"]
+    mock_session.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_relation_path_lists_related_values() -> None:
+    mock_session = _session_returning(["related 1", "related 2"])
+    engine = FilterOptionsEngine()
+
+    field_options = await engine.get_options(MockModel, "related__name", mock_session)
+    assert field_options.options == [
+        {"value": "related 1", "label": "related 1"},
+        {"value": "related 2", "label": "related 2"},
+    ]
+    assert "related_model.name" in str(mock_session.execute.call_args.args[0])
+
+    # Writes to the related table drop the cached values
+    engine.invalidate(RelatedModel)
+    await engine.get_options(MockModel, "related__name", mock_session)
+    assert mock_session.execute.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_related_label_loader_batches_and_memoizes(
+    sqlite_session: AsyncSession,
+) -> None:
+    rows = (
+        await sqlite_session.execute(select(MockModel.id, MockModel.related_id))
+    ).all()
+    relations = ModelAdmin(MockModel).list_relations
+    loader = RelatedLabelLoader(sqlite_session, lambda model: RelatedModel.name)
+
+    statements: list[str] = []
+    execute = sqlite_session.execute
+
+    async def counting_execute(
+        statement: object, *args: object, **kwargs: object
+    ) -> object:
+        statements.append(str(statement))
+        return await execute(statement, *args, **kwargs)  # type: ignore
+
+    sqlite_session.execute = counting_execute  # type: ignore
+    related_labels = await loader.resolve(rows, relations)
+    assert related_labels == {
+        "related_id": {1: "related 1", 2: "related 2", 3: "related 3"}
+    }
+    assert len(statements) == 1
+    assert "IN" in statements[0] and "related_model.name" in statements[0]
+
+    # Labels already loaded during the request are not queried again
+    await loader.resolve(rows[:5], relations)
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_label_expressions_select_pk_and_label_only(
+    sqlite_session: AsyncSession,
+) -> None:
+    label = ModelAdmin(
+        RelatedModel,
+        label_field="#" + cast(RelatedModel.id, String) + " " + RelatedModel.name,
+    ).label_column
+
+    labels = await fetch_related_labels(RelatedModel, sqlite_session, [1, 3], label)
+    assert labels == {1: "#1 related 1", 3: "#3 related 3"}
+
+    # Without search fields, typeahead matches the label expression
+    options = await search_related(
+        RelatedModel, sqlite_session, "#2", label_column=label
+    )
+    assert options == [{"value": 2, "label": "#2 related 2"}]
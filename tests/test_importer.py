@@ -0,0 +1,82 @@
+import io
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_admin_next.export import CSV, NDJSON
+from fastapi_admin_next.importer import BulkImporter, parse_rows
+from fastapi_admin_next.validation import generate_pydantic_model
+
+from .utils import MockModel
+
+
+def test_parse_rows_reports_malformed_rows() -> None:
+    csv_rows = list(parse_rows(io.StringIO("name,related_id\na,1\nb,\nc,1,2\n"), CSV))
+    assert csv_rows == [
+        (1, {"name": "a", "related_id": "1"}),
+        (2, {"name": "b"}),
+        (3, "Row has more fields than the header"),
+    ]
+
+    ndjson_rows = list(parse_rows(io.StringIO('{"name": "a"}\n\n[1]\n{oops\n'), NDJSON))
+    assert ndjson_rows[0] == (1, {"name": "a"})
+    assert ndjson_rows[1] == (3, "Expected a JSON object")
+    assert ndjson_rows[2][0] == 4 and "Invalid JSON" in str(ndjson_rows[2][1])
+
+
+@pytest.mark.asyncio
+async def test_import_validates_chunks_and_keeps_good_rows(
+    sqlite_session: AsyncSession,
+) -> None:
+    importer = BulkImporter(sqlite_session, MockModel, generate_pydantic_model(MockModel))  # type: ignore
+    file = io.StringIO(
+        "name,enum_field,related_id\n"
+        "new 1,option1,1\n"
+        "new 2,wrong,x\n"
+        "new 3,option2,2\n"
+        "new 4,option2,\n"
+        "new 5,option1,3\n"
+    )
+
+    result = await importer.import_file(file, CSV, chunk_size=2)
+
+    assert (result.imported, result.failed, result.chunks) == (4, 1, 3)
+    assert result.errors == [
+        {
+            "row": 2,
+            "errors": {
+                "related_id": "Input should be a valid integer, unable to parse string as an integer"
+            },
+        }
+    ]
+    total = await sqlite_session.scalar(select(func.count()).select_from(MockModel))
+    assert total == 29
+
+
+@pytest.mark.asyncio
+async def test_import_upserts_on_natural_key(sqlite_session: AsyncSession) -> None:
+    importer = BulkImporter(
+        sqlite_session,
+        MockModel,
+        generate_pydantic_model(MockModel),  # type: ignore
+        upsert_on=["id"],
+    )
+    file = io.StringIO(
+        '{"id": 1, "name": "updated", "related_id": 3}\n'
+        '{"id": 100, "name": "inserted", "related_id": 1}\n'
+    )
+
+    result = await importer.import_file(file, NDJSON)
+
+    assert (result.imported, result.failed) == (2, 0)
+    rows = await sqlite_session.execute(
+        select(MockModel.id, MockModel.name, MockModel.enum_field)
+        .where(MockModel.id.in_([1, 100]))
+        .order_by(MockModel.id)
+    )
+    # Columns missing from the file keep their stored value
+    assert [tuple(row) for row in rows] == [
+        (1, "updated", "option1"),
+        (100, "inserted", None),
+    ]
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from fastapi_admin_next.index_advisor import advise
+from fastapi_admin_next.registry import ModelRegistry
+
+from .utils import MockModel, RelatedModel
+
+
+@pytest.mark.asyncio
+async def test_advice_flags_unindexed_fields_until_their_ddl_ran(
+    sqlite_engine: AsyncEngine,
+) -> None:
+    registry = ModelRegistry()
+    registry.register(
+        MockModel,
+        filter_fields=["enum_field"],
+        search_fields=["name"],
+        display_fields=["id", "name"],
+    )
+    registry.register(RelatedModel, filter_fields=["related_models__name"])
+
+    async with sqlite_engine.connect() as connection:
+        advice = await advise(connection, registry)
+    by_column = {
+        (item.table, item.column): item for item in advice if item.reasons != ["search"]
+    }
+
+    assert by_column["mock_model", "enum_field"].reasons == ["filter"]
+    assert by_column["mock_model", "related_id"].reasons == ["foreign_key"]
+    # Filtering related models through a collection reaches the child's column
+    assert by_column["mock_model", "name"].reasons == ["sort", "filter"]
+    assert ("mock_model", "id") not in by_column
+    search = next(item for item in advice if item.reasons == ["search"])
+    assert search.ddl["postgresql"][1].endswith(
+        "ON mock_model USING gin (name gin_trgm_ops)"
+    )
+    assert search.ddl["sqlite"][0].startswith(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS mock_model_fts"
+    )
+
+    async with sqlite_engine.begin() as connection:
+        for item in advice:
+            for statement in item.ddl["sqlite"]:
+                await connection.exec_driver_sql(statement)
+        # Once created the indexes are found; ILIKE still can't use them
+        assert [item.reasons for item in await advise(connection, registry)] == [
+            ["search"]
+        ]
+
+
+@pytest.mark.asyncio
+async def test_advice_skips_columns_the_list_view_cannot_sort_on(
+    sqlite_engine: AsyncEngine,
+) -> None:
+    registry = ModelRegistry()
+    # Keyset pages don't sort on nullable columns, name is only displayed
+    registry.register(MockModel, display_fields=["id", "name"], pagination="keyset")
+
+    async with sqlite_engine.connect() as connection:
+        advice = await advise(connection, registry)
+
+    assert [(item.column, item.reasons) for item in advice] == [
+        ("related_id", ["foreign_key"])
+    ]
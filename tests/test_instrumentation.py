@@ -0,0 +1,72 @@
+from typing import Any
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from starlette.types import Receive, Scope, Send
+
+from fastapi_admin_next.instrumentation import (
+    collect_queries,
+    current_query_stats,
+    statement_shape,
+)
+from fastapi_admin_next.middleware import QueryInstrumentationMiddleware
+from fastapi_admin_next.testing import assert_max_queries
+
+from .test_middleware import call
+from .utils import MockModel
+
+
+def test_statement_shape_folds_placeholder_lists() -> None:
+    assert statement_shape("SELECT *\n  FROM t WHERE id IN (?, ?, ?)") == (
+        "SELECT * FROM t WHERE id IN (...)"
+    )
+    assert statement_shape("SELECT * FROM t WHERE id IN (%(id_1)s)") == (
+        "SELECT * FROM t WHERE id IN (...)"
+    )
+
+
+@pytest.mark.asyncio
+async def test_assert_max_queries_counts_repeated_statements(
+    sqlite_engine: AsyncEngine,
+) -> None:
+    async with AsyncSession(sqlite_engine) as session:
+        with assert_max_queries(3, sqlite_engine) as stats:
+            for pk in (1, 2, 3):
+                await session.execute(select(MockModel).where(MockModel.id == pk))
+        assert stats.count == 3
+        assert stats.duration > 0
+        [(shape, count)] = stats.repeated()
+        assert count == 3 and shape.startswith("SELECT")
+
+        with pytest.raises(AssertionError, match="at most 1 queries, 2 ran"):
+            with assert_max_queries(1):
+                await session.execute(select(MockModel.id))
+                await session.execute(select(MockModel.name))
+
+        # Only statements run inside a collector are recorded
+        await session.execute(select(MockModel.id))
+        assert stats.count == 3 and current_query_stats() is None
+
+
+@pytest.mark.asyncio
+async def test_middleware_reports_queries_in_server_timing(
+    sqlite_engine: AsyncEngine,
+) -> None:
+    async def view(scope: Scope, receive: Receive, send: Send) -> None:
+        async with AsyncSession(sqlite_engine) as session:
+            await session.execute(select(MockModel.id))
+            await session.execute(select(MockModel.name))
+        stats: Any = current_query_stats()
+        body = f"{stats.count} queries".encode()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": body})
+
+    with collect_queries() as outer, assert_max_queries(2, sqlite_engine):
+        messages = await call(QueryInstrumentationMiddleware(view))
+
+    headers = dict(messages[0]["headers"])
+    assert headers[b"server-timing"].startswith(b"db;dur=")
+    assert b'desc="2 queries", total;dur=' in headers[b"server-timing"]
+    assert messages[1]["body"] == b"2 queries"
+    assert outer.count == 2
@@ -0,0 +1,59 @@
+import pytest
+from starlette.types import Receive, Scope, Send
+
+from fastapi_admin_next.instrumentation import QueryStats, current_query_stats
+from fastapi_admin_next.metrics import AdminMetrics, Histogram
+from fastapi_admin_next.middleware import MetricsMiddleware
+
+from .test_middleware import call
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    histogram = Histogram("latency_seconds", "Latency.", ("view",), (0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, 'list "view"')
+
+    assert histogram.render() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{view="list \\"view\\"",le="0.1"} 2',
+        'latency_seconds_bucket{view="list \\"view\\"",le="1.0"} 3',
+        'latency_seconds_bucket{view="list \\"view\\"",le="+Inf"} 4',
+        'latency_seconds_sum{view="list \\"view\\""} 3.65',
+        'latency_seconds_count{view="list \\"view\\""} 4',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_metrics_middleware_labels_requests_by_view_and_model() -> None:
+    async def list_view(scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def router(scope: Scope, receive: Receive, send: Send) -> None:
+        # What Starlette's router adds to the scope of a matched route
+        scope["endpoint"] = list_view
+        scope["path_params"] = {"model_name": "unregistered"}
+        await list_view(scope, receive, send)
+
+    admin_metrics = AdminMetrics()
+    await call(MetricsMiddleware(router, admin_metrics))
+
+    text = admin_metrics.render()
+    assert 'admin_request_duration_seconds_count{view="list_view",model=""} 1' in text
+    assert 'admin_db_duration_seconds_sum{view="list_view"} 0.0' in text
+    assert "admin_password_hash_pending 0" in text
+
+
+@pytest.mark.asyncio
+async def test_metrics_middleware_keeps_query_footer_hidden() -> None:
+    footer_stats: list[QueryStats | None] = []
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        footer_stats.append(current_query_stats())
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    await call(MetricsMiddleware(app, AdminMetrics()))
+
+    assert footer_stats == [None]
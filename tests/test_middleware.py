@@ -0,0 +1,90 @@
+from typing import Any
+
+import pytest
+from starlette.authentication import AuthCredentials, SimpleUser
+from starlette.types import Message, Receive, Scope, Send
+
+from fastapi_admin_next.error import LoginRequiredException
+from fastapi_admin_next.middleware import (
+    AdminStackMiddleware,
+    ExceptionRedirectMiddleware,
+)
+
+
+class StubBackend:
+    async def authenticate(self, conn: Any) -> tuple[AuthCredentials, SimpleUser]:
+        return AuthCredentials(["authenticated"]), SimpleUser("1")
+
+
+async def call(
+    app: Any, path: str = "/", headers: list[Any] | None = None
+) -> list[Message]:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers or [],
+    }
+    messages: list[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages
+
+
+async def login_required(scope: Scope, receive: Receive, send: Send) -> None:
+    raise LoginRequiredException()
+
+
+async def streaming(scope: Scope, receive: Receive, send: Send) -> None:
+    scope["session"]["seen"] = True
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    for chunk in (b"a", b"b"):
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+@pytest.mark.asyncio
+async def test_exception_redirect_middleware_redirects_to_login() -> None:
+    messages = await call(ExceptionRedirectMiddleware(login_required))
+
+    assert messages[0]["status"] == 303
+    assert (b"location", b"/admin/auth/login/") in messages[0]["headers"]
+
+
+@pytest.mark.asyncio
+async def test_admin_stack_streams_and_persists_session() -> None:
+    middleware = AdminStackMiddleware(streaming, secret_key="s", backend=StubBackend())  # type: ignore
+
+    messages = await call(middleware)
+    # Every chunk is forwarded as it is sent, nothing is buffered
+    assert [m.get("body") for m in messages[1:]] == [b"a", b"b", b""]
+    cookie = dict(messages[0]["headers"])[b"set-cookie"].split(b";")[0]
+
+    scopes: list[Scope] = []
+
+    async def capture(scope: Scope, receive: Receive, send: Send) -> None:
+        scopes.append(scope)
+
+    middleware.app = capture
+    await call(middleware, headers=[(b"cookie", cookie)])
+    assert scopes[0]["session"] == {"seen": True}
+    assert scopes[0]["user"].is_authenticated
+
+    await call(middleware, path="/static/app.js", headers=[(b"cookie", cookie)])
+    assert "session" not in scopes[1] and "user" not in scopes[1]
+
+
+@pytest.mark.asyncio
+async def test_admin_stack_redirects_to_login() -> None:
+    middleware = AdminStackMiddleware(login_required, secret_key="s", backend=StubBackend())  # type: ignore
+
+    messages = await call(middleware)
+    assert messages[0]["status"] == 303
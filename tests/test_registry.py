@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.orm import DeclarativeBase
+
+from fastapi_admin_next.model_admin import ModelAdmin, RelationInfo
+from fastapi_admin_next.registry import ModelRegistry
+
+from .utils import MockModel, RelatedModel
+
+
+def test_register_compiles_model_admin() -> None:
+    registry = ModelRegistry()
+    registry.register(MockModel, filter_fields=["enum_field"], display_fields=["name"])
+
+    admin = registry.get_admin(MockModel)
+    assert admin.url_name == "mockmodel"
+    assert admin.primary_key == ("id",)
+    assert admin.form_columns == ("name", "enum_field", "related_id")
+    assert admin.relations == (RelationInfo("related", "related_id", RelatedModel),)
+    assert admin.enum_fields["enum_field"] == ("option1", "option2")
+    assert admin.list_projection == ("id", "name", "related_id")
+    assert admin.list_relations == ()  # related_id is not displayed
+    assert registry.get_filter_fields(MockModel) == ("enum_field",)
+
+
+def test_get_model_by_name_ignores_case() -> None:
+    registry = ModelRegistry()
+    registry.register(MockModel)
+
+    assert registry.get_model_by_name("mockmodel") is MockModel
+    assert registry.get_model_by_name("MockModel") is MockModel
+    assert registry.get_model_by_name("missing") is None
+    assert registry.get_model_names() == ["MockModel"]
+
+
+def test_model_admin_is_immutable() -> None:
+    admin = ModelAdmin(MockModel)
+
+    with pytest.raises(AttributeError):
+        admin.name = "Other"  # type: ignore
+    with pytest.raises(TypeError):
+        admin.fk_to_rel_map["related_id"] = "other"  # type: ignore
+
+
+def test_snapshot_leaves_out_password_columns() -> None:
+    class AccountBase(DeclarativeBase):
+        pass
+
+    class Account(AccountBase):
+        __tablename__ = "account"
+        id = Column(Integer, primary_key=True)
+        email = Column(String, nullable=False)
+        hashed_password = Column(String, nullable=False)
+
+    admin = ModelAdmin(Account)  # type: ignore
+    row = Account(id=1, email="a@example.com", hashed_password="$2b$12$hash")
+
+    assert admin.secret_columns == {"hashed_password"}
+    encoded = admin.encode_snapshot(row)
+    assert json.loads(encoded) == {"email": "a@example.com"}
+    assert admin.decode_snapshot(encoded) == {"email": "a@example.com"}
+
+
+def test_keyset_admins_only_sort_on_non_nullable_columns() -> None:
+    assert ModelAdmin(MockModel).sortable_fields == (
+        "id",
+        "name",
+        "enum_field",
+        "related_id",
+    )
+    assert ModelAdmin(MockModel, pagination="keyset").sortable_fields == ("id",)
@@ -0,0 +1,86 @@
+from typing import Any
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from fastapi_admin_next.crud import CRUDGenerator
+from fastapi_admin_next.schemas import FilterOptions, QueryParams
+from fastapi_admin_next.search import PostgresFullTextSearch, SQLiteFTS5Search
+
+from .utils import MockModel
+
+
+def test_postgres_condition_matches_the_indexed_expression() -> None:
+    backend = PostgresFullTextSearch()
+
+    condition = backend.condition(MockModel, ["name", "enum_field"], "foo b:r")
+    compiled = str(
+        select(MockModel.id)
+        .where(condition)  # type: ignore
+        .compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    )
+    assert "to_tsquery('simple'::regconfig, 'foo:* & b:* & r:*')" in compiled
+
+    (index,) = backend.ddl(MockModel, ["name", "enum_field"])
+    expression = (
+        "to_tsvector('simple'::regconfig, coalesce(name, '') || ' ' || "
+        "coalesce(enum_field, ''))"
+    )
+    assert expression in index
+    assert expression in compiled.replace("mock_model.", "")
+
+
+@pytest.mark.asyncio
+async def test_sqlite_fts5_search_is_ranked_and_kept_in_sync(
+    sqlite_engine: AsyncEngine, sqlite_session: AsyncSession
+) -> None:
+    backend = SQLiteFTS5Search()
+    async with sqlite_engine.begin() as connection:
+        await backend.create_indexes(connection, MockModel, ["name", "enum_field"])
+
+    crud = CRUDGenerator(MockModel, sqlite_session, search_backend=backend)
+
+    async def search(term: str) -> list[str]:
+        rows, _ = await crud.paginate(
+            FilterOptions(
+                filters={},
+                query_params=QueryParams(
+                    search=term, search_fields=["name", "enum_field"]
+                ),
+            )
+        )
+        return [row.name for row in rows]
+
+    # Words match as prefixes and every word has to match
+    assert await search("name 0") == [f"name 0{i}" for i in range(1, 10)]
+    assert await search("2 option2") == ["name 20", "name 22", "name 24"]
+
+    # Triggers keep the index in sync with writes
+    sqlite_session.add(MockModel(id=100, name="option2 option2", enum_field="option2"))
+    row = await sqlite_session.get(MockModel, 2)
+    row.name = "renamed"  # type: ignore
+    await sqlite_session.commit()
+    assert await search("02") == []
+    # The row matching the most often ranks first
+    assert (await search("option2"))[:2] == ["option2 option2", "renamed"]
+
+
+@pytest.mark.asyncio
+async def test_sqlite_fts5_rebuilds_only_when_created(
+    sqlite_engine: AsyncEngine,
+) -> None:
+    backend = SQLiteFTS5Search()
+    statements: list[str] = []
+
+    def record(_conn: Any, _cursor: Any, statement: str, *_: Any) -> None:
+        statements.append(statement)
+
+    event.listen(sqlite_engine.sync_engine, "before_cursor_execute", record)
+    for _ in range(2):
+        async with sqlite_engine.begin() as connection:
+            await backend.create_indexes(connection, MockModel, ["name"])
+
+    rebuilds = [statement for statement in statements if "'rebuild'" in statement]
+    assert len(rebuilds) == 1
@@ -0,0 +1,93 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from fastapi_admin_next.configs import AuthConfig, AuthConfigManager
+from fastapi_admin_next.exceptions import TooManyRequestsException
+from fastapi_admin_next.middleware import PathPrefixBypass
+from fastapi_admin_next.security import (
+    AsyncPasswordHasher,
+    JWTCookieBackend,
+    PasswordHandler,
+    TokenManager,
+)
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_off_the_event_loop() -> None:
+    hasher = AsyncPasswordHasher(rounds=4)
+
+    hashed = await hasher.hash("secret")
+    assert PasswordHandler.get_rounds(hashed) == 4
+    assert await hasher.verify_password("secret", hashed)
+    assert not await hasher.verify_password("wrong", hashed)
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_rejects_calls_beyond_max_pending() -> None:
+    hasher = AsyncPasswordHasher(rounds=10, max_workers=1, max_pending=2)
+
+    results = await asyncio.gather(
+        *(hasher.hash("secret") for _ in range(3)), return_exceptions=True
+    )
+    assert sum(isinstance(r, TooManyRequestsException) for r in results) == 1
+    assert hasher.pending == 0
+    hasher.shutdown()
+
+
+def test_needs_rehash_when_work_factor_changes() -> None:
+    hashed = PasswordHandler.hash("secret", rounds=4)
+
+    assert not AsyncPasswordHasher(rounds=4).needs_rehash(hashed)
+    assert AsyncPasswordHasher(rounds=5).needs_rehash(hashed)
+    assert PasswordHandler.needs_rehash("not-a-bcrypt-hash", rounds=4)
+
+
+def test_verified_tokens_are_cached_until_exp() -> None:
+    auth_config = AuthConfig(
+        auth_model=object,
+        auth_username_field="email",
+        password_field="password",
+        secret_key="secret",
+        algorithm="HS256",
+        token_expiry_minutes=5,
+        cookie_name="auth_token",
+    )
+    token = TokenManager("secret", "HS256", 5).create_access_token({"id": 1})
+    backend = JWTCookieBackend()
+
+    with patch.object(AuthConfigManager, "_instance", auth_config), patch(
+        "fastapi_admin_next.security.backend.jwt.decode"
+    ) as mock_decode:
+        mock_decode.return_value = {"id": 1, "exp": time.time() + 60}
+        assert backend.verify_user_id(token) == mock_decode.return_value
+        assert backend.verify_user_id(token) == mock_decode.return_value
+        mock_decode.assert_called_once()
+
+        # An already expired token is never served from the cache
+        mock_decode.return_value = {"id": 2, "exp": time.time() - 1}
+        backend.clear_cache()
+        backend.verify_user_id(token)
+        backend.verify_user_id(token)
+        assert mock_decode.call_count == 3
+
+    assert backend.verify_user_id("") is None
+
+
+@pytest.mark.asyncio
+async def test_path_prefix_bypass_skips_wrapped_middleware() -> None:
+    inner = AsyncMock()
+    wrapped = AsyncMock()
+    middleware = PathPrefixBypass(
+        inner, middleware=lambda app: wrapped, prefixes=("/static/",)
+    )
+
+    for path, root_path in [("/static/app.js", ""), ("/admin/static/x", "/admin")]:
+        await middleware({"type": "http", "path": path, "root_path": root_path}, 1, 2)
+    await middleware({"type": "http", "path": "/staticfoo", "root_path": ""}, 1, 2)
+
+    assert inner.await_count == 2
+    wrapped.assert_awaited_once()
@@ -3,10 +3,15 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from pydantic import ValidationError
 from pydantic_core import InitErrorDetails, PydanticCustomError
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from fastapi_admin_next.actions import DeleteSelected
+from fastapi_admin_next.configs import AuthConfig, AuthConfigManager
 from fastapi_admin_next.crud import CRUDGenerator
 from fastapi_admin_next.db_connect import Base
+from fastapi_admin_next.exceptions import ValidationException
+from fastapi_admin_next.model_admin import ModelAdmin
 from fastapi_admin_next.schemas import (
     CreateForm,
     DetailResponse,
@@ -14,9 +19,11 @@ from fastapi_admin_next.schemas import (
     QueryParams,
     SaveForm,
 )
+from fastapi_admin_next.security.hasher import PasswordHasherManager
 from fastapi_admin_next.services import AdminNextService
+from fastapi_admin_next.validation import generate_pydantic_model
 
-from .utils import MockModel, RelatedModel
+from .utils import AccountModel, MockModel, RelatedModel, VersionedModel
 
 
 @pytest.mark.asyncio
@@ -24,9 +31,13 @@ async def test_get_create_view() -> None:
     service = AdminNextService()
     mock_db = AsyncMock(spec=AsyncSession)
     mock_related_result = MagicMock()
-    mock_related_result.scalars.return_value = [RelatedModel(id=1, name="Related")]
+    mock_related_result.scalars().all.return_value = [
+        RelatedModel(id=1, name="Related")
+    ]
     mock_db.execute.return_value = mock_related_result
-    result = await service.get_create_view(MockModel, mock_db)
+    result = await service.get_create_view(
+        MockModel, mock_db, form_data={"related_id": 1}
+    )
     assert isinstance(result, CreateForm)
     assert "enum_field" in result.enum_fields
     assert result.enum_fields["enum_field"] == ["option1", "option2"]
@@ -35,6 +46,33 @@ async def test_get_create_view() -> None:
     mock_db.execute.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_get_create_view_does_not_load_related_tables() -> None:
+    service = AdminNextService()
+    mock_db = AsyncMock(spec=AsyncSession)
+    result = await service.get_create_view(MockModel, mock_db)
+    assert result.related_options == {"related": []}
+    mock_db.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_autocomplete() -> None:
+    service = AdminNextService()
+    mock_db = AsyncMock(spec=AsyncSession)
+    mock_related_result = MagicMock()
+    mock_related_result.scalars().all.return_value = [RelatedModel(id=1)]
+    mock_db.execute.return_value = mock_related_result
+    with patch.object(service.registry, "get_search_fields", return_value=["name"]):
+        result = await service.get_autocomplete(MockModel, "related", mock_db, "rel")
+    assert result == [{"value": 1, "label": "RelatedModel"}]
+    query = mock_db.execute.call_args.args[0]
+    assert "LIMIT" in str(query), "Autocomplete results should be paged"
+    assert "related_model.name" in str(query)
+    assert (
+        await service.get_autocomplete(RelatedModel, "related_models", mock_db) is None
+    )
+
+
 @pytest.mark.asyncio
 async def test_get_list_view() -> None:
     service = AdminNextService()
@@ -84,11 +122,11 @@ async def test_save_view() -> None:
             return_value=MagicMock(model_dump=lambda: valid_data)
         )
 
-        result = await service.save_view(valid_data, mock_model, mock_db)
+        with patch.object(CRUDGenerator, "create", new_callable=AsyncMock) as create:
+            result = await service.save_view(valid_data, mock_model, mock_db)
     assert isinstance(result, SaveForm)
     assert result.errors is None
-    mock_db.add.assert_called_once()
-    mock_db.commit.assert_called_once()
+    create.assert_awaited_once_with(mock_db, valid_data)
 
 
 @pytest.mark.asyncio
@@ -167,7 +205,7 @@ async def test_update_view() -> None:
     mock_db = AsyncMock(spec=AsyncSession)
     mock_model = MagicMock(spec=Base)
     valid_data = {"field1": "value1"}
-    with patch.object(service.registry, "get_pydantic_model") as mock_get_pydantic:
+    with patch.object(service.registry, "get_update_model") as mock_get_pydantic:
         mock_pydantic_instance = MagicMock()
         mock_pydantic_instance.model_dump.return_value = valid_data
         mock_get_pydantic.return_value.return_value = mock_pydantic_instance
@@ -186,10 +224,151 @@ async def test_update_view_not_found() -> None:
     mock_model = MagicMock(spec=Base)
     mock_db.get.return_value = None
     valid_data = {"field1": "value1"}
-    with patch.object(service.registry, "get_pydantic_model") as mock_get_pydantic:
+    with patch.object(service.registry, "get_update_model") as mock_get_pydantic:
         mock_pydantic_instance = MagicMock()
         mock_pydantic_instance.model_dump.return_value = valid_data
         mock_get_pydantic.return_value.return_value = mock_pydantic_instance
         result = await service.update_view({}, mock_model, 1, mock_db)
     assert isinstance(result, SaveForm)
     assert result.errors == {"id": "Object not found"}
+
+
+@pytest.mark.asyncio
+async def test_update_view_saves_changed_columns_or_reports_conflict(
+    sqlite_session: AsyncSession,
+) -> None:
+    service = AdminNextService()
+    auth_config = AuthConfig(
+        auth_model=object,
+        auth_username_field="email",
+        password_field="password",
+        secret_key="secret",
+        algorithm="HS256",
+        token_expiry_minutes=5,
+        cookie_name="auth_token",
+    )
+    admin = service.registry.get_admin(MockModel)
+    obj = await sqlite_session.get(MockModel, 1)
+    form = {"name": "name 01", "enum_field": "option1", "related_id": "3"}
+    form["_snapshot"] = admin.encode_snapshot(obj)
+    statements: list[str] = []
+    execute = sqlite_session.execute
+
+    async def recording_execute(
+        statement: object, *args: object, **kwargs: object
+    ) -> object:
+        statements.append(str(statement))
+        return await execute(statement, *args, **kwargs)  # type: ignore
+
+    sqlite_session.execute = recording_execute  # type: ignore
+    with patch.object(AuthConfigManager, "_instance", auth_config), patch.object(
+        service.registry,
+        "get_update_model",
+        return_value=generate_pydantic_model(MockModel),  # type: ignore
+    ):
+        # Someone else renames the row, the form only changes related_id
+        await CRUDGenerator(MockModel, sqlite_session).update_returning(
+            1, {"name": "renamed"}
+        )
+        statements.clear()
+        result = await service.update_view(dict(form), MockModel, 1, sqlite_session)
+        assert result.errors is None
+        assert len(statements) == 1
+        assert "SET related_id" in statements[0] and "RETURNING" in statements[0]
+
+        # The same stale form changing related_id again conflicts
+        form["related_id"] = "1"
+        result = await service.update_view(dict(form), MockModel, 1, sqlite_session)
+        assert result.errors is not None and "_form" in result.errors
+
+    row = (
+        await sqlite_session.execute(
+            select(MockModel.name, MockModel.related_id).where(MockModel.id == 1)
+        )
+    ).one()
+    assert tuple(row) == ("renamed", 3)
+
+
+@pytest.mark.asyncio
+async def test_run_bulk_action_rejects_invalid_ids(
+    sqlite_session: AsyncSession,
+) -> None:
+    service = AdminNextService()
+    admin = ModelAdmin(MockModel, actions=[DeleteSelected()])
+
+    with patch.object(service.registry, "get_admin", return_value=admin):
+        for ids in ([""], ["1", "one"]):
+            with pytest.raises(ValidationException):
+                await service.run_bulk_action(
+                    MockModel, "delete_selected", sqlite_session, ids=ids
+                )
+        assert (
+            await service.run_bulk_action(
+                MockModel, "missing", sqlite_session, ids=["1"]
+            )
+            is None
+        )
+
+
+@pytest.mark.asyncio
+async def test_versioned_model_create_then_update(sqlite_session: AsyncSession) -> None:
+    service = AdminNextService()
+    service.registry.register(VersionedModel)
+    admin = service.registry.get_admin(VersionedModel)
+
+    result = await service.save_view({"title": "draft"}, VersionedModel, sqlite_session)
+    assert result.errors is None
+    obj = await sqlite_session.scalar(select(VersionedModel))
+    assert obj is not None and obj.version == 1
+    form = {"title": "final", "_snapshot": admin.encode_snapshot(obj)}
+
+    result = await service.update_view(
+        dict(form), VersionedModel, obj.id, sqlite_session
+    )
+    assert result.errors is None
+    # The form still carries version 1, so saving it again conflicts
+    form["title"] = "lost"
+    result = await service.update_view(
+        dict(form), VersionedModel, obj.id, sqlite_session
+    )
+    assert result.errors is not None and "_form" in result.errors
+
+    row = (
+        await sqlite_session.execute(
+            select(VersionedModel.title, VersionedModel.version)
+        )
+    ).one()
+    assert tuple(row) == ("final", 2)
+
+
+@pytest.mark.asyncio
+async def test_update_view_keeps_blank_secrets_and_hashes_filled_ones(
+    sqlite_session: AsyncSession,
+) -> None:
+    service = AdminNextService()
+    service.registry.register(AccountModel)
+    sqlite_session.add(AccountModel(id=1, email="a@example.com", password="stored"))
+    await sqlite_session.commit()
+
+    form = {"email": "b@example.com", "password": "", "recovery_password": ""}
+    result = await service.update_view(dict(form), AccountModel, 1, sqlite_session)
+    assert result.errors is None
+    row = (
+        await sqlite_session.execute(
+            select(AccountModel.email, AccountModel.password).where(
+                AccountModel.id == 1
+            )
+        )
+    ).one()
+    assert tuple(row) == ("b@example.com", "stored")
+
+    form.update(password="new secret", recovery_password="other secret")
+    result = await service.update_view(dict(form), AccountModel, 1, sqlite_session)
+    assert result.errors is None
+    account = await sqlite_session.get(AccountModel, 1, populate_existing=True)
+    assert account is not None
+    hasher = PasswordHasherManager.get_hasher()
+    assert await hasher.verify_password("new secret", account.password)
+    assert await hasher.verify_password(
+        "other secret", account.recovery_password  # type: ignore
+    )
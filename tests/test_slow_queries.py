@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastapi_admin_next.crud import CRUDGenerator
+from fastapi_admin_next.instrumentation import instrument_engine
+from fastapi_admin_next.schemas import FilterOptions, QueryParams
+from fastapi_admin_next.slow_queries import REDACTED, SlowQueryLog, redact
+
+from .utils import MockModel
+
+
+def test_redact_keeps_numbers_only() -> None:
+    assert redact(("secret", 10, None, True, 1.5)) == [REDACTED, 10, None, True, 1.5]
+    assert redact({"name_1": "%bob%", "param_1": 5}) == {
+        "name_1": REDACTED,
+        "param_1": 5,
+    }
+
+
+@pytest.mark.asyncio
+async def test_slow_paginate_statements_are_logged_with_their_plan(
+    sqlite_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    instrument_engine(sqlite_session.bind)  # type: ignore
+    log = SlowQueryLog(max_entries=1)
+    monkeypatch.setattr("fastapi_admin_next.crud.slow_query_log", log)
+    crud = CRUDGenerator(MockModel, sqlite_session)
+    filter_options = FilterOptions(
+        filters={"enum_field": "option1"},
+        query_params=QueryParams(search="name", search_fields=["name"]),
+    )
+
+    # Disabled until a threshold is set
+    await crud.paginate(filter_options)
+    assert not log.entries()
+
+    log.configure(0.0, max_entries=1)
+    await crud.paginate(filter_options)
+
+    # Count and page were slow, only the latest is kept
+    [entry] = log.entries()
+    assert (entry.model, entry.view) == ("MockModel", "paginate")
+    assert entry.statement.startswith("SELECT")
+    assert REDACTED in entry.parameters and 10 in entry.parameters
+    assert any("SCAN" in line for line in entry.plan)
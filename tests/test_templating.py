@@ -0,0 +1,74 @@
+from pathlib import Path
+
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache
+
+from fastapi_admin_next.jinja_filters import page_window_filter
+from fastapi_admin_next.services.admin import AdminNextService
+from fastapi_admin_next.services.auth import AuthService
+from fastapi_admin_next.templating import FragmentCache, configure_templates, templates
+
+
+def test_services_share_one_environment() -> None:
+    assert AdminNextService().templates.env is templates.env
+    assert AuthService().templates.env is templates.env
+
+
+def test_configure_templates_compiles_every_template(tmp_path: Path) -> None:
+    compiled = configure_templates(bytecode_cache=FileSystemBytecodeCache(tmp_path))
+
+    assert compiled == len(templates.env.list_templates(extensions=["html"]))
+    assert compiled > 0
+    assert not templates.env.auto_reload
+    assert len(list(tmp_path.iterdir())) == compiled
+
+
+def test_fragment_cache_renders_once_per_context() -> None:
+    renders: list[int] = []
+    env = Environment(
+        loader=DictLoader({"nav.html": "{{ count() }}{{ models }}"}), auto_reload=False
+    )
+    env.globals["count"] = lambda: renders.append(1) or len(renders)
+    cache = FragmentCache(env)
+
+    assert cache.render("nav.html", models=["User"]) == "1['User']"
+    assert cache.render("nav.html", models=["User"]) == "1['User']"
+    assert cache.render("nav.html", models=["User", "Post"]) == "2['User', 'Post']"
+
+    env.auto_reload = True
+    assert cache.render("nav.html", models=["User"]) == "3['User']"
+
+
+def test_page_window_skips_distant_pages() -> None:
+    assert page_window_filter(1, 1) == [1]
+    assert page_window_filter(3, 5) == [1, 2, 3, 4, 5]
+    assert page_window_filter(50, 1_000_000) == [
+        1,
+        None,
+        48,
+        49,
+        50,
+        51,
+        52,
+        None,
+        1_000_000,
+    ]
+    assert page_window_filter(1, 100) == [1, 2, 3, None, 100]
+    assert page_window_filter(4, 100) == [1, 2, 3, 4, 5, 6, None, 100]
+    assert page_window_filter(1, 0) == []
+
+
+def test_page_window_only_builds_the_window() -> None:
+    # A range this size would not fit in memory if it were materialized
+    total_pages = 10**18
+    assert page_window_filter(50, total_pages) == [
+        1,
+        None,
+        *range(48, 53),
+        None,
+        total_pages,
+    ]
+    assert page_window_filter(total_pages, total_pages) == [
+        1,
+        None,
+        *range(total_pages - 2, total_pages + 1),
+    ]
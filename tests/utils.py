@@ -21,3 +21,19 @@ class MockModel(Base):
     enum_field = Column(Enum("option1", "option2", name="test_enum"))  # type: ignore
     related_id = Column(Integer, ForeignKey("related_model.id"))
     related = relationship("RelatedModel", back_populates="related_models")
+
+
+class VersionedModel(Base):
+    __tablename__ = "versioned_model"
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    version = Column(Integer, nullable=False)
+    __mapper_args__ = {"version_id_col": version}
+
+
+class AccountModel(Base):
+    __tablename__ = "account_model"
+    id = Column(Integer, primary_key=True)
+    email = Column(String, nullable=False)
+    password = Column(String, nullable=False)
+    recovery_password = Column(String)